@@ -0,0 +1,69 @@
+"""
+Backfill the fund ledger and take balance snapshots.
+
+Balances recorded before the ledger existed only live in player_funds. The
+backfill writes opening entries for every player whose ledger balance
+differs from player_funds, so the ledger accounts for every balance: the
+part the source records (payments, costs, attendance) account for as an
+opening entry, and the rest as an opening adjustment that reconciliation
+carries over as an offset. Players carried over by an earlier backfill are
+skipped, so it is safe to run repeatedly. Every player carried over must
+reconcile cleanly afterwards (see reconcile_funds.py); the script writes
+nothing otherwise.
+
+Usage:
+    python backfill_fund_ledger.py             # Write opening entries, then snapshot
+    python backfill_fund_ledger.py --snapshot  # Only snapshot (e.g. from a nightly cron job)
+    python backfill_fund_ledger.py --check     # Only report players whose ledger balances differ from player_funds
+"""
+
+import sys
+import asyncio
+from database import engine, AsyncSessionLocal, Base
+from data_versions import bump_stored, FUND
+from fund.ledger import backfill_opening_entries, create_balance_snapshots, find_ledger_mismatches
+from fund.reconciliation import compute_fund_figures, find_fund_mismatches
+import models  # noqa: F401
+
+
+async def main(snapshot_only: bool, check_only: bool):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        if check_only:
+            mismatches = await find_ledger_mismatches(db)
+            for mismatch in mismatches:
+                print(f"Player {mismatch['player_id']}: stored={mismatch['stored']} ledger={mismatch['ledger']}")
+            print(f"{len(mismatches)} player(s) whose ledger balances differ from player_funds")
+            return 1 if mismatches else 0
+
+        if not snapshot_only:
+            figures = await compute_fund_figures(db)
+            carried_over = set(await backfill_opening_entries(
+                {player_id: player_figures["sources"] for player_id, player_figures in figures.items()},
+                db
+            ))
+            print(f"Wrote opening ledger entries for {len(carried_over)} player(s)")
+
+            mismatches = [
+                mismatch for mismatch in await find_fund_mismatches(db)
+                if mismatch["player_id"] in carried_over
+            ]
+            if mismatches:
+                await db.rollback()
+                print(f"{len(mismatches)} player(s) do not reconcile after the backfill; nothing was written")
+                return 1
+            if carried_over:
+                # Opening entries change the ledger balances the API serves
+                await bump_stored(db, FUND)
+
+        snapshot_count = await create_balance_snapshots(db)
+        await db.commit()
+        print(f"Created {snapshot_count} balance snapshot(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main("--snapshot" in sys.argv[1:], "--check" in sys.argv[1:]))
+    sys.exit(exit_code)
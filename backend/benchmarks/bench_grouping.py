@@ -0,0 +1,78 @@
+"""
+Benchmark: balance and runtime of the group optimizer against the snake pattern.
+
+Generates synthetic standings (averages of up to five ratings on the 1-8
+scale, a few unranked players) and reports the spread of the group average
+ratings for the snake seed and for the optimized assignment, together with
+the optimizer's runtime. No database is needed.
+
+Usage (from the backend directory):
+    python benchmarks/bench_grouping.py
+"""
+
+import os
+import sys
+import time
+import random
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grouping.services import balance_groups, snake_assignment
+from grouping.constants import UNRANKED_GROUPING_RATING
+
+SAMPLES = 50
+UNRANKED_SHARE = 0.1
+
+
+def build_ratings(player_count: int) -> list:
+    """Build sorted synthetic standing averages (best first)"""
+    ratings = []
+    for _ in range(player_count):
+        if random.random() < UNRANKED_SHARE:
+            ratings.append(UNRANKED_GROUPING_RATING)
+        else:
+            recent = [random.randint(1, 8) for _ in range(random.randint(1, 5))]
+            ratings.append(sum(recent) / len(recent))
+    return sorted(ratings)
+
+
+def spread(ratings: list, assignment: list, num_groups: int) -> float:
+    """Spread of the group average ratings"""
+    totals = [0.0] * num_groups
+    sizes = [0] * num_groups
+    for rating, group_index in zip(ratings, assignment):
+        totals[group_index] += rating
+        sizes[group_index] += 1
+    averages = [total / size for total, size in zip(totals, sizes)]
+    return max(averages) - min(averages)
+
+
+def main():
+    random.seed(42)
+    print(f"{'players':>7} {'groups':>6} | {'snake spread':>12} | {'optimized':>9} | {'swaps':>5} | {'ms avg':>7} {'ms max':>7}")
+    for player_count in (16, 24, 32, 40, 48, 64):
+        for num_groups in (2, 4, 6, 8):
+            if player_count < num_groups * 2:
+                continue
+            snake_spreads, optimized_spreads, swap_counts, timings = [], [], [], []
+            for _ in range(SAMPLES):
+                ratings = build_ratings(player_count)
+                started = time.perf_counter()
+                assignment, swaps = balance_groups(ratings, num_groups)
+                timings.append((time.perf_counter() - started) * 1000)
+                snake_spreads.append(spread(ratings, snake_assignment(player_count, num_groups), num_groups))
+                optimized_spreads.append(spread(ratings, assignment, num_groups))
+                swap_counts.append(swaps)
+
+            print(
+                f"{player_count:>7} {num_groups:>6} | "
+                f"{statistics.mean(snake_spreads):>12.3f} | "
+                f"{statistics.mean(optimized_spreads):>9.3f} | "
+                f"{statistics.mean(swap_counts):>5.1f} | "
+                f"{statistics.mean(timings):>7.2f} {max(timings):>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
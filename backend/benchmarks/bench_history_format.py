@@ -0,0 +1,104 @@
+"""
+Benchmark: payload size and serialization time of the /history formats.
+
+Compares the default response (get_all_tournaments output validated against
+List[schemas.Tournament] and dumped to JSON, as FastAPI does) with the compact
+dictionary-encoded format on synthetic histories. No database is needed.
+
+Usage (from the backend directory):
+    python benchmarks/bench_history_format.py
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from typing import List
+import schemas
+from tournament.services import encode_compact_history
+
+PLAYER_POOL_SIZE = 120
+PLAYERS_PER_TOURNAMENT = 16
+# Group sizes of a 16-player session: Cup 1, 1, 2, 4 and Plate 1, 1, 2, 4
+GROUP_SIZES = [1, 1, 2, 4, 1, 1, 2, 4]
+REPEATS = 5
+
+
+def build_history(tournament_count: int) -> List[dict]:
+    """Build a synthetic history shaped like get_all_tournaments output"""
+    random.seed(tournament_count)
+    player_pool = [f"Player Name {index:03d}" for index in range(PLAYER_POOL_SIZE)]
+    start_date = date(2020, 1, 4)
+    history = []
+    rank_group_id = 0
+
+    for tournament_index in range(tournament_count):
+        tournament_id = f"t_{tournament_index:05d}"
+        players = random.sample(player_pool, PLAYERS_PER_TOURNAMENT)
+        ranks = []
+        offset = 0
+        for rating, group_size in enumerate(GROUP_SIZES, start=1):
+            rank_group_id += 1
+            ranks.append({
+                "id": rank_group_id,
+                "tournament_id": tournament_id,
+                "rank": offset + 1,
+                "rating": rating,
+                "players": players[offset:offset + group_size]
+            })
+            offset += group_size
+        history.append({
+            "id": tournament_id,
+            "date": start_date + timedelta(weeks=tournament_index),
+            "playlist_url": "https://www.youtube.com/playlist?list=PL" + tournament_id,
+            "embed_url": None,
+            "is_official": True,
+            "ranks": ranks
+        })
+
+    history.reverse()  # Newest first, like the endpoint
+    return history
+
+
+def time_best(function) -> tuple:
+    """Run a function REPEATS times and return (best seconds, last result)"""
+    best = float("inf")
+    result = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    full_adapter = TypeAdapter(List[schemas.Tournament])
+
+    print(f"{'tournaments':>11} | {'full KB':>9} {'gzip':>7} {'ms':>8} | {'compact KB':>10} {'gzip':>7} {'ms':>8} | {'size':>6} {'speed':>6}")
+    for tournament_count in (100, 1000, 5000):
+        history = build_history(tournament_count)
+
+        full_seconds, full_payload = time_best(
+            lambda: full_adapter.dump_json(full_adapter.validate_python(history))
+        )
+        compact_seconds, compact_payload = time_best(
+            lambda: json.dumps(encode_compact_history(history), separators=(",", ":")).encode()
+        )
+
+        print(
+            f"{tournament_count:>11} | "
+            f"{len(full_payload) / 1024:>9.1f} {len(gzip.compress(full_payload)) / 1024:>7.1f} {full_seconds * 1000:>8.1f} | "
+            f"{len(compact_payload) / 1024:>10.1f} {len(gzip.compress(compact_payload)) / 1024:>7.1f} {compact_seconds * 1000:>8.1f} | "
+            f"{len(full_payload) / len(compact_payload):>5.1f}x {full_seconds / compact_seconds:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: throughput of the what-if standings simulation.
+
+Evaluates batches of scenarios (random active sets drawn from a player pool,
+some with hypothetical results) against synthetic rating windows, which is
+the part of POST /ranking/standings/simulate that runs after the single
+window lookup. No database is needed.
+
+Usage (from the backend directory):
+    python benchmarks/bench_standings_simulation.py
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schemas
+from ranking.services import rank_players, apply_hypothetical_ratings
+
+PLAYER_POOL_SIZE = 120
+HYPOTHETICAL_SHARE = 0.5
+
+
+def build_windows() -> dict:
+    """Build synthetic rating windows for the whole player pool"""
+    windows = {}
+    for index in range(PLAYER_POOL_SIZE):
+        recent = [random.randint(1, 8) for _ in range(random.randint(0, 5))]
+        windows[f"Player {index:03d}"] = {"recent_ratings": recent, "played_count": len(recent) + random.randint(0, 30)}
+    return windows
+
+
+def build_scenarios(count: int, players_per_scenario: int, player_pool: list) -> list:
+    scenarios = []
+    for _ in range(count):
+        active_players = random.sample(player_pool, players_per_scenario)
+        hypothetical_ratings = {}
+        if random.random() < HYPOTHETICAL_SHARE:
+            hypothetical_ratings = {player_name: [random.randint(1, 8)] for player_name in random.sample(active_players, 2)}
+        scenarios.append(schemas.StandingsScenario(active_players=active_players, hypothetical_ratings=hypothetical_ratings))
+    return scenarios
+
+
+def main():
+    random.seed(7)
+    windows = build_windows()
+    player_pool = list(windows)
+
+    print(f"{'scenarios':>9} {'players':>7} | {'ms':>8} | {'scenarios/s':>11}")
+    for scenario_count in (10, 100, 1000):
+        for players_per_scenario in (16, 40):
+            scenarios = build_scenarios(scenario_count, players_per_scenario, player_pool)
+            started = time.perf_counter()
+            for scenario in scenarios:
+                rank_players(
+                    scenario.active_players,
+                    scenario.temporary_players,
+                    apply_hypothetical_ratings(windows, scenario.hypothetical_ratings)
+                )
+            elapsed = time.perf_counter() - started
+            print(f"{scenario_count:>9} {players_per_scenario:>7} | {elapsed * 1000:>8.1f} | {scenario_count / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
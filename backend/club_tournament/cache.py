@@ -21,6 +21,9 @@ class SimpleCache:
             "expires_at": time.time() + self.ttl
         }
 
+    def delete(self, key: str):
+        self._cache.pop(key, None)
+
     def clear(self):
         self._cache.clear()
 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
+from data_versions import data_versions, CLUB
 
 from club_tournament.models import ClubVenue, ClubTournament, ClubTournamentResult, ClubVenueWhatsappLink
 from club_tournament.schemas import (
@@ -139,6 +140,7 @@ async def create_venue(data: ClubVenueCreate, db: AsyncSession) -> ClubVenue:
             db.add(wl)
  
     await db.commit()
+    data_versions.bump(CLUB)
     return await get_venue_by_id(venue.id, db)
 
 
@@ -180,6 +182,7 @@ async def update_venue(venue_id: int, data: ClubVenueUpdate, db: AsyncSession) -
             db.add(wl)
 
     await db.commit()
+    data_versions.bump(CLUB)
     return await get_venue_by_id(venue_id, db)
  
  
@@ -221,6 +224,7 @@ async def delete_venue(venue_id: int, db: AsyncSession) -> dict:
 
     await db.delete(venue)
     await db.commit()
+    data_versions.bump(CLUB)
     return {"message": f"Venue '{venue.name}' deleted successfully"}
 
 
@@ -373,6 +377,7 @@ async def create_tournament(data: ClubTournamentCreate, db: AsyncSession) -> dic
     )
     db.add(tournament)
     await db.commit()
+    data_versions.bump(CLUB)
 
     # Reload with relationships
     loaded = await get_tournament_by_id(tournament.id, db)
@@ -411,6 +416,7 @@ async def update_tournament(
         tournament.whatsapp_link_id = data.whatsapp_link_id
  
     await db.commit()
+    data_versions.bump(CLUB)
 
     # Reload with relationships
     loaded = await get_tournament_by_id(tournament_id, db)
@@ -422,6 +428,7 @@ async def delete_tournament(tournament_id: int, db: AsyncSession) -> dict:
     tournament = await get_tournament_by_id(tournament_id, db)
     await db.delete(tournament)
     await db.commit()
+    data_versions.bump(CLUB)
     return {"message": f"Tournament #{tournament_id} deleted successfully"}
 
 
@@ -459,6 +466,7 @@ async def submit_results(
     )
     db.add(result)
     await db.commit()
+    data_versions.bump(CLUB)
 
     # Reload
     loaded = await get_tournament_by_id(tournament_id, db)
@@ -492,6 +500,7 @@ async def update_results(
     tournament.result.quarter_finalist_4 = data.quarter_finalist_4
 
     await db.commit()
+    data_versions.bump(CLUB)
 
     # Reload
     loaded = await get_tournament_by_id(tournament_id, db)
@@ -561,6 +570,7 @@ async def bulk_import_tournaments(
             errors.append(f"Row {i+1}: {str(e)}")
 
     await db.commit()
+    data_versions.bump(CLUB)
     return {
         "created": created_count,
         "errors": errors,
@@ -0,0 +1,130 @@
+"""
+Per-domain data version counters used to answer conditional GETs.
+
+Every mutating service bumps the counters of the domains it changed after
+committing. The conditional GET middleware in main.py derives a strong ETag
+from the counters a public read depends on, so an unchanged resource can be
+answered with 304 Not Modified without touching the database.
+
+The counters live in process memory (the API runs as a single uvicorn
+worker). A random boot id is mixed into every ETag so that a restart never
+validates a response served by a previous process.
+
+Writers outside the API process (the rebuild and reconciliation scripts)
+cannot reach those counters. They bump the domain's row of the
+data_versions table instead, in the transaction of their write, and the
+API adds the stored versions to its own counters. The stored versions are
+re-read at most every STORED_VERSION_TTL seconds, so such a write is picked
+up within that delay while other reads still never touch the database.
+"""
+
+import hashlib
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+import models
+
+logger = logging.getLogger(__name__)
+
+TOURNAMENTS = "tournaments"
+PLAYERS = "players"
+FUND = "fund"
+CLUB = "club"
+
+# Public read endpoints and the domains their responses depend on (first match wins)
+PATH_DOMAINS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("/history", (TOURNAMENTS,)),
+    ("/players", (PLAYERS, TOURNAMENTS)),
+    ("/fund", (FUND, PLAYERS, TOURNAMENTS)),
+    ("/club-tournaments", (CLUB,)),
+    ("/club-venues", (CLUB,)),
+)
+
+# Reads that must always be regenerated (AI generated text)
+EXCLUDED_PATH_SUFFIXES = ("/insights",)
+
+# Clients may keep a copy but must revalidate it on every use
+CACHE_CONTROL = "public, no-cache"
+
+# Seconds between two reads of the versions stored by out-of-process writers
+STORED_VERSION_TTL = 5.0
+
+
+class DataVersions:
+    def __init__(self):
+        self._boot_id = uuid.uuid4().hex
+        self._versions = {domain: 0 for domain in (TOURNAMENTS, PLAYERS, FUND, CLUB)}
+        self._stored_versions = {domain: 0 for domain in self._versions}
+        self._stored_read_at = None
+
+    def bump(self, *domains: str):
+        """Mark the given domains as changed"""
+        for domain in domains:
+            self._versions[domain] += 1
+
+    def get(self, domain: str) -> int:
+        # Both parts only grow, so their sum changes whenever either does
+        return self._versions[domain] + self._stored_versions[domain]
+
+    async def refresh_stored(self, session_factory):
+        """Re-read the versions bumped by out-of-process writers, unless they were read recently"""
+        now = time.monotonic()
+        if self._stored_read_at is not None and now - self._stored_read_at < STORED_VERSION_TTL:
+            return
+        self._stored_read_at = now  # Concurrent requests do not read them again
+        try:
+            async with session_factory() as db:
+                result = await db.execute(select(models.StoredDataVersion.domain, models.StoredDataVersion.version))
+                rows = result.all()
+        except Exception as e:
+            # Keep answering with the versions read last time
+            logger.warning(f"Could not read stored data versions: {e}")
+            return
+        for row in rows:
+            if row.domain in self._stored_versions:
+                self._stored_versions[row.domain] = row.version
+
+    def etag(self, domains: Iterable[str], resource: str) -> str:
+        """Build a strong ETag for a resource from the versions of the domains it depends on"""
+        version_key = ",".join(f"{domain}={self.get(domain)}" for domain in domains)
+        digest = hashlib.sha1(f"{self._boot_id}|{version_key}|{resource}".encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+
+async def bump_stored(db: AsyncSession, *domains: str):
+    """Mark the given domains as changed from outside the API process (the caller commits)"""
+    now = datetime.utcnow()
+    for domain in domains:
+        statement = insert(models.StoredDataVersion).values(domain=domain, version=1, updated_at=now)
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[models.StoredDataVersion.domain],
+            set_={"version": models.StoredDataVersion.version + 1, "updated_at": now}
+        ))
+
+
+def domains_for_path(path: str) -> Optional[Tuple[str, ...]]:
+    """Get the domains a public read depends on, or None if it is not cacheable"""
+    if path.endswith(EXCLUDED_PATH_SUFFIXES):
+        return None
+    for prefix, domains in PATH_DOMAINS:
+        if path == prefix or path.startswith(prefix + "/"):
+            return domains
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison is what RFC 9110 prescribes for If-None-Match
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+# Global instance shared by the services and the middleware
+data_versions = DataVersions()
@@ -0,0 +1,4 @@
+# Export module
+from export import api, services
+
+__all__ = ["api", "services"]
@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from export import services
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _ndjson_response(stream, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/tournaments")
+async def export_tournaments():
+    """Stream all tournaments with rank groups as NDJSON (newest first)"""
+    return _ndjson_response(services.stream_tournaments(), "tournaments.ndjson")
+
+
+@router.get("/attendance")
+async def export_attendance():
+    """Stream all tournament attendance records as NDJSON"""
+    return _ndjson_response(services.stream_attendance(), "attendance.ndjson")
+
+
+@router.get("/payments")
+async def export_payments():
+    """Stream all payment transactions as NDJSON"""
+    return _ndjson_response(services.stream_payments(), "payments.ndjson")
+
+
+@router.get("/player-costs")
+async def export_player_costs():
+    """Stream all player-specific and miscellaneous costs as NDJSON"""
+    return _ndjson_response(services.stream_player_costs(), "player_costs.ndjson")
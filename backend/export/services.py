@@ -0,0 +1,159 @@
+"""
+Streaming NDJSON exports.
+
+Every export opens its own session (the response keeps streaming after the
+request handler has returned), reads through a server-side cursor in batches
+of EXPORT_BATCH_SIZE rows and yields one JSON document per line, so memory
+stays constant regardless of table size and the first bytes go out as soon as
+the first batch arrives.
+"""
+
+import json
+from datetime import date, datetime
+from typing import AsyncIterator
+from sqlalchemy.future import select
+from database import AsyncSessionLocal
+import models
+import fund_models
+
+EXPORT_BATCH_SIZE = 500
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _to_ndjson_line(record: dict) -> bytes:
+    return (json.dumps(record, default=_json_default, separators=(",", ":")) + "\n").encode()
+
+
+async def _stream_rows(statement) -> AsyncIterator:
+    """Yield the rows of a statement through a server-side cursor"""
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for row in result:
+            yield row
+
+
+async def stream_tournaments() -> AsyncIterator[bytes]:
+    """Export tournaments with their rank groups, one tournament per line (newest first)"""
+    # One flat row per (tournament, rank group, player); consecutive rows of the same
+    # tournament are folded back into a single document.
+    statement = (
+        select(
+            models.Tournament.id,
+            models.Tournament.date,
+            models.Tournament.playlist_url,
+            models.Tournament.embed_url,
+            models.Tournament.is_official,
+            models.RankGroup.id.label("rank_group_id"),
+            models.RankGroup.rank,
+            models.RankGroup.rating,
+            models.Player.name.label("player_name")
+        )
+        .outerjoin(models.RankGroup, models.RankGroup.tournament_id == models.Tournament.id)
+        .outerjoin(models.rank_group_players, models.rank_group_players.c.rank_group_id == models.RankGroup.id)
+        .outerjoin(models.Player, models.Player.id == models.rank_group_players.c.player_id)
+        .order_by(
+            models.Tournament.date.desc(),
+            models.Tournament.id,
+            models.RankGroup.rank,
+            models.RankGroup.id,
+            models.Player.name
+        )
+    )
+
+    current = None
+    current_group = None
+    async for row in _stream_rows(statement):
+        if current is None or current["id"] != row.id:
+            if current is not None:
+                yield _to_ndjson_line(current)
+            current = {
+                "id": row.id,
+                "date": row.date,
+                "playlist_url": row.playlist_url,
+                "embed_url": row.embed_url,
+                "is_official": row.is_official,
+                "ranks": []
+            }
+            current_group = None
+
+        if row.rank_group_id is None:
+            continue
+        if current_group is None or current_group["id"] != row.rank_group_id:
+            current_group = {
+                "id": row.rank_group_id,
+                "tournament_id": row.id,
+                "rank": row.rank,
+                "rating": row.rating,
+                "players": []
+            }
+            current["ranks"].append(current_group)
+        if row.player_name is not None:
+            current_group["players"].append(row.player_name)
+
+    if current is not None:
+        yield _to_ndjson_line(current)
+
+
+async def stream_attendance() -> AsyncIterator[bytes]:
+    """Export tournament attendance records, one per line"""
+    statement = (
+        select(
+            fund_models.TournamentAttendance.id,
+            fund_models.TournamentAttendance.tournament_id,
+            models.Tournament.date.label("tournament_date"),
+            fund_models.TournamentAttendance.player_id,
+            models.Player.name.label("player_name"),
+            fund_models.TournamentAttendance.is_club_member
+        )
+        .join(models.Tournament, models.Tournament.id == fund_models.TournamentAttendance.tournament_id)
+        .join(models.Player, models.Player.id == fund_models.TournamentAttendance.player_id)
+        .order_by(models.Tournament.date, fund_models.TournamentAttendance.id)
+    )
+    async for row in _stream_rows(statement):
+        yield _to_ndjson_line(dict(row._mapping))
+
+
+async def stream_payments() -> AsyncIterator[bytes]:
+    """Export payment transactions, one per line"""
+    statement = (
+        select(
+            fund_models.PaymentTransaction.id,
+            fund_models.PaymentTransaction.player_id,
+            models.Player.name.label("player_name"),
+            fund_models.PaymentTransaction.amount,
+            fund_models.PaymentTransaction.payment_date,
+            fund_models.PaymentTransaction.notes,
+            fund_models.PaymentTransaction.created_at
+        )
+        .join(models.Player, models.Player.id == fund_models.PaymentTransaction.player_id)
+        .order_by(fund_models.PaymentTransaction.id)
+    )
+    async for row in _stream_rows(statement):
+        yield _to_ndjson_line(dict(row._mapping))
+
+
+async def stream_player_costs() -> AsyncIterator[bytes]:
+    """Export player-specific costs (tournament-specific and miscellaneous), one per line"""
+    statement = (
+        select(
+            fund_models.PlayerSpecificCost.id,
+            fund_models.PlayerSpecificCost.player_id,
+            models.Player.name.label("player_name"),
+            fund_models.PlayerSpecificCost.cost_amount,
+            fund_models.PlayerSpecificCost.cost_name,
+            fund_models.PlayerSpecificCost.cost_date,
+            fund_models.TournamentCost.tournament_id,
+            models.Tournament.date.label("tournament_date")
+        )
+        .join(models.Player, models.Player.id == fund_models.PlayerSpecificCost.player_id)
+        .outerjoin(fund_models.TournamentCost, fund_models.TournamentCost.id == fund_models.PlayerSpecificCost.tournament_cost_id)
+        .outerjoin(models.Tournament, models.Tournament.id == fund_models.TournamentCost.tournament_id)
+        .order_by(fund_models.PlayerSpecificCost.id)
+    )
+    async for row in _stream_rows(statement):
+        yield _to_ndjson_line(dict(row._mapping))
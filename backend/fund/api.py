@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
 from database import get_db, ADMIN_PASSWORD
 from fund import services
+from fund.payment_import import iter_csv_rows, iter_json_rows
 import fund_schemas
 
 router = APIRouter(prefix="/fund", tags=["fund"])
@@ -62,12 +63,17 @@ async def seed_initial_data(
 # ============ Player Balances ============
 @router.get("/balances", response_model=List[fund_schemas.PlayerFundResponse])
 async def get_player_balances(
+    response: Response,
     search: Optional[str] = Query(None),
     filter: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: Optional[int] = Query(None, ge=1, le=500, description="Paginate when set (default: all balances)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all player fund balances with optional search and filter"""
-    return await services.get_all_player_balances(search, filter, db)
+    """Get player fund balances with optional search, filter and pagination (total count in X-Total-Count)"""
+    balances, total = await services.get_all_player_balances(search, filter, db, page, page_size)
+    response.headers["X-Total-Count"] = str(total)
+    return balances
 
 
 # ============ Tournament Costs ============
@@ -84,6 +90,19 @@ async def calculate_tournament_costs(
     return await services.calculate_tournament_costs(cost_request, db)
 
 
+@router.post("/tournament-costs/calculate-batch", response_model=fund_schemas.BatchCostCalculationResponse)
+async def calculate_tournament_cost_scenarios(
+    batch_request: fund_schemas.BatchCostCalculationRequest,
+    password: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Calculate one roster's costs under several fee scenarios without saving (password protected)"""
+    if password != ADMIN_PASSWORD:
+        raise HTTPException(status_code=403, detail="Invalid password")
+    
+    return await services.calculate_tournament_cost_scenarios(batch_request, db)
+
+
 @router.post("/tournament-costs/save")
 async def save_tournament_costs(
     cost_request: fund_schemas.AddTournamentCostRequest,
@@ -109,7 +128,7 @@ async def get_tournament_cost_details(
     db: AsyncSession = Depends(get_db)
 ):
     """Get cost breakdown for a specific tournament date"""
-    return await services.get_tournament_cost_details(date_str, db)
+    return await services.get_cached_tournament_cost_details(date_str, db)
 
 
 @router.get("/tournament-costs/{date_str}/input", response_model=fund_schemas.TournamentCostInputResponse)
@@ -142,15 +161,39 @@ async def record_payment(
     return await services.record_player_payment(payment_data, db)
 
 
+@router.post("/payments/import", response_model=fund_schemas.PaymentImportResponse)
+async def import_payments(
+    request: Request,
+    password: str,
+    skip_invalid: bool = Query(False, description="Import the valid rows even if other rows have errors"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Record many payments from a CSV (text/csv) or JSON array (application/json) body (password protected)"""
+    if password != ADMIN_PASSWORD:
+        raise HTTPException(status_code=403, detail="Invalid password")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        rows = iter_csv_rows(request.stream())
+    elif content_type == "application/json":
+        rows = iter_json_rows(request.stream())
+    else:
+        raise HTTPException(status_code=415, detail="Send payments as text/csv or application/json")
+
+    return await services.import_player_payments(rows, skip_invalid, db)
+
+
 @router.get("/payments/history", response_model=fund_schemas.PaginatedPaymentHistoryResponse)
 async def get_payment_history(
     page: int = 1,
     page_size: int = 20,
     player_name: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (overrides page)"),
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
     """Get paginated payment history"""
-    return await services.get_payment_history(page, page_size, player_name, db)
+    return await services.get_payment_history(page, page_size, player_name, db, cursor, include_total)
 
 
 @router.put("/payments/{payment_id}")
@@ -189,6 +232,18 @@ async def get_days_played_comparison(db: AsyncSession = Depends(get_db)):
     return await services.get_days_played_comparison(db)
 
 
+@router.get("/timeseries", response_model=List[fund_schemas.FundPeriodTotals])
+async def get_fund_timeseries(
+    period: str = Query("month", description="Bucket size: month or year"),
+    player_name: Optional[str] = Query(None, description="Only this player (default: the whole club)"),
+    start: Optional[date] = Query(None, description="First month to include (any day of it)"),
+    end: Optional[date] = Query(None, description="Last month to include (any day of it)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get fund activity per month or year from the monthly rollup"""
+    return await services.get_fund_timeseries(period, player_name, start, end, db)
+
+
 # ============ Player Miscellaneous Cost ============
 @router.post("/player-misc-cost")
 async def add_player_misc_cost(
@@ -209,10 +264,12 @@ async def get_player_tournament_costs(
     player_id: int,
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (overrides page)"),
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
     """Get paginated tournament costs for a specific player"""
-    return await services.get_player_tournament_costs(player_id, page, page_size, db)
+    return await services.get_player_tournament_costs(player_id, page, page_size, db, cursor, include_total)
 
 
 @router.get("/players/{player_id}/misc-costs", response_model=fund_schemas.PaginatedPlayerMiscCostResponse)
@@ -220,7 +277,46 @@ async def get_player_misc_costs(
     player_id: int,
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (overrides page)"),
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
     """Get paginated miscellaneous (non-tournament) costs for a specific player"""
-    return await services.get_player_misc_costs(player_id, page, page_size, db)
+    return await services.get_player_misc_costs(player_id, page, page_size, db, cursor, include_total)
+
+
+# ============ Fund Ledger ============
+@router.get("/ledger/balances", response_model=List[fund_schemas.LedgerBalanceResponse])
+async def get_ledger_balances(
+    as_of: Optional[date] = Query(None, description="Balances at the end of this date (default: now)"),
+    player_name: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get player balances derived from the fund ledger, optionally as of a past date"""
+    return await services.get_ledger_balances_as_of(as_of, player_name, db)
+
+
+@router.post("/ledger/snapshots", response_model=fund_schemas.BalanceSnapshotResponse)
+async def create_balance_snapshots(
+    password: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Snapshot ledger balances so later balance reads only aggregate newer entries (password protected)"""
+    if password != ADMIN_PASSWORD:
+        raise HTTPException(status_code=403, detail="Invalid password")
+    
+    return await services.create_balance_snapshots(db)
+
+
+# ============ Fund Reconciliation ============
+@router.post("/reconcile", response_model=fund_schemas.FundReconciliationResponse)
+async def reconcile_player_funds(
+    password: str,
+    apply: bool = Query(False, description="Correct the mismatching funds instead of only reporting them"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recompute every player's fund figures from the source records and report (or correct) the differences (password protected)"""
+    if password != ADMIN_PASSWORD:
+        raise HTTPException(status_code=403, detail="Invalid password")
+
+    return await services.reconcile_player_funds(apply, db)
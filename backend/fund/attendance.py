@@ -0,0 +1,122 @@
+"""
+Maintenance of the denormalized player_attendance_summary table.
+
+Each row holds how many tournaments a player attended in total, as a club
+member and as a regular member, so /fund/attendance and the days played
+comparison read one small table instead of grouping tournament_attendance.
+Every writer of tournament_attendance refreshes the rows of the players it
+touched, inside the same transaction as the write itself.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, delete
+from sqlalchemy.dialects.postgresql import insert
+import fund_models
+
+
+def _empty_summary() -> dict:
+    return {"total_tournaments": 0, "as_club_member": 0, "as_regular_member": 0}
+
+
+async def compute_attendance_summaries(
+    db: AsyncSession,
+    player_ids: Optional[Iterable[int]] = None
+) -> Dict[int, dict]:
+    """Count attendance per player with one GROUP BY (all players when player_ids is None)"""
+    attendance = fund_models.TournamentAttendance
+    query = select(
+        attendance.player_id,
+        func.count().label("total_tournaments"),
+        func.count().filter(attendance.is_club_member.is_(True)).label("as_club_member"),
+        func.count().filter(attendance.is_club_member.is_(False)).label("as_regular_member")
+    ).group_by(attendance.player_id)
+
+    if player_ids is not None:
+        player_ids = list(set(player_ids))
+        if not player_ids:
+            return {}
+        query = query.where(attendance.player_id.in_(player_ids))
+
+    result = await db.execute(query)
+    summaries = {player_id: _empty_summary() for player_id in (player_ids or [])}
+    for row in result.all():
+        summaries[row.player_id] = {
+            "total_tournaments": row.total_tournaments,
+            "as_club_member": row.as_club_member,
+            "as_regular_member": row.as_regular_member
+        }
+    return summaries
+
+
+async def _store_summaries(summaries: Dict[int, dict], db: AsyncSession):
+    """Upsert the summaries of players who attended and drop the rows of players who no longer did"""
+    now = datetime.utcnow()
+    rows = [
+        {"player_id": player_id, "updated_at": now, **summary}
+        for player_id, summary in sorted(summaries.items())
+        if summary["total_tournaments"]
+    ]
+    if rows:
+        insert_statement = insert(fund_models.PlayerAttendanceSummary)
+        await db.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=[fund_models.PlayerAttendanceSummary.player_id],
+                set_={
+                    "total_tournaments": insert_statement.excluded.total_tournaments,
+                    "as_club_member": insert_statement.excluded.as_club_member,
+                    "as_regular_member": insert_statement.excluded.as_regular_member,
+                    "updated_at": insert_statement.excluded.updated_at
+                }
+            ),
+            rows
+        )
+
+    absent_player_ids = [player_id for player_id, summary in summaries.items() if not summary["total_tournaments"]]
+    if absent_player_ids:
+        await db.execute(
+            delete(fund_models.PlayerAttendanceSummary)
+            .where(fund_models.PlayerAttendanceSummary.player_id.in_(absent_player_ids))
+        )
+
+
+async def refresh_attendance_summaries(player_ids: Iterable[int], db: AsyncSession):
+    """Recompute and store the summaries of the given players (does not commit)"""
+    await db.flush()
+    summaries = await compute_attendance_summaries(db, player_ids)
+    await _store_summaries(summaries, db)
+
+
+async def rebuild_attendance_summaries(db: AsyncSession) -> int:
+    """Backfill: rebuild the summary of every player from scratch and commit"""
+    await db.execute(delete(fund_models.PlayerAttendanceSummary))
+    summaries = await compute_attendance_summaries(db)
+    await _store_summaries(summaries, db)
+    await db.commit()
+    return len(summaries)
+
+
+async def find_attendance_summary_mismatches(db: AsyncSession) -> List[dict]:
+    """Compare the stored summaries against a from-scratch recompute"""
+    expected_summaries = await compute_attendance_summaries(db)
+
+    stored_result = await db.execute(select(fund_models.PlayerAttendanceSummary))
+    stored_summaries = {
+        summary.player_id: {
+            "total_tournaments": summary.total_tournaments,
+            "as_club_member": summary.as_club_member,
+            "as_regular_member": summary.as_regular_member
+        }
+        for summary in stored_result.scalars().all()
+    }
+
+    mismatches = []
+    for player_id in sorted(set(expected_summaries) | set(stored_summaries)):
+        expected = expected_summaries.get(player_id, _empty_summary())
+        stored = stored_summaries.get(player_id, _empty_summary())
+        if stored != expected:
+            mismatches.append({"player_id": player_id, "stored": stored, "expected": expected})
+    return mismatches
+
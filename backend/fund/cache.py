@@ -0,0 +1,23 @@
+"""
+In-process fund cache: finished tournament cost breakdowns keyed by date,
+and the history counts of fund.pagination (which carry their own data
+version).
+
+A breakdown only changes when the costs of its date are saved again (or
+reverted), so those writes drop their date's entry. The tournament services
+also drop it when the tournament is deleted, and clear the cache when a
+tournament moves to another date.
+"""
+
+from datetime import date
+from club_tournament.cache import SimpleCache
+
+fund_cache = SimpleCache()
+
+
+def cost_details_key(tournament_date: date) -> str:
+    return f"cost_details:{tournament_date.isoformat()}"
+
+
+def invalidate_cost_details(tournament_date: date):
+    fund_cache.delete(cost_details_key(tournament_date))
@@ -0,0 +1,58 @@
+"""
+Constants for the fund module.
+"""
+
+# Types of fund ledger entries
+LEDGER_PAYMENT = "payment"
+LEDGER_TOURNAMENT_COST = "tournament_cost"
+LEDGER_MISC_COST = "misc_cost"
+LEDGER_ATTENDANCE = "attendance"  # A played day, no money involved
+LEDGER_REVERSAL = "reversal"  # Undoes an earlier cost or payment
+LEDGER_ADJUSTMENT = "adjustment"  # Balances set directly by an admin (seeding)
+LEDGER_OPENING = "opening"  # Pre-ledger balances the source records account for, written by the backfill
+LEDGER_OPENING_ADJUSTMENT = "opening_adjustment"  # Pre-ledger balances without source records, written by the backfill
+LEDGER_RECONCILIATION = "reconciliation"  # Correction back to the figures of the source records
+
+LEDGER_ENTRY_TYPES = (
+    LEDGER_PAYMENT,
+    LEDGER_TOURNAMENT_COST,
+    LEDGER_MISC_COST,
+    LEDGER_ATTENDANCE,
+    LEDGER_REVERSAL,
+    LEDGER_ADJUSTMENT,
+    LEDGER_OPENING,
+    LEDGER_OPENING_ADJUSTMENT,
+    LEDGER_RECONCILIATION,
+)
+
+# Entries that follow a change of the source records (payments, costs,
+# attendance); opening entries stand for the ones that predate the ledger
+LEDGER_SOURCE_TYPES = (
+    LEDGER_PAYMENT,
+    LEDGER_TOURNAMENT_COST,
+    LEDGER_MISC_COST,
+    LEDGER_ATTENDANCE,
+    LEDGER_REVERSAL,
+    LEDGER_OPENING,
+)
+
+# Entries that set balances directly: they have no source records, so
+# reconciliation carries them over as offsets
+LEDGER_OFFSET_TYPES = (LEDGER_ADJUSTMENT, LEDGER_OPENING_ADJUSTMENT)
+
+# Advisory lock on the ledger: writers hold it shared until they commit, and
+# snapshots take it exclusively, so no entry id below a snapshot's cut-off
+# can still be in flight
+LEDGER_LOCK_KEY = 3_000_015
+
+# Differences below this are float noise, not a balance mismatch
+BALANCE_TOLERANCE = 1e-6
+
+# Upper bound on the fee scenarios of a single batch cost calculation
+MAX_COST_SCENARIOS = 100
+
+# Buckets of the fund time series
+TIMESERIES_PERIODS = ("month", "year")
+
+# Upper bound on the rows of a single bulk payment import
+MAX_PAYMENT_IMPORT_ROWS = 5000
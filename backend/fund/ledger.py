@@ -0,0 +1,273 @@
+"""
+Append-only fund ledger and periodic balance snapshots.
+
+Every posting applied to player_funds is also appended to fund_ledger as a
+typed entry (see fund.constants), so player_funds is a read model that can
+be audited and recomputed at any time. The balances of a player at a point
+in time are the latest snapshot taken at or before that point plus the
+aggregate of the ledger entries written after it. Snapshots only keep that
+tail short; they never change a derived balance. Writers and snapshots are
+serialized with an advisory lock (see lock_ledger), so an entry whose id
+was allocated before a snapshot's cut-off cannot commit after it.
+
+None of the functions commit; they run inside the caller's transaction.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+import fund_models
+from fund.constants import LEDGER_LOCK_KEY, LEDGER_OPENING, LEDGER_OPENING_ADJUSTMENT, LEDGER_SOURCE_TYPES, BALANCE_TOLERANCE
+
+# Ledger delta column -> balance field it accumulates into
+DELTA_FIELDS = {
+    "delta_balance": "current_balance",
+    "delta_cost": "total_cost",
+    "delta_paid": "total_paid",
+    "delta_days": "days_played",
+}
+
+
+def empty_balance() -> dict:
+    return {
+        "current_balance": 0.0,
+        "total_cost": 0.0,
+        "total_paid": 0.0,
+        "days_played": 0,
+        "last_entry_id": 0,
+        "as_of": None,
+        "tail_entries": 0
+    }
+
+
+async def lock_ledger(db: AsyncSession, exclusive: bool = False):
+    """Take the ledger's advisory lock until the transaction ends (shared for writers, exclusive for snapshots)"""
+    lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+    await db.execute(select(lock(LEDGER_LOCK_KEY)))
+
+
+async def append_entries(entries: List[dict], posted_at: datetime, db: AsyncSession):
+    """Bulk insert ledger entries: [{player_id, entry_type, reference, delta_balance, delta_cost, delta_paid, delta_days}]"""
+    if not entries:
+        return
+    await lock_ledger(db)
+    await db.execute(
+        insert(fund_models.FundLedgerEntry),
+        [
+            {
+                "player_id": entry["player_id"],
+                "entry_type": entry["entry_type"],
+                "reference": entry.get("reference"),
+                "delta_balance": entry.get("delta_balance", 0.0),
+                "delta_cost": entry.get("delta_cost", 0.0),
+                "delta_paid": entry.get("delta_paid", 0.0),
+                "delta_days": entry.get("delta_days", 0),
+                "posted_at": posted_at
+            }
+            for entry in entries
+        ]
+    )
+
+
+async def get_ledger_balances(
+    db: AsyncSession,
+    as_of: Optional[datetime] = None,
+    player_ids: Optional[Iterable[int]] = None
+) -> Dict[int, dict]:
+    """Derive balances from the latest snapshot plus the ledger tail (as of a point in time, default now)"""
+    snapshot = fund_models.FundBalanceSnapshot
+    ledger = fund_models.FundLedgerEntry
+    if player_ids is not None:
+        player_ids = list(player_ids)
+
+    latest_snapshots = (
+        select(snapshot)
+        .distinct(snapshot.player_id)
+        .order_by(snapshot.player_id, snapshot.as_of.desc(), snapshot.last_entry_id.desc())
+    )
+    if as_of is not None:
+        latest_snapshots = latest_snapshots.where(snapshot.as_of <= as_of)
+    if player_ids is not None:
+        latest_snapshots = latest_snapshots.where(snapshot.player_id.in_(player_ids))
+    latest_snapshots = latest_snapshots.subquery()
+
+    balances = {}
+    snapshot_result = await db.execute(select(latest_snapshots))
+    for row in snapshot_result.all():
+        balance = balances[row.player_id] = empty_balance()
+        balance.update(
+            current_balance=row.current_balance,
+            total_cost=row.total_cost,
+            total_paid=row.total_paid,
+            days_played=row.days_played,
+            last_entry_id=row.last_entry_id,
+            as_of=row.as_of
+        )
+
+    tail_query = (
+        select(
+            ledger.player_id,
+            *(func.sum(getattr(ledger, delta_field)).label(delta_field) for delta_field in DELTA_FIELDS),
+            func.max(ledger.id).label("last_entry_id"),
+            func.max(ledger.posted_at).label("as_of"),
+            func.count().label("tail_entries")
+        )
+        .outerjoin(latest_snapshots, latest_snapshots.c.player_id == ledger.player_id)
+        .where(ledger.id > func.coalesce(latest_snapshots.c.last_entry_id, 0))
+        .group_by(ledger.player_id)
+    )
+    if as_of is not None:
+        tail_query = tail_query.where(ledger.posted_at <= as_of)
+    if player_ids is not None:
+        tail_query = tail_query.where(ledger.player_id.in_(player_ids))
+
+    tail_result = await db.execute(tail_query)
+    for row in tail_result.all():
+        balance = balances.setdefault(row.player_id, empty_balance())
+        for delta_field, balance_field in DELTA_FIELDS.items():
+            balance[balance_field] += getattr(row, delta_field)
+        balance["last_entry_id"] = row.last_entry_id
+        balance["as_of"] = row.as_of
+        balance["tail_entries"] = row.tail_entries
+
+    return balances
+
+
+async def create_balance_snapshots(db: AsyncSession) -> int:
+    """Snapshot the balances of every player with ledger entries since their last snapshot"""
+    # Waits for in-flight writers to commit and holds new ones off until this transaction ends
+    await lock_ledger(db, exclusive=True)
+    balances = await get_ledger_balances(db)
+    rows = [
+        {
+            "player_id": player_id,
+            "last_entry_id": balance["last_entry_id"],
+            "as_of": balance["as_of"],
+            "current_balance": balance["current_balance"],
+            "total_cost": balance["total_cost"],
+            "total_paid": balance["total_paid"],
+            "days_played": balance["days_played"]
+        }
+        for player_id, balance in sorted(balances.items())
+        if balance["tail_entries"]
+    ]
+    if rows:
+        await db.execute(insert(fund_models.FundBalanceSnapshot), rows)
+    return len(rows)
+
+
+async def find_ledger_mismatches(db: AsyncSession) -> List[dict]:
+    """Compare every player's ledger-derived balances against player_funds"""
+    # Writers commit the ledger and player_funds together; keep them out between the two reads
+    await lock_ledger(db, exclusive=True)
+    balances = await get_ledger_balances(db)
+    funds_result = await db.execute(select(fund_models.PlayerFund))
+    funds = {fund.player_id: fund for fund in funds_result.scalars().all()}
+
+    mismatches = []
+    for player_id in sorted(set(balances) | set(funds)):
+        fund = funds.get(player_id)
+        stored = {
+            balance_field: getattr(fund, balance_field) if fund is not None else 0
+            for balance_field in DELTA_FIELDS.values()
+        }
+        balance = balances.get(player_id, empty_balance())
+        if balance_differences(stored, balance):
+            ledger = {balance_field: balance[balance_field] for balance_field in DELTA_FIELDS.values()}
+            mismatches.append({"player_id": player_id, "stored": stored, "ledger": ledger})
+    return mismatches
+
+
+def balance_differences(target: dict, balance: dict) -> dict:
+    """Ledger deltas that move a derived balance to the target values (empty if they already match)"""
+    deltas = {
+        delta_field: target[balance_field] - balance[balance_field]
+        for delta_field, balance_field in DELTA_FIELDS.items()
+    }
+    if all(abs(delta) <= BALANCE_TOLERANCE for delta in deltas.values()):
+        return {}
+    return deltas
+
+
+async def get_entry_totals(entry_types: Iterable[str], db: AsyncSession) -> Dict[int, dict]:
+    """Aggregate the ledger entries of some types per player"""
+    ledger = fund_models.FundLedgerEntry
+    result = await db.execute(
+        select(
+            ledger.player_id,
+            *(func.sum(getattr(ledger, delta_field)).label(delta_field) for delta_field in DELTA_FIELDS)
+        )
+        .where(ledger.entry_type.in_(list(entry_types)))
+        .group_by(ledger.player_id)
+    )
+    totals = {}
+    for row in result.all():
+        balance = totals[row.player_id] = empty_balance()
+        for delta_field, balance_field in DELTA_FIELDS.items():
+            balance[balance_field] = getattr(row, delta_field)
+    return totals
+
+
+async def backfill_opening_entries(source_figures: Dict[int, dict], db: AsyncSession) -> List[int]:
+    """Write opening entries so that every player's ledger balance matches player_funds, returning the players carried over
+
+    source_figures are every player's figures recomputed from the source
+    records (see fund.reconciliation). The part of the pre-ledger balances
+    they account for and the ledger does not yet is an opening entry; the
+    rest was set directly and is an opening adjustment, which
+    reconciliation carries over as an offset. Players that only have an
+    opening entry from an earlier backfill get the same split, as a pair of
+    entries that leaves their balances unchanged (against the source records
+    as they are now, which is exact unless they drifted from the ledger
+    since). The adjustment is written
+    even when it is zero: it marks the player as carried over, and later
+    drift is left to reconciliation.
+    """
+    ledger = fund_models.FundLedgerEntry
+    funds_result = await db.execute(select(fund_models.PlayerFund))
+    funds = funds_result.scalars().all()
+    balances = await get_ledger_balances(db)
+    sourced = await get_entry_totals(LEDGER_SOURCE_TYPES, db)
+    opened_result = await db.execute(
+        select(ledger.player_id, ledger.entry_type)
+        .where(ledger.entry_type.in_([LEDGER_OPENING, LEDGER_OPENING_ADJUSTMENT]))
+        .distinct()
+    )
+    opened = {entry_type: set() for entry_type in (LEDGER_OPENING, LEDGER_OPENING_ADJUSTMENT)}
+    for row in opened_result.all():
+        opened[row.entry_type].add(row.player_id)
+
+    entries = []
+    for fund in funds:
+        if fund.player_id in opened[LEDGER_OPENING_ADJUSTMENT]:
+            continue
+        balance = balances.get(fund.player_id, empty_balance())
+        deltas = balance_differences(
+            {
+                "current_balance": fund.current_balance,
+                "total_cost": fund.total_cost,
+                "total_paid": fund.total_paid,
+                "days_played": fund.days_played
+            },
+            balance
+        )
+        if not deltas and fund.player_id not in opened[LEDGER_OPENING]:
+            continue
+
+        opening = balance_differences(
+            source_figures.get(fund.player_id, empty_balance()),
+            sourced.get(fund.player_id, empty_balance())
+        )
+        adjustment = {
+            delta_field: deltas.get(delta_field, 0) - opening.get(delta_field, 0)
+            for delta_field in DELTA_FIELDS
+        }
+        if opening:
+            entries.append({"player_id": fund.player_id, "entry_type": LEDGER_OPENING, **opening})
+        entries.append({"player_id": fund.player_id, "entry_type": LEDGER_OPENING_ADJUSTMENT, **adjustment})
+
+    await append_entries(entries, datetime.utcnow(), db)
+    return sorted({entry["player_id"] for entry in entries})
@@ -0,0 +1,50 @@
+"""
+Keyset pagination helpers for the fund history endpoints.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last row
+of a page; the next page continues strictly after it, so deep pages cost
+the same as the first one. Total counts are optional and cached per fund
+data version, so repeated page requests between writes count only once.
+"""
+
+import base64
+import json
+from typing import Any, Callable, List
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from data_versions import data_versions, FUND
+from fund.cache import fund_cache
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of a row (JSON-serializable values) into an opaque cursor"""
+    payload = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *converters: Callable[[Any], Any]) -> List[Any]:
+    """Decode a cursor into its sort key, one converter per value, rejecting malformed tokens with 400"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(converters):
+            raise ValueError("Unexpected cursor shape")
+        return [converter(value) for converter, value in zip(converters, values)]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def cached_count(cache_key: str, count_statement, db: AsyncSession) -> int:
+    """Run a count query, reusing its result until the fund data changes"""
+    fund_version = data_versions.get(FUND)
+    cached = fund_cache.get(f"count:{cache_key}")
+    if cached is not None and cached[0] == fund_version:
+        return cached[1]
+
+    count_result = await db.execute(count_statement)
+    total = count_result.scalar() or 0
+    fund_cache.set(f"count:{cache_key}", (fund_version, total))
+    return total
+
+
+def total_pages(total: int, page_size: int) -> int:
+    return (total + page_size - 1) // page_size if page_size > 0 else 0
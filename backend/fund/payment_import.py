@@ -0,0 +1,157 @@
+"""
+Incremental parsing of bulk payment imports.
+
+The request body is read chunk by chunk and turned into numbered raw rows
+(dicts with player_name, amount, payment_date and notes) as soon as each
+row is complete, so the body is never buffered whole. Two formats are
+accepted:
+
+- CSV (text/csv) with a header row naming at least player_name and amount;
+  payment_date (YYYY-MM-DD) and notes are optional, other columns ignored
+- a JSON array of payment objects (application/json)
+
+Rows are numbered from 1 (the CSV header does not count). Malformed input
+that makes the rest of the body unreadable is rejected with 400; the
+validation of single rows is left to the caller so it can report per-row
+errors.
+"""
+
+import csv
+import codecs
+import json
+from typing import AsyncIterator, Dict, Tuple
+from fastapi import HTTPException
+
+CSV_REQUIRED_COLUMNS = ("player_name", "amount")
+CSV_OPTIONAL_COLUMNS = ("payment_date", "notes")
+
+
+async def _decoded_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # utf-8-sig drops the byte order mark spreadsheet exports tend to start with
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        async for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="The import must be UTF-8 encoded")
+    if text:
+        yield text
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Complete CSV records (a quoted field may span several lines)"""
+    pending = ""
+    async for text in _decoded_chunks(chunks):
+        lines = (pending + text).split("\n")
+        pending = lines.pop()  # The last line may still be incomplete
+        record = ""
+        for line in lines:
+            record += line + "\n"
+            if record.count('"') % 2 == 0:  # Escaped quotes come in pairs
+                yield record
+                record = ""
+        pending = record + pending
+    if pending.count('"') % 2:
+        raise HTTPException(status_code=400, detail="Malformed CSV: unterminated quoted field at the end of the import")
+    if pending:
+        yield pending
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+    """Yield (row number, raw row) for each non-empty CSV record after the header"""
+    columns = None
+    row_number = 0
+    async for record in _csv_records(chunks):
+        try:
+            values = next(csv.reader([record]), [])
+        except csv.Error as e:
+            raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+        if not any(value.strip() for value in values):
+            continue
+
+        if columns is None:
+            columns = [value.strip().lower() for value in values]
+            missing_columns = [column for column in CSV_REQUIRED_COLUMNS if column not in columns]
+            if missing_columns:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"CSV header is missing column(s): {', '.join(missing_columns)}"
+                )
+            continue
+
+        row_number += 1
+        row = dict(zip(columns, values))
+        yield row_number, {
+            column: (row.get(column) or "").strip() or None
+            for column in CSV_REQUIRED_COLUMNS + CSV_OPTIONAL_COLUMNS
+        }
+
+    if columns is None:
+        raise HTTPException(status_code=400, detail="CSV import is empty")
+
+
+async def iter_json_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, object]]:
+    """Yield (row number, element) for each element of a JSON array, decoding elements as they arrive"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    # After an element only ',' or ']' may follow; after a ',' only another element
+    after_element = after_separator = False
+    row_number = 0
+    stream = _decoded_chunks(chunks)
+    exhausted = False
+
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise HTTPException(status_code=400, detail="JSON import must be an array of payments")
+                started = True
+                position += 1
+                continue
+            if after_element:
+                if buffer[position] == ",":
+                    after_element, after_separator = False, True
+                    position += 1
+                    continue
+                if buffer[position] != "]":
+                    raise HTTPException(status_code=400, detail=f"Malformed JSON: expected ',' or ']' after payment {row_number}")
+            if buffer[position] == "]" and not after_separator:
+                break
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                end = None
+            # A value that ends at the buffer edge may continue in the next chunk (e.g. a number)
+            if end is not None and (end < len(buffer) or exhausted):
+                row_number += 1
+                yield row_number, element
+                buffer, position = buffer[end:], 0
+                after_element, after_separator = True, False
+                continue
+            if exhausted:
+                raise HTTPException(status_code=400, detail=f"Malformed or truncated JSON at payment {row_number + 1}")
+
+        if exhausted:
+            raise HTTPException(status_code=400, detail="JSON import is empty or truncated")
+        try:
+            buffer += await stream.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+
+    # Only whitespace may follow the array (e.g. not a second, concatenated array)
+    rest = buffer[position + 1:]
+    while True:
+        if rest.strip():
+            raise HTTPException(status_code=400, detail="Malformed JSON: unexpected data after the payment array")
+        try:
+            rest = await stream.__anext__()
+        except StopAsyncIteration:
+            break
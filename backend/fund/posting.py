@@ -0,0 +1,214 @@
+"""
+Set-based posting engine for player fund balances.
+
+Every write that moves money or played days is expressed as a list of
+FundPosting entries. apply_postings aggregates them per player and applies
+them with one INSERT ... ON CONFLICT (player_id) DO UPDATE statement whose
+arithmetic runs in SQL (current_balance = current_balance + delta), so
+there is no read-modify-write from Python and no get-or-create round trip.
+Each posting is also appended to the fund ledger (fund.ledger) as a typed
+entry, and postings with an entry_date are added to the monthly rollup
+(fund.rollup). The matching player_specific_costs and tournament_attendance
+rows are written in bulk as well, and attendance writes refresh the
+attendance summary (fund.attendance) of the players they touched.
+
+None of the functions commit; they run inside the caller's transaction.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+import fund_models
+from resolver import get_resolver
+from fund.constants import LEDGER_ADJUSTMENT
+from fund.ledger import append_entries, get_ledger_balances, balance_differences, empty_balance
+from fund.attendance import refresh_attendance_summaries
+from fund.rollup import apply_rollup_deltas
+
+
+class FundPosting(NamedTuple):
+    player_id: int
+    delta_balance: float = 0.0
+    delta_cost: float = 0.0
+    delta_paid: float = 0.0
+    delta_days: int = 0
+    entry_type: str = LEDGER_ADJUSTMENT
+    reference: Optional[str] = None
+    entry_date: Optional[date] = None  # Payment, tournament or cost date: the month of the rollup
+
+
+def aggregate_postings(postings: Iterable[FundPosting]) -> Dict[int, FundPosting]:
+    """Sum the postings of each player into a single posting"""
+    aggregated = {}
+    for posting in postings:
+        current = aggregated.get(posting.player_id)
+        if current is None:
+            aggregated[posting.player_id] = posting
+        else:
+            aggregated[posting.player_id] = current._replace(
+                delta_balance=current.delta_balance + posting.delta_balance,
+                delta_cost=current.delta_cost + posting.delta_cost,
+                delta_paid=current.delta_paid + posting.delta_paid,
+                delta_days=current.delta_days + posting.delta_days
+            )
+    return aggregated
+
+
+async def _upsert_funds(rows: List[dict], set_clause, db: AsyncSession) -> Dict[int, fund_models.PlayerFund]:
+    insert_statement = insert(fund_models.PlayerFund)
+    upsert_statement = insert_statement.on_conflict_do_update(
+        index_elements=[fund_models.PlayerFund.player_id],
+        set_=set_clause(insert_statement.excluded)
+    ).returning(fund_models.PlayerFund)
+
+    # populate_existing refreshes fund objects this session already holds
+    result = await db.scalars(upsert_statement, rows, execution_options={"populate_existing": True})
+    funds = {fund.player_id: fund for fund in result.all()}
+    get_resolver(db).remember_funds(funds.values())
+    return funds
+
+
+async def apply_postings(postings: Iterable[FundPosting], db: AsyncSession) -> Dict[int, fund_models.PlayerFund]:
+    """Apply postings with one upsert of player_funds and record them in the ledger, returning the updated funds"""
+    postings = list(postings)
+    aggregated = aggregate_postings(postings)
+    if not aggregated:
+        return {}
+
+    now = datetime.utcnow()
+    await append_entries(
+        [
+            posting._asdict()
+            for posting in postings
+            if posting.delta_balance or posting.delta_cost or posting.delta_paid or posting.delta_days
+        ],
+        now,
+        db
+    )
+    await apply_rollup_deltas(postings, db)
+    rows = [
+        {
+            "player_id": posting.player_id,
+            "current_balance": posting.delta_balance,
+            "total_cost": posting.delta_cost,
+            "total_paid": posting.delta_paid,
+            "days_played": posting.delta_days,
+            "last_updated": now
+        }
+        for _, posting in sorted(aggregated.items())  # Stable lock order between concurrent writers
+    ]
+    return await _upsert_funds(
+        rows,
+        lambda excluded: {
+            "current_balance": fund_models.PlayerFund.current_balance + excluded.current_balance,
+            "total_cost": fund_models.PlayerFund.total_cost + excluded.total_cost,
+            "total_paid": fund_models.PlayerFund.total_paid + excluded.total_paid,
+            "days_played": fund_models.PlayerFund.days_played + excluded.days_played,
+            "last_updated": excluded.last_updated
+        },
+        db
+    )
+
+
+async def set_fund_values(
+    fund_values: Dict[int, dict],
+    db: AsyncSession,
+    reference: Optional[str] = None
+) -> Dict[int, fund_models.PlayerFund]:
+    """Overwrite (or create) funds with absolute values: {player_id: {current_balance, days_played, total_paid, total_cost}}"""
+    if not fund_values:
+        return {}
+
+    now = datetime.utcnow()
+    # The ledger records the difference to the balances it derives for these players
+    balances = await get_ledger_balances(db, player_ids=fund_values.keys())
+    entries = []
+    for player_id, values in sorted(fund_values.items()):
+        deltas = balance_differences(values, balances.get(player_id, empty_balance()))
+        if deltas:
+            entries.append({"player_id": player_id, "entry_type": LEDGER_ADJUSTMENT, "reference": reference, **deltas})
+    await append_entries(entries, now, db)
+
+    rows = [
+        {"player_id": player_id, "last_updated": now, **values}
+        for player_id, values in sorted(fund_values.items())
+    ]
+    return await _upsert_funds(
+        rows,
+        lambda excluded: {
+            "current_balance": excluded.current_balance,
+            "total_cost": excluded.total_cost,
+            "total_paid": excluded.total_paid,
+            "days_played": excluded.days_played,
+            "last_updated": excluded.last_updated
+        },
+        db
+    )
+
+
+async def insert_specific_costs(
+    costs: List[dict],
+    db: AsyncSession,
+    tournament_cost_id: Optional[int] = None
+):
+    """Bulk insert player-specific costs: [{player_id, cost_amount, cost_name, cost_date}]"""
+    if not costs:
+        return
+    await db.execute(
+        insert(fund_models.PlayerSpecificCost),
+        [
+            {
+                "tournament_cost_id": tournament_cost_id,
+                "player_id": cost["player_id"],
+                "cost_amount": cost["cost_amount"],
+                "cost_name": cost.get("cost_name"),
+                "cost_date": cost.get("cost_date")
+            }
+            for cost in costs
+        ]
+    )
+
+
+async def upsert_attendance(tournament_id: str, club_member_flags: Dict[int, bool], db: AsyncSession):
+    """Record who attended a tournament (player_id -> is_club_member), updating existing rows in bulk"""
+    if not club_member_flags:
+        return
+
+    existing_result = await db.execute(
+        select(
+            fund_models.TournamentAttendance.id,
+            fund_models.TournamentAttendance.player_id,
+            fund_models.TournamentAttendance.is_club_member
+        ).where(fund_models.TournamentAttendance.tournament_id == tournament_id)
+    )
+    existing_rows = existing_result.all()
+    existing_player_ids = {row.player_id for row in existing_rows}
+
+    # One UPDATE per target flag for the rows whose flag changes
+    for is_club_member in (True, False):
+        attendance_ids = [
+            row.id for row in existing_rows
+            if row.player_id in club_member_flags
+            and club_member_flags[row.player_id] == is_club_member
+            and row.is_club_member != is_club_member
+        ]
+        if attendance_ids:
+            await db.execute(
+                update(fund_models.TournamentAttendance)
+                .where(fund_models.TournamentAttendance.id.in_(attendance_ids))
+                .values(is_club_member=is_club_member)
+                .execution_options(synchronize_session=False)
+            )
+
+    new_rows = [
+        {"tournament_id": tournament_id, "player_id": player_id, "is_club_member": is_club_member}
+        for player_id, is_club_member in club_member_flags.items()
+        if player_id not in existing_player_ids
+    ]
+    if new_rows:
+        await db.execute(insert(fund_models.TournamentAttendance), new_rows)
+
+    await refresh_attendance_summaries(club_member_flags.keys(), db)
@@ -0,0 +1,144 @@
+"""
+Reconciliation of player_funds against the records it is derived from.
+
+The expected figures of every player are recomputed with one statement of
+grouped subqueries (fund.sources), so they and the stored balances come
+from the same snapshot:
+
+- total_paid: the sum of payment_transactions
+- total_cost: the per-player share of every costed tournament (venue fee
+  unless a club member, an equal share of the ball and common misc costs,
+  plus the player's specific costs of that tournament) and the misc costs
+  that are not tied to a tournament
+- current_balance: total_paid - total_cost
+- days_played: tournaments a player is ranked in, plus attended tournaments
+  without rank groups (unofficial ones)
+
+Balances set directly (seed adjustments, and the opening adjustments the
+ledger backfill writes for pre-ledger balances the source records do not
+account for) have no source records and are added on top as offsets.
+Opening entries are not offsets: they stand for pre-ledger source records,
+which the recompute already counts. Corrections are posted through the
+posting engine as reconciliation entries, which are not offsets either, so
+a corrected player reconciles cleanly on the next run.
+
+None of the functions commit; they run inside the caller's transaction.
+"""
+
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, or_
+import models
+import fund_models
+from fund.constants import LEDGER_OFFSET_TYPES, LEDGER_RECONCILIATION, BALANCE_TOLERANCE
+from fund.posting import FundPosting, apply_postings
+from fund.sources import payment_totals, misc_cost_totals, tournament_cost_totals, days_played_totals
+
+FUND_FIELDS = ("current_balance", "total_cost", "total_paid", "days_played")
+
+
+def _offset_totals():
+    entry = fund_models.FundLedgerEntry
+    return (
+        select(
+            entry.player_id,
+            func.sum(entry.delta_balance).label("balance"),
+            func.sum(entry.delta_cost).label("cost"),
+            func.sum(entry.delta_paid).label("paid"),
+            func.sum(entry.delta_days).label("days")
+        )
+        .where(entry.entry_type.in_(LEDGER_OFFSET_TYPES))
+        .group_by(entry.player_id)
+        .subquery("offset_totals")
+    )
+
+
+async def compute_fund_figures(db: AsyncSession) -> Dict[int, dict]:
+    """Stored and expected figures of every player with a fund record or source records, in one statement"""
+    fund = fund_models.PlayerFund
+    payments = payment_totals()
+    misc_costs = misc_cost_totals()
+    tournament_costs = tournament_cost_totals()
+    days = days_played_totals()
+    offsets = _offset_totals()
+
+    paid = func.coalesce(payments.c.total_paid, 0.0)
+    cost = func.coalesce(tournament_costs.c.tournament_cost, 0.0) + func.coalesce(misc_costs.c.misc_cost, 0.0)
+    query = (
+        select(
+            models.Player.id.label("player_id"),
+            models.Player.name.label("player_name"),
+            fund.current_balance,
+            fund.total_cost,
+            fund.total_paid,
+            fund.days_played,
+            (paid - cost).label("source_current_balance"),
+            cost.label("source_total_cost"),
+            paid.label("source_total_paid"),
+            func.coalesce(days.c.days_played, 0).label("source_days_played"),
+            (paid - cost + func.coalesce(offsets.c.balance, 0.0)).label("expected_current_balance"),
+            (cost + func.coalesce(offsets.c.cost, 0.0)).label("expected_total_cost"),
+            (paid + func.coalesce(offsets.c.paid, 0.0)).label("expected_total_paid"),
+            (func.coalesce(days.c.days_played, 0) + func.coalesce(offsets.c.days, 0)).label("expected_days_played")
+        )
+        .outerjoin(fund, fund.player_id == models.Player.id)
+        .outerjoin(payments, payments.c.player_id == models.Player.id)
+        .outerjoin(misc_costs, misc_costs.c.player_id == models.Player.id)
+        .outerjoin(tournament_costs, tournament_costs.c.player_id == models.Player.id)
+        .outerjoin(days, days.c.player_id == models.Player.id)
+        .outerjoin(offsets, offsets.c.player_id == models.Player.id)
+        .where(or_(
+            fund.id.is_not(None),
+            payments.c.player_id.is_not(None),
+            misc_costs.c.player_id.is_not(None),
+            tournament_costs.c.player_id.is_not(None),
+            days.c.player_id.is_not(None),
+            offsets.c.player_id.is_not(None)
+        ))
+        .order_by(models.Player.id)
+    )
+
+    result = await db.execute(query)
+    figures = {}
+    for row in result.all():
+        figures[row.player_id] = {
+            "player_name": row.player_name,
+            # A player without a fund record has all-zero balances
+            "stored": {field: getattr(row, field) or 0 for field in FUND_FIELDS},
+            "expected": {field: getattr(row, f"expected_{field}") for field in FUND_FIELDS},
+            # The recompute from the source records alone, without offsets
+            "sources": {field: getattr(row, f"source_{field}") for field in FUND_FIELDS}
+        }
+    return figures
+
+
+async def find_fund_mismatches(db: AsyncSession, figures: Optional[Dict[int, dict]] = None) -> List[dict]:
+    """Compare every player's stored fund figures against a recompute from the source records"""
+    if figures is None:
+        figures = await compute_fund_figures(db)
+
+    mismatches = []
+    for player_id, player_figures in figures.items():
+        stored, expected = player_figures["stored"], player_figures["expected"]
+        if any(abs(expected[field] - stored[field]) > BALANCE_TOLERANCE for field in FUND_FIELDS):
+            mismatches.append({"player_id": player_id, **player_figures})
+    return mismatches
+
+
+async def apply_fund_corrections(mismatches: List[dict], db: AsyncSession) -> int:
+    """Move the mismatching funds to their expected figures with one posting per player"""
+    postings = [
+        FundPosting(
+            player_id=mismatch["player_id"],
+            delta_balance=mismatch["expected"]["current_balance"] - mismatch["stored"]["current_balance"],
+            delta_cost=mismatch["expected"]["total_cost"] - mismatch["stored"]["total_cost"],
+            delta_paid=mismatch["expected"]["total_paid"] - mismatch["stored"]["total_paid"],
+            delta_days=mismatch["expected"]["days_played"] - mismatch["stored"]["days_played"],
+            entry_type=LEDGER_RECONCILIATION,
+            reference="reconciliation"
+        )
+        for mismatch in mismatches
+    ]
+    await apply_postings(postings, db)
+    return len(postings)
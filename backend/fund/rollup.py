@@ -0,0 +1,179 @@
+"""
+Maintenance of the fund_monthly_rollup table.
+
+Each row holds what a player paid, was charged for tournaments and misc
+costs, and how many days they played in one month, so time-bucketed fund
+charts read a few hundred pre-aggregated rows instead of scanning payments,
+costs and attendance.
+
+The posting engine (fund.posting) adds every posting that carries an
+entry_date to the row of its player and month: payments by payment date,
+tournament costs and played days by tournament date, misc costs by cost
+date. Postings without one (seeding, opening balances, reconciliation
+corrections, misc costs without a date) are not monthly activity and stay
+out. Rows can also be recomputed from the source records (fund.sources),
+for a backfill or when a tournament moves to another date.
+
+None of the functions commit, except rebuild_monthly_rollup.
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, delete, literal, cast, union_all, Float, Integer
+from sqlalchemy.dialects.postgresql import insert
+import fund_models
+from fund.constants import LEDGER_MISC_COST, BALANCE_TOLERANCE
+from fund.sources import payment_totals, misc_cost_totals, tournament_cost_totals, days_played_totals
+
+ROLLUP_FIELDS = ("paid", "tournament_cost", "misc_cost", "days_played")
+
+
+def _empty_rollup() -> dict:
+    return {"paid": 0.0, "tournament_cost": 0.0, "misc_cost": 0.0, "days_played": 0}
+
+
+def first_of_month(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def rollup_deltas(postings: Iterable) -> Dict[Tuple[int, date], dict]:
+    """Sum FundPostings with an entry_date per (player_id, month)"""
+    deltas = {}
+    for posting in postings:
+        if posting.entry_date is None:
+            continue
+        delta = deltas.setdefault((posting.player_id, first_of_month(posting.entry_date)), _empty_rollup())
+        delta["paid"] += posting.delta_paid
+        delta["days_played"] += posting.delta_days
+        # Reversals only ever undo payments and tournament costs
+        cost_field = "misc_cost" if posting.entry_type == LEDGER_MISC_COST else "tournament_cost"
+        delta[cost_field] += posting.delta_cost
+    return {key: delta for key, delta in deltas.items() if any(delta.values())}
+
+
+async def apply_rollup_deltas(postings: Iterable, db: AsyncSession):
+    """Add the postings to their monthly rows with one INSERT ... ON CONFLICT DO UPDATE"""
+    deltas = rollup_deltas(postings)
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    rollup = fund_models.FundMonthlyRollup
+    insert_statement = insert(rollup)
+    await db.execute(
+        insert_statement.on_conflict_do_update(
+            index_elements=[rollup.player_id, rollup.month],
+            set_={
+                "paid": rollup.paid + insert_statement.excluded.paid,
+                "tournament_cost": rollup.tournament_cost + insert_statement.excluded.tournament_cost,
+                "misc_cost": rollup.misc_cost + insert_statement.excluded.misc_cost,
+                "days_played": rollup.days_played + insert_statement.excluded.days_played,
+                "updated_at": insert_statement.excluded.updated_at
+            }
+        ),
+        [
+            {"player_id": player_id, "month": month, "updated_at": now, **delta}
+            for (player_id, month), delta in sorted(deltas.items())  # Stable lock order between concurrent writers
+        ]
+    )
+
+
+async def compute_monthly_rollup(
+    db: AsyncSession,
+    player_ids: Optional[Iterable[int]] = None
+) -> Dict[Tuple[int, date], dict]:
+    """Recompute monthly rows from the source records (all players when player_ids is None)"""
+    if player_ids is not None:
+        player_ids = list(set(player_ids))
+        if not player_ids:
+            return {}
+
+    zero_float = literal(0.0, Float)
+    zero_int = literal(0, Integer)
+    payments = payment_totals(by_month=True, player_ids=player_ids)
+    tournament_costs = tournament_cost_totals(by_month=True, player_ids=player_ids)
+    misc_costs = misc_cost_totals(by_month=True, player_ids=player_ids)
+    days = days_played_totals(by_month=True, player_ids=player_ids)
+    figures = union_all(
+        select(payments.c.player_id, payments.c.month, payments.c.total_paid.label("paid"),
+               zero_float.label("tournament_cost"), zero_float.label("misc_cost"), zero_int.label("days_played")),
+        select(tournament_costs.c.player_id, tournament_costs.c.month, zero_float,
+               tournament_costs.c.tournament_cost, zero_float, zero_int),
+        select(misc_costs.c.player_id, misc_costs.c.month, zero_float,
+               zero_float, misc_costs.c.misc_cost, zero_int),
+        select(days.c.player_id, days.c.month, zero_float,
+               zero_float, zero_float, days.c.days_played)
+    ).subquery()
+
+    result = await db.execute(
+        select(
+            figures.c.player_id,
+            figures.c.month,
+            func.sum(figures.c.paid).label("paid"),
+            func.sum(figures.c.tournament_cost).label("tournament_cost"),
+            func.sum(figures.c.misc_cost).label("misc_cost"),
+            cast(func.sum(figures.c.days_played), Integer).label("days_played")  # SUM of bigint is numeric
+        )
+        .group_by(figures.c.player_id, figures.c.month)
+    )
+    return {
+        (row.player_id, row.month): {field: getattr(row, field) for field in ROLLUP_FIELDS}
+        for row in result.all()
+    }
+
+
+async def _insert_rows(rows: Dict[Tuple[int, date], dict], db: AsyncSession):
+    if not rows:
+        return
+    now = datetime.utcnow()
+    await db.execute(
+        insert(fund_models.FundMonthlyRollup),
+        [
+            {"player_id": player_id, "month": month, "updated_at": now, **figures}
+            for (player_id, month), figures in sorted(rows.items())
+        ]
+    )
+
+
+async def refresh_monthly_rollup(player_ids: Iterable[int], db: AsyncSession):
+    """Recompute and store every month of the given players from the source records"""
+    player_ids = list(set(player_ids))
+    if not player_ids:
+        return
+    await db.flush()
+    rows = await compute_monthly_rollup(db, player_ids)
+    await db.execute(
+        delete(fund_models.FundMonthlyRollup).where(fund_models.FundMonthlyRollup.player_id.in_(player_ids))
+    )
+    await _insert_rows(rows, db)
+
+
+async def rebuild_monthly_rollup(db: AsyncSession) -> int:
+    """Backfill: rebuild every row from the source records and commit"""
+    await db.execute(delete(fund_models.FundMonthlyRollup))
+    rows = await compute_monthly_rollup(db)
+    await _insert_rows(rows, db)
+    await db.commit()
+    return len(rows)
+
+
+async def find_rollup_mismatches(db: AsyncSession) -> List[dict]:
+    """Compare the stored rows against a from-scratch recompute"""
+    expected_rows = await compute_monthly_rollup(db)
+
+    stored_result = await db.execute(select(fund_models.FundMonthlyRollup))
+    stored_rows = {
+        (row.player_id, row.month): {field: getattr(row, field) for field in ROLLUP_FIELDS}
+        for row in stored_result.scalars().all()
+    }
+
+    mismatches = []
+    for player_id, month in sorted(set(expected_rows) | set(stored_rows)):
+        # A missing row is equivalent to a month without activity
+        expected = expected_rows.get((player_id, month), _empty_rollup())
+        stored = stored_rows.get((player_id, month), _empty_rollup())
+        if any(abs(expected[field] - stored[field]) > BALANCE_TOLERANCE for field in ROLLUP_FIELDS):
+            mismatches.append({"player_id": player_id, "month": month, "stored": stored, "expected": expected})
+    return mismatches
@@ -1,13 +1,98 @@
 from fastapi import HTTPException
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, text
+from sqlalchemy import func, text, literal_column, tuple_, insert, cast, Date
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import selectinload
-from datetime import datetime, date
-from typing import List, Optional
+from datetime import datetime, date, time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import models
 import fund_models
 import fund_schemas
+from data_versions import data_versions, FUND
+from resolver import get_resolver
+from fund.posting import FundPosting, apply_postings, set_fund_values, insert_specific_costs, upsert_attendance
+from fund import ledger
+from fund.reconciliation import compute_fund_figures, find_fund_mismatches, apply_fund_corrections
+from fund.rollup import first_of_month
+from fund.cache import fund_cache, cost_details_key, invalidate_cost_details
+from fund.pagination import encode_cursor, decode_cursor, cached_count, total_pages
+from fund.constants import LEDGER_PAYMENT, LEDGER_TOURNAMENT_COST, LEDGER_MISC_COST, LEDGER_REVERSAL, MAX_COST_SCENARIOS, MAX_PAYMENT_IMPORT_ROWS, TIMESERIES_PERIODS
+
+
+def _cost_request_player_names(cost_request: fund_schemas.AddTournamentCostRequest) -> List[str]:
+    """Every player name a tournament cost request refers to"""
+    player_names = list(cost_request.tournament_players)
+    for specific_cost in cost_request.player_specific_costs:
+        player_names.extend(specific_cost.player_names)
+    return player_names
+
+
+def _payment_posting(
+    player_id: int,
+    amount: float,
+    payment_id: int,
+    payment_date: date,
+    entry_type: str = LEDGER_PAYMENT
+) -> FundPosting:
+    return FundPosting(
+        player_id=player_id,
+        delta_balance=amount,
+        delta_paid=amount,
+        entry_type=entry_type,
+        reference=f"payment:{payment_id}",
+        entry_date=payment_date
+    )
+
+
+def _specific_cost_totals(player_specific_costs: List[fund_schemas.PlayerSpecificCostCreate]) -> Dict[str, float]:
+    """Total specific cost per player name (a name listed twice in one cost is charged once)"""
+    specific_totals = {}
+    for specific_cost in player_specific_costs:
+        for player_name in set(specific_cost.player_names):
+            specific_totals[player_name] = specific_totals.get(player_name, 0.0) + specific_cost.cost_amount
+    return specific_totals
+
+
+def _build_player_breakdowns(
+    tournament_players: List[str],
+    club_members: List[str],
+    specific_totals: Dict[str, float],
+    venue_fee: float,
+    ball_fee: float,
+    num_balls_purchased: int,
+    common_misc_cost: float
+) -> Tuple[float, float, List[fund_schemas.PlayerCostBreakdown]]:
+    """Split a tournament's costs among its players, returning (total venue cost, total ball cost, breakdowns)"""
+    num_players = len(tournament_players)
+    num_regular_members = num_players - len(club_members)
+    club_member_names = set(club_members)
+    
+    total_venue_cost = num_regular_members * venue_fee
+    total_ball_cost = num_balls_purchased * ball_fee
+    
+    # Ball and common misc costs are split equally among all players
+    ball_cost_per_player = total_ball_cost / num_players if num_players > 0 else 0
+    misc_cost_per_player = common_misc_cost / num_players if num_players > 0 else 0
+    
+    player_breakdowns = []
+    for player_name in tournament_players:
+        is_club_member = player_name in club_member_names
+        player_venue_cost = 0.0 if is_club_member else venue_fee
+        player_specific_cost = specific_totals.get(player_name, 0.0)
+        
+        player_breakdowns.append(fund_schemas.PlayerCostBreakdown(
+            player_name=player_name,
+            venue_cost=player_venue_cost,
+            ball_cost=ball_cost_per_player,
+            common_misc_cost=misc_cost_per_player,
+            player_specific_cost=player_specific_cost,
+            total_cost=player_venue_cost + ball_cost_per_player + misc_cost_per_player + player_specific_cost,
+            is_club_member=is_club_member
+        ))
+    
+    return total_venue_cost, total_ball_cost, player_breakdowns
 
 
 async def get_or_create_fund_settings(db: AsyncSession) -> fund_models.FundSettings:
@@ -47,6 +132,7 @@ async def update_fund_settings(
         db.add(settings)
     
     await db.commit()
+    data_versions.bump(FUND)
     await db.refresh(settings)
     return settings
 
@@ -61,6 +147,7 @@ async def update_next_tournament_date(
     settings.updated_at = datetime.utcnow()
     
     await db.commit()
+    data_versions.bump(FUND)
     await db.refresh(settings)
     return settings
 
@@ -70,92 +157,105 @@ async def seed_initial_player_data(
     db: AsyncSession
 ):
     """Seed initial fund data for players"""
-    for player_data in seed_data.players:
-        # Get player by name
-        player_result = await db.execute(
-            select(models.Player).where(models.Player.name == player_data.player_name)
-        )
-        player = player_result.scalar()
-        
+    resolver = get_resolver(db)
+    players = await resolver.get_players(player_data.player_name for player_data in seed_data.players)
+    for player_name, player in players.items():
         if not player:
             raise HTTPException(
                 status_code=404,
-                detail=f"Player '{player_data.player_name}' not found"
-            )
-        
-        # Check if fund already exists
-        fund_result = await db.execute(
-            select(fund_models.PlayerFund).where(
-                fund_models.PlayerFund.player_id == player.id
-            )
-        )
-        existing_fund = fund_result.scalar()
-        
-        if existing_fund:
-            # Update existing
-            existing_fund.current_balance = player_data.current_balance
-            existing_fund.days_played = player_data.days_played
-            existing_fund.total_paid = player_data.total_paid
-            existing_fund.total_cost = player_data.total_cost
-            existing_fund.last_updated = datetime.utcnow()
-        else:
-            # Create new
-            new_fund = fund_models.PlayerFund(
-                player_id=player.id,
-                current_balance=player_data.current_balance,
-                days_played=player_data.days_played,
-                total_paid=player_data.total_paid,
-                total_cost=player_data.total_cost
+                detail=f"Player '{player_name}' not found"
             )
-            db.add(new_fund)
+
+    # Seeding sets absolute values; a player listed twice keeps the last entry
+    await set_fund_values(
+        {
+            players[player_data.player_name].id: {
+                "current_balance": player_data.current_balance,
+                "days_played": player_data.days_played,
+                "total_paid": player_data.total_paid,
+                "total_cost": player_data.total_cost
+            }
+            for player_data in seed_data.players
+        },
+        db,
+        reference="seed"
+    )
     
     await db.commit()
+    data_versions.bump(FUND)
     return {"message": "Initial data seeded successfully"}
 
 
 async def get_all_player_balances(
     search: Optional[str],
     filter_type: Optional[str],
-    db: AsyncSession
-) -> List[fund_schemas.PlayerFundResponse]:
-    """Get all player fund balances with optional search and filter"""
-    query = select(fund_models.PlayerFund).options(
-        selectinload(fund_models.PlayerFund.player)
-    )
-    
-    result = await db.execute(query)
-    funds = result.scalars().all()
-    
-    # Transform to response format
-    response = []
-    for fund in funds:
-        fund_data = fund_schemas.PlayerFundResponse(
-            id=fund.id,
-            player_id=fund.player_id,
-            player_name=fund.player.name,
-            is_guest=fund.player.is_guest,
-            current_balance=fund.current_balance,
-            days_played=fund.days_played,
-            total_paid=fund.total_paid,
-            total_cost=fund.total_cost,
-            last_updated=fund.last_updated
+    db: AsyncSession,
+    page: int = 1,
+    page_size: Optional[int] = None
+) -> Tuple[List[fund_schemas.PlayerFundResponse], int]:
+    """Get player fund balances with optional search, filter and pagination, returning (balances, total count)"""
+    # Plain column projection: no ORM objects are built for the rows
+    query = (
+        select(
+            fund_models.PlayerFund.id,
+            fund_models.PlayerFund.player_id,
+            models.Player.name.label("player_name"),
+            models.Player.is_guest,
+            fund_models.PlayerFund.current_balance,
+            fund_models.PlayerFund.days_played,
+            fund_models.PlayerFund.total_paid,
+            fund_models.PlayerFund.total_cost,
+            fund_models.PlayerFund.last_updated,
+            func.count().over().label("total")
         )
-        response.append(fund_data)
+        .join(models.Player, fund_models.PlayerFund.player_id == models.Player.id)
+    )
     
-    # Apply search filter
+    # Apply search filter (case-insensitive substring, served by the trigram index on players.name)
     if search:
-        response = [f for f in response if search.lower() in f.player_name.lower()]
+        escaped_search = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.where(models.Player.name.ilike(f"%{escaped_search}%", escape="\\"))
     
     # Apply balance filter
     if filter_type == "positive":
-        response = [f for f in response if f.current_balance > 0]
+        query = query.where(fund_models.PlayerFund.current_balance > 0)
     elif filter_type == "negative":
-        response = [f for f in response if f.current_balance < 0]
+        query = query.where(fund_models.PlayerFund.current_balance < 0)
     
-    # Sort by player name
-    response.sort(key=lambda x: x.player_name)
+    # Sort by player name (binary collation, the same order as sorting the strings in Python)
+    query = query.order_by(models.Player.name.collate("C"))
+    if page_size is not None:
+        query = query.offset((page - 1) * page_size).limit(page_size)
     
-    return response
+    result = await db.execute(query)
+    rows = result.all()
+    
+    if rows:
+        total = rows[0].total
+    elif page_size is not None and page > 1:
+        # Past the last page the window count has no row to ride on
+        count_result = await db.execute(
+            select(func.count()).select_from(query.limit(None).offset(None).order_by(None).subquery())
+        )
+        total = count_result.scalar() or 0
+    else:
+        total = 0
+    
+    balances = [
+        fund_schemas.PlayerFundResponse(
+            id=row.id,
+            player_id=row.player_id,
+            player_name=row.player_name,
+            is_guest=row.is_guest,
+            current_balance=row.current_balance,
+            days_played=row.days_played,
+            total_paid=row.total_paid,
+            total_cost=row.total_cost,
+            last_updated=row.last_updated
+        )
+        for row in rows
+    ]
+    return balances, total
 
 
 async def calculate_tournament_costs(
@@ -165,10 +265,7 @@ async def calculate_tournament_costs(
     """Calculate tournament costs and per-player breakdown"""
     
     # Get tournament by date
-    tournament_result = await db.execute(
-        select(models.Tournament).where(models.Tournament.date == cost_request.tournament_date)
-    )
-    tournament = tournament_result.scalar()
+    tournament = await get_resolver(db).get_tournament_by_date(cost_request.tournament_date)
     
     if not tournament:
         raise HTTPException(
@@ -183,51 +280,17 @@ async def calculate_tournament_costs(
     venue_fee = cost_request.venue_fee_per_person if not cost_request.use_default_venue_fee else settings.default_venue_fee
     ball_fee = cost_request.ball_fee_per_ball if not cost_request.use_default_ball_fee else settings.default_ball_fee
     
-    # Calculate totals
-    num_players = len(cost_request.tournament_players)
-    num_club_members = len(cost_request.club_members)
-    num_regular_members = num_players - num_club_members
-    
-    total_venue_cost = num_regular_members * venue_fee
-    total_ball_cost = cost_request.num_balls_purchased * ball_fee
+    total_venue_cost, total_ball_cost, player_breakdowns = _build_player_breakdowns(
+        cost_request.tournament_players,
+        cost_request.club_members,
+        _specific_cost_totals(cost_request.player_specific_costs),
+        venue_fee,
+        ball_fee,
+        cost_request.num_balls_purchased,
+        cost_request.common_misc_cost
+    )
     total_misc_cost = cost_request.common_misc_cost
     
-    # Ball cost per player (split equally among all players)
-    ball_cost_per_player = total_ball_cost / num_players if num_players > 0 else 0
-    
-    # Calculate per-player breakdown
-    player_breakdowns = []
-    
-    for player_name in cost_request.tournament_players:
-        is_club_member = player_name in cost_request.club_members
-        
-        # Venue cost
-        player_venue_cost = 0.0 if is_club_member else venue_fee
-        
-        # Ball cost (split equally)
-        player_ball_cost = ball_cost_per_player
-        
-        # Common misc cost (split equally)
-        player_common_misc = cost_request.common_misc_cost / num_players if num_players > 0 else 0
-        
-        # Player-specific costs
-        player_specific_cost = 0.0
-        for specific_cost in cost_request.player_specific_costs:
-            if player_name in specific_cost.player_names:
-                player_specific_cost += specific_cost.cost_amount
-        
-        total_player_cost = player_venue_cost + player_ball_cost + player_common_misc + player_specific_cost
-        
-        player_breakdowns.append(fund_schemas.PlayerCostBreakdown(
-            player_name=player_name,
-            venue_cost=player_venue_cost,
-            ball_cost=player_ball_cost,
-            common_misc_cost=player_common_misc,
-            player_specific_cost=player_specific_cost,
-            total_cost=total_player_cost,
-            is_club_member=is_club_member
-        ))
-    
     return fund_schemas.TournamentCostCalculationResponse(
         tournament_id=tournament.id,
         tournament_date=tournament.date,
@@ -239,12 +302,70 @@ async def calculate_tournament_costs(
     )
 
 
+async def calculate_tournament_cost_scenarios(
+    batch_request: fund_schemas.BatchCostCalculationRequest,
+    db: AsyncSession
+) -> fund_schemas.BatchCostCalculationResponse:
+    """Calculate the per-player breakdown of one roster under many fee scenarios"""
+    if not batch_request.scenarios:
+        raise HTTPException(status_code=400, detail="At least one scenario is required")
+    if len(batch_request.scenarios) > MAX_COST_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_COST_SCENARIOS} scenarios can be calculated at once")
+    
+    tournament = await get_resolver(db).get_tournament_by_date(batch_request.tournament_date)
+    
+    if not tournament:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Tournament not found for date {batch_request.tournament_date}"
+        )
+    
+    settings = await get_or_create_fund_settings(db)
+    
+    # Everything that does not depend on the fees is computed once for the roster
+    specific_totals = _specific_cost_totals(batch_request.player_specific_costs)
+    
+    results = []
+    for scenario in batch_request.scenarios:
+        venue_fee = scenario.venue_fee_per_person if scenario.venue_fee_per_person is not None else settings.default_venue_fee
+        ball_fee = scenario.ball_fee_per_ball if scenario.ball_fee_per_ball is not None else settings.default_ball_fee
+        total_venue_cost, total_ball_cost, player_breakdowns = _build_player_breakdowns(
+            batch_request.tournament_players,
+            batch_request.club_members,
+            specific_totals,
+            venue_fee,
+            ball_fee,
+            scenario.num_balls_purchased,
+            scenario.common_misc_cost
+        )
+        results.append(fund_schemas.CostScenarioResult(
+            name=scenario.name,
+            venue_fee_per_person=venue_fee,
+            ball_fee_per_ball=ball_fee,
+            num_balls_purchased=scenario.num_balls_purchased,
+            total_venue_cost=total_venue_cost,
+            total_ball_cost=total_ball_cost,
+            total_misc_cost=scenario.common_misc_cost,
+            total_cost=total_venue_cost + total_ball_cost + scenario.common_misc_cost,
+            player_breakdowns=player_breakdowns
+        ))
+    
+    return fund_schemas.BatchCostCalculationResponse(
+        tournament_id=tournament.id,
+        tournament_date=tournament.date,
+        scenarios=results
+    )
+
+
 async def save_tournament_costs_and_update_balances(
     cost_request: fund_schemas.AddTournamentCostRequest,
     db: AsyncSession
 ):
     """Save tournament costs and update player balances (supports updates by date)"""
-    
+    resolver = get_resolver(db)
+    # Every name this request touches is loaded with the first player lookup
+    resolver.prime_players(_cost_request_player_names(cost_request))
+
     # Check if a cost record for this date already exists
     existing_cost_result = await db.execute(
         select(fund_models.TournamentCost)
@@ -253,18 +374,16 @@ async def save_tournament_costs_and_update_balances(
     )
     existing_cost = existing_cost_result.scalar()
     
+    postings = []
     if existing_cost:
-        # Revert balances for all players affected by the old cost
-        await delete_tournament_costs_and_revert_balances(cost_request.tournament_date, db)
+        # Revert balances for all players affected by the old cost (posted together with the new cost)
+        postings.extend(await _revert_tournament_costs(cost_request.tournament_date, db))
     
     # Calculate costs first
     calculation = await calculate_tournament_costs(cost_request, db)
     
     # Get tournament
-    tournament_result = await db.execute(
-        select(models.Tournament).where(models.Tournament.date == cost_request.tournament_date)
-    )
-    tournament = tournament_result.scalar()
+    tournament = await resolver.get_tournament_by_date(cost_request.tournament_date)
     
     # Get fund settings
     settings = await get_or_create_fund_settings(db)
@@ -285,130 +404,72 @@ async def save_tournament_costs_and_update_balances(
     db.add(tournament_cost)
     await db.flush()
     
+    players = await resolver.get_players(_cost_request_player_names(cost_request))
+    
     # Save player-specific costs
-    for specific_cost in cost_request.player_specific_costs:
-        for player_name in specific_cost.player_names:
-            player_result = await db.execute(
-                select(models.Player).where(models.Player.name == player_name)
-            )
-            player = player_result.scalar()
-            
-            if player:
-                player_specific = fund_models.PlayerSpecificCost(
-                    tournament_cost_id=tournament_cost.id,
-                    player_id=player.id,
-                    cost_amount=specific_cost.cost_amount,
-                    cost_name=specific_cost.cost_name
-                )
-                db.add(player_specific)
+    await insert_specific_costs(
+        [
+            {
+                "player_id": players[player_name].id,
+                "cost_amount": specific_cost.cost_amount,
+                "cost_name": specific_cost.cost_name
+            }
+            for specific_cost in cost_request.player_specific_costs
+            for player_name in specific_cost.player_names
+            if players[player_name]
+        ],
+        db,
+        tournament_cost_id=tournament_cost.id
+    )
     
     # Update tournament attendance
-    for player_name in cost_request.tournament_players:
-        player_result = await db.execute(
-            select(models.Player).where(models.Player.name == player_name)
-        )
-        player = player_result.scalar()
-        
-        if player:
-            # Check if attendance record already exists
-            existing_attendance_result = await db.execute(
-                select(fund_models.TournamentAttendance).where(
-                    fund_models.TournamentAttendance.tournament_id == tournament.id,
-                    fund_models.TournamentAttendance.player_id == player.id
-                )
-            )
-            existing_attendance = existing_attendance_result.scalar()
-            
-            if existing_attendance:
-                # Update existing attendance record with club member status
-                is_club_member = player_name in cost_request.club_members
-                existing_attendance.is_club_member = is_club_member
-            else:
-                # Create new attendance record
-                is_club_member = player_name in cost_request.club_members
-                attendance = fund_models.TournamentAttendance(
-                    tournament_id=tournament.id,
-                    player_id=player.id,
-                    is_club_member=is_club_member
-                )
-                db.add(attendance)
+    club_members = set(cost_request.club_members)
+    await upsert_attendance(
+        tournament.id,
+        {
+            players[player_name].id: player_name in club_members
+            for player_name in cost_request.tournament_players
+            if players[player_name]
+        },
+        db
+    )
     
     # Update player balances
-    for breakdown in calculation.player_breakdowns:
-        player_result = await db.execute(
-            select(models.Player).where(models.Player.name == breakdown.player_name)
+    postings.extend(
+        FundPosting(
+            player_id=players[breakdown.player_name].id,
+            delta_balance=-breakdown.total_cost,
+            delta_cost=breakdown.total_cost,
+            entry_type=LEDGER_TOURNAMENT_COST,
+            reference=f"tournament:{tournament.id}",
+            entry_date=tournament.date
         )
-        player = player_result.scalar()
-        
-        if player:
-            # Get or create player fund
-            fund_result = await db.execute(
-                select(fund_models.PlayerFund).where(
-                    fund_models.PlayerFund.player_id == player.id
-                )
-            )
-            player_fund = fund_result.scalar()
-            
-            if not player_fund:
-                player_fund = fund_models.PlayerFund(
-                    player_id=player.id,
-                    current_balance=0.0,
-                    days_played=0,
-                    total_paid=0.0,
-                    total_cost=0.0
-                )
-                db.add(player_fund)
-                await db.flush()
-            
-            # Update balance and costs
-            player_fund.current_balance -= breakdown.total_cost
-            player_fund.total_cost += breakdown.total_cost
-            player_fund.last_updated = datetime.utcnow()
+        for breakdown in calculation.player_breakdowns
+        if players[breakdown.player_name]
+    )
+    await apply_postings(postings, db)
     
     await db.commit()
+    invalidate_cost_details(cost_request.tournament_date)
+    data_versions.bump(FUND)
     return {"message": "Tournament costs saved and balances updated successfully"}
 
 
 async def get_player_attendance_stats(db: AsyncSession) -> List[fund_schemas.PlayerAttendanceStats]:
     """Get attendance statistics for all players"""
-    query = select(fund_models.TournamentAttendance).options(
-        selectinload(fund_models.TournamentAttendance.player)
+    summary = fund_models.PlayerAttendanceSummary
+    result = await db.execute(
+        select(
+            summary.player_id,
+            models.Player.name.label("player_name"),
+            summary.total_tournaments,
+            summary.as_club_member,
+            summary.as_regular_member
+        )
+        .join(models.Player, summary.player_id == models.Player.id)
+        .order_by(summary.total_tournaments.desc(), summary.player_id)
     )
-    
-    result = await db.execute(query)
-    attendances = result.scalars().all()
-    
-    # Group by player
-    player_stats = {}
-    for attendance in attendances:
-        player_id = attendance.player_id
-        player_name = attendance.player.name
-        
-        if player_id not in player_stats:
-            player_stats[player_id] = {
-                'player_id': player_id,
-                'player_name': player_name,
-                'total_tournaments': 0,
-                'as_club_member': 0,
-                'as_regular_member': 0
-            }
-        
-        player_stats[player_id]['total_tournaments'] += 1
-        if attendance.is_club_member:
-            player_stats[player_id]['as_club_member'] += 1
-        else:
-            player_stats[player_id]['as_regular_member'] += 1
-    
-    # Convert to response format
-    response = [
-        fund_schemas.PlayerAttendanceStats(**stats)
-        for stats in player_stats.values()
-    ]
-    
-    # Sort by total tournaments descending
-    response.sort(key=lambda x: x.total_tournaments, reverse=True)
-    
-    return response
+    return [fund_schemas.PlayerAttendanceStats(**row._mapping) for row in result.all()]
 
 
 async def record_player_payment(
@@ -416,11 +477,9 @@ async def record_player_payment(
     db: AsyncSession
 ):
     """Record a payment made by a player and update their balance"""
+    resolver = get_resolver(db)
     # Get player by name
-    player_result = await db.execute(
-        select(models.Player).where(models.Player.name == payment_data.player_name)
-    )
-    player = player_result.scalar()
+    player = await resolver.get_player(payment_data.player_name)
     
     if not player:
         raise HTTPException(
@@ -428,30 +487,6 @@ async def record_player_payment(
             detail=f"Player '{payment_data.player_name}' not found"
         )
     
-    # Get or create player fund
-    fund_result = await db.execute(
-        select(fund_models.PlayerFund).where(
-            fund_models.PlayerFund.player_id == player.id
-        )
-    )
-    player_fund = fund_result.scalar()
-    
-    if not player_fund:
-        player_fund = fund_models.PlayerFund(
-            player_id=player.id,
-            current_balance=0.0,
-            days_played=0,
-            total_paid=0.0,
-            total_cost=0.0
-        )
-        db.add(player_fund)
-        await db.flush()
-    
-    # Update balance and total paid
-    player_fund.current_balance += payment_data.amount
-    player_fund.total_paid += payment_data.amount
-    player_fund.last_updated = datetime.utcnow()
-    
     # Record transaction history
     payment_date = payment_data.payment_date if payment_data.payment_date else datetime.utcnow().date()
     # Convert date to datetime for DB if needed, or keep as date if column allows. 
@@ -468,35 +503,176 @@ async def record_player_payment(
         notes=payment_data.notes
     )
     db.add(transaction)
+    await db.flush()
+    
+    # Update balance and total paid
+    funds = await apply_postings([_payment_posting(player.id, payment_data.amount, transaction.id, payment_date)], db)
     
     await db.commit()
+    data_versions.bump(FUND)
     
     return {
         "message": f"Payment of ৳{payment_data.amount} recorded successfully for {payment_data.player_name}",
-        "new_balance": player_fund.current_balance
+        "new_balance": funds[player.id].current_balance
     }
 
 
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def import_player_payments(
+    rows: AsyncIterator[Tuple[int, object]],
+    skip_invalid: bool,
+    db: AsyncSession
+) -> fund_schemas.PaymentImportResponse:
+    """Record many payments in one transaction, reporting the rows that cannot be recorded
+
+    Names are resolved with one lookup, and the transactions, ledger entries
+    and balance changes are written with batched statements. Unless
+    skip_invalid is set, a single bad row rejects the whole import.
+    """
+    payments = []
+    errors = []
+    async for row_number, row in rows:
+        if len(payments) + len(errors) >= MAX_PAYMENT_IMPORT_ROWS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_PAYMENT_IMPORT_ROWS} payments can be imported at once")
+        try:
+            payments.append((row_number, fund_schemas.PaymentImportRow.model_validate(row)))
+        except ValidationError as e:
+            player_name = row.get("player_name") if isinstance(row, dict) else None
+            errors.append(fund_schemas.PaymentImportError(
+                row=row_number,
+                player_name=player_name if isinstance(player_name, str) else None,
+                error=_validation_message(e)
+            ))
+
+    players = await get_resolver(db).get_players(payment.player_name for _, payment in payments)
+    errors.extend(
+        fund_schemas.PaymentImportError(
+            row=row_number,
+            player_name=payment.player_name,
+            error=f"Player '{payment.player_name}' not found"
+        )
+        for row_number, payment in payments
+        if not players[payment.player_name]
+    )
+    errors.sort(key=lambda error: error.row)
+    payments = [payment for _, payment in payments if players[payment.player_name]]
+
+    if errors and not skip_invalid:
+        return fund_schemas.PaymentImportResponse(
+            message=f"No payments imported: {len(errors)} row(s) have errors",
+            imported=0,
+            total_amount=0.0,
+            errors=errors
+        )
+
+    if payments:
+        today = datetime.utcnow().date()
+        payment_ids = await db.scalars(
+            insert(fund_models.PaymentTransaction).returning(
+                fund_models.PaymentTransaction.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "player_id": players[payment.player_name].id,
+                    "amount": payment.amount,
+                    "payment_date": datetime.combine(payment.payment_date or today, datetime.min.time()),
+                    "notes": payment.notes
+                }
+                for payment in payments
+            ]
+        )
+        await apply_postings(
+            (
+                _payment_posting(players[payment.player_name].id, payment.amount, payment_id, payment.payment_date or today)
+                for payment, payment_id in zip(payments, payment_ids.all())
+            ),
+            db
+        )
+        await db.commit()
+        data_versions.bump(FUND)
+
+    total_amount = sum(payment.amount for payment in payments)
+    return fund_schemas.PaymentImportResponse(
+        message=f"Imported {len(payments)} payment(s) totalling ৳{total_amount}",
+        imported=len(payments),
+        total_amount=total_amount,
+        errors=errors
+    )
+
+
 async def get_days_played_comparison(db: AsyncSession):
     """Get days played comparison for all players"""
     # Get all player funds with player names
     result = await db.execute(
-        select(fund_models.PlayerFund, models.Player.name)
+        select(
+            models.Player.name,
+            fund_models.PlayerFund.days_played,
+            func.coalesce(fund_models.PlayerAttendanceSummary.total_tournaments, 0).label("tournaments_attended")
+        )
         .join(models.Player, fund_models.PlayerFund.player_id == models.Player.id)
+        .outerjoin(
+            fund_models.PlayerAttendanceSummary,
+            fund_models.PlayerAttendanceSummary.player_id == fund_models.PlayerFund.player_id
+        )
         .order_by(fund_models.PlayerFund.days_played.desc())
     )
-    
-    player_funds = result.all()
-    
+
     return [
         {
-            "player_name": player_name,
-            "days_played": player_fund.days_played
+            "player_name": row.name,
+            "days_played": row.days_played,
+            "tournaments_attended": row.tournaments_attended
         }
-        for player_fund, player_name in player_funds
+        for row in result.all()
     ]
 
 
+async def get_fund_timeseries(
+    period: str,
+    player_name: Optional[str],
+    start: Optional[date],
+    end: Optional[date],
+    db: AsyncSession
+) -> List[fund_schemas.FundPeriodTotals]:
+    """Get paid, costs and days played per month or year, for one player or the whole club, from the monthly rollup"""
+    if period not in TIMESERIES_PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of: {', '.join(TIMESERIES_PERIODS)}")
+
+    rollup = fund_models.FundMonthlyRollup
+    bucket = rollup.month if period == "month" else cast(func.date_trunc("year", rollup.month), Date)
+    query = (
+        select(
+            bucket.label("period"),
+            func.sum(rollup.paid).label("paid"),
+            func.sum(rollup.tournament_cost).label("tournament_cost"),
+            func.sum(rollup.misc_cost).label("misc_cost"),
+            func.sum(rollup.days_played).label("days_played"),
+            func.count(rollup.player_id.distinct()).label("active_players")
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+    if player_name:
+        player = await get_resolver(db).get_player(player_name)
+        if not player:
+            raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
+        query = query.where(rollup.player_id == player.id)
+    if start:
+        query = query.where(rollup.month >= first_of_month(start))
+    if end:
+        query = query.where(rollup.month <= end)
+
+    result = await db.execute(query)
+    return [fund_schemas.FundPeriodTotals(**row._mapping) for row in result.all()]
+
+
 async def get_tournament_cost_dates(db: AsyncSession) -> List[date]:
     """Get list of dates that have tournament cost data"""
     result = await db.execute(
@@ -513,10 +689,7 @@ async def get_tournament_cost_details(
 ) -> fund_schemas.TournamentCostCalculationResponse:
     """Get cost breakdown for a specific tournament date"""
     # Get tournament
-    tournament_result = await db.execute(
-        select(models.Tournament).where(models.Tournament.date == tournament_date)
-    )
-    tournament = tournament_result.scalar()
+    tournament = await get_resolver(db).get_tournament_by_date(tournament_date)
     
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
@@ -532,21 +705,28 @@ async def get_tournament_cost_details(
     if not cost_record:
         raise HTTPException(status_code=404, detail="Cost record not found for this tournament")
         
-    # Get attendance (players)
-    attendance_result = await db.execute(
-        select(fund_models.TournamentAttendance).where(
-            fund_models.TournamentAttendance.tournament_id == tournament.id
-        ).options(selectinload(fund_models.TournamentAttendance.player))
+    # Attendance with each player's specific cost total, grouped in one pass
+    specific_totals = (
+        select(
+            fund_models.PlayerSpecificCost.player_id,
+            func.sum(fund_models.PlayerSpecificCost.cost_amount).label("player_specific_cost")
+        )
+        .where(fund_models.PlayerSpecificCost.tournament_cost_id == cost_record.id)
+        .group_by(fund_models.PlayerSpecificCost.player_id)
+        .subquery()
     )
-    attendances = attendance_result.scalars().all()
-    
-    # Get player specific costs
-    specific_costs_result = await db.execute(
-        select(fund_models.PlayerSpecificCost).where(
-            fund_models.PlayerSpecificCost.tournament_cost_id == cost_record.id
+    attendance_result = await db.execute(
+        select(
+            models.Player.name,
+            fund_models.TournamentAttendance.is_club_member,
+            func.coalesce(specific_totals.c.player_specific_cost, 0.0).label("player_specific_cost")
         )
+        .join(models.Player, fund_models.TournamentAttendance.player_id == models.Player.id)
+        .outerjoin(specific_totals, specific_totals.c.player_id == fund_models.TournamentAttendance.player_id)
+        .where(fund_models.TournamentAttendance.tournament_id == tournament.id)
+        .order_by(fund_models.TournamentAttendance.id)
     )
-    specific_costs = specific_costs_result.scalars().all()
+    attendances = attendance_result.all()
     
     # Reconstruct breakdown
     num_players = len(attendances)
@@ -556,27 +736,19 @@ async def get_tournament_cost_details(
     player_breakdowns = []
     
     for attendance in attendances:
-        player = attendance.player
-        is_club_member = attendance.is_club_member
-        
         # Venue cost
-        venue_cost = 0.0 if is_club_member else cost_record.venue_fee_per_person
-        
-        # Specific costs
-        player_specific_total = sum(
-            sc.cost_amount for sc in specific_costs if sc.player_id == player.id
-        )
+        venue_cost = 0.0 if attendance.is_club_member else cost_record.venue_fee_per_person
         
-        total_player_cost = venue_cost + ball_cost_per_player + misc_cost_per_player + player_specific_total
+        total_player_cost = venue_cost + ball_cost_per_player + misc_cost_per_player + attendance.player_specific_cost
         
         player_breakdowns.append(fund_schemas.PlayerCostBreakdown(
-            player_name=player.name,
+            player_name=attendance.name,
             venue_cost=venue_cost,
             ball_cost=ball_cost_per_player,
             common_misc_cost=misc_cost_per_player,
-            player_specific_cost=player_specific_total,
+            player_specific_cost=attendance.player_specific_cost,
             total_cost=total_player_cost,
-            is_club_member=is_club_member
+            is_club_member=attendance.is_club_member
         ))
         
     return fund_schemas.TournamentCostCalculationResponse(
@@ -590,6 +762,19 @@ async def get_tournament_cost_details(
     )
 
 
+async def get_cached_tournament_cost_details(
+    tournament_date: date,
+    db: AsyncSession
+) -> fund_schemas.TournamentCostCalculationResponse:
+    """Get the cost breakdown of a date from the fund cache, computing it on a miss"""
+    cache_key = cost_details_key(tournament_date)
+    details = fund_cache.get(cache_key)
+    if details is None:
+        details = await get_tournament_cost_details(tournament_date, db)
+        fund_cache.set(cache_key, details)
+    return details
+
+
 async def add_player_misc_cost(
     cost_data: fund_schemas.AddPlayerMiscCostRequest,
     db: AsyncSession
@@ -603,61 +788,54 @@ async def add_player_misc_cost(
         raise HTTPException(status_code=400, detail="Cost amount must be greater than 0")
     
     updated_balances = []
-    
-    for player_name in cost_data.player_names:
-        # Get player by name
-        player_result = await db.execute(
-            select(models.Player).where(models.Player.name == player_name)
-        )
-        player = player_result.scalar()
-        
+    resolver = get_resolver(db)
+    players = await resolver.get_players(cost_data.player_names)
+    for player_name, player in players.items():
         if not player:
             raise HTTPException(
                 status_code=404,
                 detail=f"Player '{player_name}' not found"
             )
-        
-        # Get or create player fund
-        fund_result = await db.execute(
-            select(fund_models.PlayerFund).where(
-                fund_models.PlayerFund.player_id == player.id
-            )
-        )
-        player_fund = fund_result.scalar()
-        
-        if not player_fund:
-            player_fund = fund_models.PlayerFund(
-                player_id=player.id,
-                current_balance=0.0,
-                days_played=0,
-                total_paid=0.0,
-                total_cost=0.0
+    
+    # Create player specific cost records (tournament_cost_id None: not tied to a tournament)
+    await insert_specific_costs(
+        [
+            {
+                "player_id": players[player_name].id,
+                "cost_amount": cost_data.cost_amount,
+                "cost_name": cost_data.cost_description,
+                "cost_date": cost_data.cost_date
+            }
+            for player_name in cost_data.player_names
+        ],
+        db
+    )
+    
+    # Deduct cost from balance and increment total cost
+    funds = await apply_postings(
+        (
+            FundPosting(
+                player_id=players[player_name].id,
+                delta_balance=-cost_data.cost_amount,
+                delta_cost=cost_data.cost_amount,
+                entry_type=LEDGER_MISC_COST,
+                reference=cost_data.cost_description,
+                entry_date=cost_data.cost_date
             )
-            db.add(player_fund)
-            await db.flush()
-        
-        # Deduct cost from balance and increment total cost
-        player_fund.current_balance -= cost_data.cost_amount
-        player_fund.total_cost += cost_data.cost_amount
-        player_fund.last_updated = datetime.utcnow()
-        
-        # Create player specific cost record
-        misc_cost = fund_models.PlayerSpecificCost(
-            player_id=player.id,
-            cost_amount=cost_data.cost_amount,
-            cost_name=cost_data.cost_description,
-            cost_date=cost_data.cost_date,
-            tournament_cost_id=None  # Explicitly None for misc costs not tied to a tournament
-        )
-        db.add(misc_cost)
-
+            for player_name in cost_data.player_names
+        ),
+        db
+    )
+    
+    for player_name in cost_data.player_names:
         updated_balances.append({
             "player_name": player_name,
-            "new_balance": player_fund.current_balance,
+            "new_balance": funds[players[player_name].id].current_balance,
             "cost_added": cost_data.cost_amount
         })
     
     await db.commit()
+    data_versions.bump(FUND)
     
     return {
         "message": f"Miscellaneous cost of ৳{cost_data.cost_amount} added successfully for {len(cost_data.player_names)} player(s)",
@@ -670,9 +848,11 @@ async def get_payment_history(
     page: int,
     page_size: int,
     player_name: Optional[str],
-    db: AsyncSession
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> fund_schemas.PaginatedPaymentHistoryResponse:
-    """Get paginated payment history with optional filtering by player name"""
+    """Get payment history (newest first) by page or by cursor, with optional filtering by player name"""
     
     # Base query
     query = select(fund_models.PaymentTransaction).options(
@@ -686,20 +866,30 @@ async def get_payment_history(
         )
     
     # Get total count
-    count_stmt = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
+    total = None
+    if include_total:
+        total = await cached_count(
+            f"payments:{player_name or ''}",
+            select(func.count()).select_from(query.subquery()),
+            db
+        )
     
-    # Apply sorting and pagination
+    # Apply sorting and pagination (keyset when a cursor is given)
     query = query.order_by(fund_models.PaymentTransaction.id.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.where(fund_models.PaymentTransaction.id < last_id)
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     
     result = await db.execute(query)
     transactions = result.scalars().all()
+    next_cursor = encode_cursor(transactions[page_size - 1].id) if len(transactions) > page_size else None
     
     # Transform to response
     items = []
-    for t in transactions:
+    for t in transactions[:page_size]:
         items.append(fund_schemas.PaymentTransactionResponse(
             id=t.id,
             player_id=t.player_id,
@@ -711,15 +901,13 @@ async def get_payment_history(
             created_at=t.created_at or datetime.utcnow()
         ))
         
-    total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
-    
-
     return fund_schemas.PaginatedPaymentHistoryResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages(total, page_size) if total is not None else None,
+        next_cursor=next_cursor
     )
 
 
@@ -727,100 +915,123 @@ async def get_player_tournament_costs(
     player_id: int,
     page: int,
     page_size: int,
-    db: AsyncSession
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> fund_schemas.PaginatedPlayerTournamentCostResponse:
-    """Get paginated tournament costs for a specific player"""
-    
-    # Base query: Get tournament attendance for the player
-    # Joined with Tournament and TournamentCost to get all details
-    # We sort by tournament date desc
-    
-    query = select(fund_models.TournamentAttendance, models.Tournament, fund_models.TournamentCost)\
-        .join(models.Tournament, fund_models.TournamentAttendance.tournament_id == models.Tournament.id)\
-        .join(fund_models.TournamentCost, models.Tournament.id == fund_models.TournamentCost.tournament_id)\
-        .where(fund_models.TournamentAttendance.player_id == player_id)
+    """Get tournament costs for a specific player (newest first) by page or by cursor"""
+    attendance = fund_models.TournamentAttendance
+    specific_cost = fund_models.PlayerSpecificCost
+    
+    # Number of players of every tournament the player attended (to split the shared costs)
+    player_counts = (
+        select(attendance.tournament_id, func.count(attendance.id).label("num_players"))
+        .where(attendance.tournament_id.in_(
+            select(attendance.tournament_id).where(attendance.player_id == player_id)
+        ))
+        .group_by(attendance.tournament_id)
+        .subquery()
+    )
     
-    # Get total count
-    count_stmt = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
+    # The player's specific costs per tournament cost record, descriptions concatenated in entry order
+    specific_costs = (
+        select(
+            specific_cost.tournament_cost_id,
+            func.sum(specific_cost.cost_amount).label("player_specific_cost"),
+            func.string_agg(
+                func.nullif(specific_cost.cost_name, ""),
+                aggregate_order_by(literal_column("', '"), specific_cost.id)
+            ).label("description")
+        )
+        .where(specific_cost.player_id == player_id, specific_cost.tournament_cost_id.is_not(None))
+        .group_by(specific_cost.tournament_cost_id)
+        .subquery()
+    )
     
-    # Apply sorting and pagination
-    query = query.order_by(models.Tournament.date.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    columns = [
+        attendance.is_club_member,
+        models.Tournament.id.label("tournament_id"),
+        models.Tournament.date.label("tournament_date"),
+        fund_models.TournamentCost.venue_fee_per_person,
+        fund_models.TournamentCost.total_ball_cost,
+        fund_models.TournamentCost.common_misc_cost,
+        player_counts.c.num_players,
+        func.coalesce(specific_costs.c.player_specific_cost, 0.0).label("player_specific_cost"),
+        specific_costs.c.description
+    ]
+    # A page by number gets its total in the same query (count over the whole result before LIMIT)
+    count_in_query = include_total and not cursor
+    if count_in_query:
+        columns.append(func.count().over().label("total"))
+    
+    query = (
+        select(*columns)
+        .join(models.Tournament, attendance.tournament_id == models.Tournament.id)
+        .join(fund_models.TournamentCost, models.Tournament.id == fund_models.TournamentCost.tournament_id)
+        .join(player_counts, player_counts.c.tournament_id == models.Tournament.id)
+        .outerjoin(specific_costs, specific_costs.c.tournament_cost_id == fund_models.TournamentCost.id)
+        .where(attendance.player_id == player_id)
+        .order_by(models.Tournament.date.desc(), models.Tournament.id.desc())
+    )
+    if cursor:
+        last_date, last_tournament_id = decode_cursor(cursor, date.fromisoformat, str)
+        query = query.where(tuple_(models.Tournament.date, models.Tournament.id) < (last_date, last_tournament_id))
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     
     result = await db.execute(query)
     rows = result.all()
+    next_cursor = None
+    if len(rows) > page_size:
+        last_row = rows[page_size - 1]
+        next_cursor = encode_cursor(last_row.tournament_date.isoformat(), last_row.tournament_id)
+        rows = rows[:page_size]
+    
+    total = None
+    if count_in_query and rows:
+        total = rows[0].total
+    elif include_total:
+        # By cursor, or past the last page where the window count has no row to ride on
+        total = await cached_count(
+            f"tournament_costs:{player_id}",
+            select(func.count())
+            .select_from(attendance)
+            .join(fund_models.TournamentCost, attendance.tournament_id == fund_models.TournamentCost.tournament_id)
+            .where(attendance.player_id == player_id),
+            db
+        )
     
     items = []
-    
-    for attendance, tournament, cost_record in rows:
-        # We need to calculate the cost share for this player in this tournament.
-        # This requires knowing the total number of players in that tournament.
-        
-        # Fetch total players count for this tournament
-        # We can optimize this by pre-fetching or subquery, but for now a separate query per row is simpler 
-        # (given page size 10, it's 10 extra queries, which is acceptable)
-        
-        players_count_result = await db.execute(
-            select(func.count(fund_models.TournamentAttendance.id))
-            .where(fund_models.TournamentAttendance.tournament_id == tournament.id)
-        )
-        num_players = players_count_result.scalar() or 0
-        
-        if num_players == 0:
-            continue # Should not happen if attendance exists
-            
+    for row in rows:
         # Per player costs
-        ball_cost_per_player = cost_record.total_ball_cost / num_players
-        misc_cost_per_player = cost_record.common_misc_cost / num_players
+        ball_cost_per_player = row.total_ball_cost / row.num_players
+        misc_cost_per_player = row.common_misc_cost / row.num_players
         
         # Venue cost
-        venue_cost = 0.0 if attendance.is_club_member else cost_record.venue_fee_per_person
+        venue_cost = 0.0 if row.is_club_member else row.venue_fee_per_person
         
-        # Player specific costs for this tournament
-        specific_cost_result = await db.execute(
-            select(func.sum(fund_models.PlayerSpecificCost.cost_amount))
-            .where(
-                fund_models.PlayerSpecificCost.tournament_cost_id == cost_record.id,
-                fund_models.PlayerSpecificCost.player_id == player_id
-            )
-        )
-        player_specific_cost = specific_cost_result.scalar() or 0.0
-        
-        # Fetch specific cost description if any (concat if multiple)
-        specific_cost_desc_result = await db.execute(
-             select(fund_models.PlayerSpecificCost.cost_name)
-            .where(
-                fund_models.PlayerSpecificCost.tournament_cost_id == cost_record.id,
-                fund_models.PlayerSpecificCost.player_id == player_id
-            )
-        )
-        descriptions = [d for d in specific_cost_desc_result.scalars().all() if d]
-        description = ", ".join(descriptions) if descriptions else None
-        
-        total_cost = venue_cost + ball_cost_per_player + misc_cost_per_player + player_specific_cost
+        total_cost = venue_cost + ball_cost_per_player + misc_cost_per_player + row.player_specific_cost
         
         items.append(fund_schemas.PlayerTournamentCostResponse(
-            tournament_id=tournament.id,
-            tournament_date=tournament.date,
+            tournament_id=row.tournament_id,
+            tournament_date=row.tournament_date,
             venue_cost=venue_cost,
             ball_cost=ball_cost_per_player,
             common_misc_cost=misc_cost_per_player,
-            player_specific_cost=player_specific_cost,
+            player_specific_cost=row.player_specific_cost,
             total_cost=total_cost,
-            is_club_member=attendance.is_club_member,
-            description=description
+            is_club_member=row.is_club_member,
+            description=row.description
         ))
         
-    total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
-    
     return fund_schemas.PaginatedPlayerTournamentCostResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages(total, page_size) if total is not None else None,
+        next_cursor=next_cursor
     )
 
 
@@ -828,9 +1039,11 @@ async def get_player_misc_costs(
     player_id: int,
     page: int,
     page_size: int,
-    db: AsyncSession
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ) -> fund_schemas.PaginatedPlayerMiscCostResponse:
-    """Get paginated miscellaneous (non-tournament) costs for a specific player"""
+    """Get miscellaneous (non-tournament) costs for a specific player by page or by cursor"""
     
     # Base query: PlayerSpecificCost where tournament_cost_id is NULL
     query = select(fund_models.PlayerSpecificCost).where(
@@ -839,30 +1052,36 @@ async def get_player_misc_costs(
     )
     
     # Get total count
-    count_stmt = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
+    total = None
+    if include_total:
+        total = await cached_count(
+            f"misc_costs:{player_id}",
+            select(func.count()).select_from(query.subquery()),
+            db
+        )
     
-    # Apply sorting (by cost_date desc if available, else id desc)
-    # Using coalesce to handle null dates if strictly needed, but ID desc is a good proxy for creation time usually.
     # User requested: "Sort in desc order of the id."
     query = query.order_by(fund_models.PlayerSpecificCost.id.desc())
-    
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.where(fund_models.PlayerSpecificCost.id < last_id)
+    else:
+        query = query.offset((page - 1) * page_size)
+    query = query.limit(page_size + 1)
     
     result = await db.execute(query)
     costs = result.scalars().all()
+    next_cursor = encode_cursor(costs[page_size - 1].id) if len(costs) > page_size else None
     
-    items = [fund_schemas.PlayerMiscCostResponse.from_orm(c) for c in costs]
-        
-    total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
+    items = [fund_schemas.PlayerMiscCostResponse.from_orm(c) for c in costs[:page_size]]
     
     return fund_schemas.PaginatedPlayerMiscCostResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages(total, page_size) if total is not None else None,
+        next_cursor=next_cursor
     )
 
 
@@ -872,11 +1091,11 @@ async def update_player_payment(
     db: AsyncSession
 ):
     """Update a payment record and adjust player balances"""
-    # Get existing transaction
+    # Get existing transaction, locked so that concurrent edits cannot revert the same amount twice
     result = await db.execute(
         select(fund_models.PaymentTransaction)
         .where(fund_models.PaymentTransaction.id == payment_id)
-        .options(selectinload(fund_models.PaymentTransaction.player))
+        .with_for_update()
     )
     transaction = result.scalar()
     
@@ -887,58 +1106,21 @@ async def update_player_payment(
     old_player_id = transaction.player_id
     
     # Get new player
-    player_result = await db.execute(
-        select(models.Player).where(models.Player.name == payment_data.player_name)
-    )
-    new_player = player_result.scalar()
+    resolver = get_resolver(db)
+    new_player = await resolver.get_player(payment_data.player_name)
     
     if not new_player:
         raise HTTPException(status_code=404, detail=f"Player '{payment_data.player_name}' not found")
     
-    # If player changed
-    if old_player_id != new_player.id:
-        # Revert from old player
-        old_fund_result = await db.execute(
-            select(fund_models.PlayerFund).where(fund_models.PlayerFund.player_id == old_player_id)
-        )
-        old_fund = old_fund_result.scalar()
-        if old_fund:
-            old_fund.current_balance -= old_amount
-            old_fund.total_paid -= old_amount
-            old_fund.last_updated = datetime.utcnow()
-        
-        # Apply to new player
-        new_fund_result = await db.execute(
-            select(fund_models.PlayerFund).where(fund_models.PlayerFund.player_id == new_player.id)
-        )
-        new_fund = new_fund_result.scalar()
-        if not new_fund:
-            new_fund = fund_models.PlayerFund(
-                player_id=new_player.id,
-                current_balance=0.0,
-                days_played=0,
-                total_paid=0.0,
-                total_cost=0.0
-            )
-            db.add(new_fund)
-            await db.flush()
-        
-        new_fund.current_balance += payment_data.amount
-        new_fund.total_paid += payment_data.amount
-        new_fund.last_updated = datetime.utcnow()
-        
-        transaction.player_id = new_player.id
-    else:
-        # Same player, just update amount
-        fund_result = await db.execute(
-            select(fund_models.PlayerFund).where(fund_models.PlayerFund.player_id == old_player_id)
-        )
-        fund = fund_result.scalar()
-        if fund:
-            diff = payment_data.amount - old_amount
-            fund.current_balance += diff
-            fund.total_paid += diff
-            fund.last_updated = datetime.utcnow()
+    # Revert the old amount and apply the new one (possibly to another player)
+    await apply_postings(
+        [
+            _payment_posting(old_player_id, -old_amount, payment_id, transaction.payment_date, LEDGER_REVERSAL),
+            _payment_posting(new_player.id, payment_data.amount, payment_id, payment_data.payment_date)
+        ],
+        db
+    )
+    transaction.player_id = new_player.id
 
     # Update transaction details
     transaction.amount = payment_data.amount
@@ -946,38 +1128,32 @@ async def update_player_payment(
     transaction.notes = payment_data.notes
     
     await db.commit()
+    data_versions.bump(FUND)
     return {"message": "Payment updated successfully"}
 
 
-async def delete_tournament_costs_and_revert_balances(
-    tournament_date: date,
-    db: AsyncSession
-):
-    """Internal helper to revert balances and delete cost records for a date"""
-    # Get current breakdown first
+async def _revert_tournament_costs(tournament_date: date, db: AsyncSession) -> List[FundPosting]:
+    """Delete the cost records of a date and return the postings that revert their balance changes"""
+    resolver = get_resolver(db)
+    # Get current breakdown first (from the database: a cached copy must never drive balance changes)
     current_breakdown = await get_tournament_cost_details(tournament_date, db)
     
-    # Revert balances
-    for breakdown in current_breakdown.player_breakdowns:
-        player_result = await db.execute(
-            select(models.Player).where(models.Player.name == breakdown.player_name)
+    players = await resolver.get_players(breakdown.player_name for breakdown in current_breakdown.player_breakdowns)
+    postings = [
+        FundPosting(
+            player_id=players[breakdown.player_name].id,
+            delta_balance=breakdown.total_cost,
+            delta_cost=-breakdown.total_cost,
+            entry_type=LEDGER_REVERSAL,
+            reference=f"tournament:{current_breakdown.tournament_id}",
+            entry_date=current_breakdown.tournament_date
         )
-        player = player_result.scalar()
-        if player:
-            fund_result = await db.execute(
-                select(fund_models.PlayerFund).where(fund_models.PlayerFund.player_id == player.id)
-            )
-            fund = fund_result.scalar()
-            if fund:
-                fund.current_balance += breakdown.total_cost
-                fund.total_cost -= breakdown.total_cost
-                fund.last_updated = datetime.utcnow()
+        for breakdown in current_breakdown.player_breakdowns
+        if players[breakdown.player_name]
+    ]
     
     # Delete cost records
-    tournament_result = await db.execute(
-        select(models.Tournament).where(models.Tournament.date == tournament_date)
-    )
-    tournament = tournament_result.scalar()
+    tournament = await resolver.get_tournament_by_date(tournament_date)
     
     if tournament:
         # Cascade delete takes care of PlayerSpecificCost
@@ -986,6 +1162,8 @@ async def delete_tournament_costs_and_revert_balances(
             {"tid": tournament.id}
         )
         # We don't delete attendance yet, it's managed by save_tournament_costs_and_update_balances
+    
+    return postings
 
 
 async def get_tournament_cost_input(
@@ -993,8 +1171,8 @@ async def get_tournament_cost_input(
     db: AsyncSession
 ) -> fund_schemas.TournamentCostInputResponse:
     """Get original input parameters for a tournament cost record"""
-    # Reuse get_tournament_cost_details to get basic info
-    details = await get_tournament_cost_details(tournament_date, db)
+    # Reuse the cached breakdown to get basic info
+    details = await get_cached_tournament_cost_details(tournament_date, db)
     
     # Get the cost record for fees and misc name
     cost_result = await db.execute(
@@ -1055,10 +1233,11 @@ async def delete_player_payment(
     db: AsyncSession
 ):
     """Delete a payment record and revert player balance"""
-    # Get existing transaction
+    # Get existing transaction, locked so that a concurrent delete or edit cannot revert it twice
     result = await db.execute(
         select(fund_models.PaymentTransaction)
         .where(fund_models.PaymentTransaction.id == payment_id)
+        .with_for_update()
     )
     transaction = result.scalar()
     
@@ -1066,20 +1245,80 @@ async def delete_player_payment(
         raise HTTPException(status_code=404, detail="Payment transaction not found")
     
     # Revert balance and total paid
-    fund_result = await db.execute(
-        select(fund_models.PlayerFund).where(fund_models.PlayerFund.player_id == transaction.player_id)
+    await apply_postings(
+        [_payment_posting(transaction.player_id, -transaction.amount, payment_id, transaction.payment_date, LEDGER_REVERSAL)],
+        db
     )
-    fund = fund_result.scalar()
-    if fund:
-        fund.current_balance -= transaction.amount
-        fund.total_paid -= transaction.amount
-        fund.last_updated = datetime.utcnow()
     
     # Delete transaction
     await db.delete(transaction)
     
     await db.commit()
+    data_versions.bump(FUND)
     return {"message": "Payment deleted successfully"}
 
 
+async def get_ledger_balances_as_of(
+    as_of: Optional[date],
+    player_name: Optional[str],
+    db: AsyncSession
+) -> List[fund_schemas.LedgerBalanceResponse]:
+    """Get balances derived from the fund ledger (latest snapshot plus newer entries), optionally at the end of a date"""
+    player_ids = None
+    if player_name:
+        player = await get_resolver(db).get_player(player_name)
+        if not player:
+            raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
+        player_ids = [player.id]
+    
+    cutoff = datetime.combine(as_of, time.max) if as_of else None
+    balances = await ledger.get_ledger_balances(db, as_of=cutoff, player_ids=player_ids)
+    if not balances:
+        return []
+    
+    names_result = await db.execute(
+        select(models.Player.id, models.Player.name).where(models.Player.id.in_(balances.keys()))
+    )
+    player_names = dict(names_result.all())
+    
+    response = [
+        fund_schemas.LedgerBalanceResponse(
+            player_id=player_id,
+            player_name=player_names[player_id],
+            current_balance=balance["current_balance"],
+            days_played=balance["days_played"],
+            total_paid=balance["total_paid"],
+            total_cost=balance["total_cost"],
+            last_entry_id=balance["last_entry_id"],
+            as_of=balance["as_of"]
+        )
+        for player_id, balance in balances.items()
+    ]
+    response.sort(key=lambda x: x.player_name)
+    return response
 
+
+async def create_balance_snapshots(db: AsyncSession):
+    """Snapshot the ledger balances of players with entries since their last snapshot"""
+    snapshot_count = await ledger.create_balance_snapshots(db)
+    await db.commit()
+    # Derived balances are unchanged, so there is no data version to bump
+    return {"message": f"Created {snapshot_count} balance snapshot(s)", "snapshot_count": snapshot_count}
+
+
+async def reconcile_player_funds(apply: bool, db: AsyncSession) -> fund_schemas.FundReconciliationResponse:
+    """Compare player_funds against the source records and optionally correct the mismatches in one bulk posting"""
+    figures = await compute_fund_figures(db)
+    mismatches = await find_fund_mismatches(db, figures)
+
+    corrected = 0
+    if apply and mismatches:
+        corrected = await apply_fund_corrections(mismatches, db)
+        await db.commit()
+        data_versions.bump(FUND)
+
+    return fund_schemas.FundReconciliationResponse(
+        checked_players=len(figures),
+        mismatches=[fund_schemas.FundMismatch(**mismatch) for mismatch in mismatches],
+        corrected=corrected
+    )
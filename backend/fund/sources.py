@@ -0,0 +1,123 @@
+"""
+Set-based aggregates of the records player funds are derived from.
+
+Each builder returns a grouped subquery with a player_id column, an
+optional month column (first day of the month, when by_month is set) and
+the aggregated figure. They are shared by fund reconciliation (lifetime
+totals) and the monthly rollup backfill (per-month totals). player_ids
+restricts the result to some players without changing how a tournament's
+costs are split among its attendees.
+"""
+
+from typing import Iterable, Optional
+from sqlalchemy.future import select
+from sqlalchemy import func, case, cast, union, Date
+import models
+import fund_models
+
+
+def month_of(column):
+    """First day of the month of a date or datetime column"""
+    return cast(func.date_trunc("month", column), Date)
+
+
+def _group(query, player_column, month_column, by_month: bool, player_ids: Optional[Iterable[int]], name: str):
+    keys = [player_column]
+    if by_month:
+        keys.append(month_column)
+    if player_ids is not None:
+        query = query.where(player_column.in_(list(player_ids)))
+    return query.group_by(*keys).subquery(name)
+
+
+def payment_totals(by_month: bool = False, player_ids: Optional[Iterable[int]] = None):
+    payment = fund_models.PaymentTransaction
+    month = month_of(payment.payment_date)
+    query = select(
+        payment.player_id,
+        *([month.label("month")] if by_month else []),
+        func.sum(payment.amount).label("total_paid")
+    )
+    return _group(query, payment.player_id, month, by_month, player_ids, "payment_totals")
+
+
+def misc_cost_totals(by_month: bool = False, player_ids: Optional[Iterable[int]] = None):
+    """Specific costs not tied to a tournament (by month: only the ones with a cost date)"""
+    specific_cost = fund_models.PlayerSpecificCost
+    month = month_of(specific_cost.cost_date)
+    query = select(
+        specific_cost.player_id,
+        *([month.label("month")] if by_month else []),
+        func.sum(specific_cost.cost_amount).label("misc_cost")
+    ).where(specific_cost.tournament_cost_id.is_(None))
+    if by_month:
+        query = query.where(specific_cost.cost_date.is_not(None))
+    return _group(query, specific_cost.player_id, month, by_month, player_ids, "misc_cost_totals")
+
+
+def tournament_cost_totals(by_month: bool = False, player_ids: Optional[Iterable[int]] = None):
+    """Per-player tournament costs, split the way get_tournament_cost_details splits them"""
+    attendance = fund_models.TournamentAttendance
+    tournament_cost = fund_models.TournamentCost
+    specific_cost = fund_models.PlayerSpecificCost
+
+    specific_totals = (
+        select(
+            specific_cost.tournament_cost_id,
+            specific_cost.player_id,
+            func.sum(specific_cost.cost_amount).label("specific_cost")
+        )
+        .where(specific_cost.tournament_cost_id.is_not(None))
+        .group_by(specific_cost.tournament_cost_id, specific_cost.player_id)
+        .subquery()
+    )
+    attendee_costs = (
+        select(
+            attendance.player_id,
+            month_of(models.Tournament.date).label("month"),
+            (
+                case((attendance.is_club_member, 0.0), else_=tournament_cost.venue_fee_per_person)
+                + (tournament_cost.total_ball_cost + tournament_cost.common_misc_cost)
+                / func.count().over(partition_by=attendance.tournament_id)
+                + func.coalesce(specific_totals.c.specific_cost, 0.0)
+            ).label("cost")
+        )
+        .join(tournament_cost, tournament_cost.tournament_id == attendance.tournament_id)
+        .join(models.Tournament, models.Tournament.id == attendance.tournament_id)
+        .outerjoin(
+            specific_totals,
+            (specific_totals.c.tournament_cost_id == tournament_cost.id)
+            & (specific_totals.c.player_id == attendance.player_id)
+        )
+        .subquery()
+    )
+    # Players are filtered after the split, which counts every attendee
+    query = select(
+        attendee_costs.c.player_id,
+        *([attendee_costs.c.month] if by_month else []),
+        func.sum(attendee_costs.c.cost).label("tournament_cost")
+    )
+    return _group(query, attendee_costs.c.player_id, attendee_costs.c.month, by_month, player_ids, "tournament_cost_totals")
+
+
+def days_played_totals(by_month: bool = False, player_ids: Optional[Iterable[int]] = None):
+    """Tournaments a player is ranked in, plus attended tournaments without rank groups (unofficial ones)"""
+    attendance = fund_models.TournamentAttendance
+    ranked = (
+        select(models.rank_group_players.c.player_id, models.RankGroup.tournament_id)
+        .join(models.RankGroup, models.RankGroup.id == models.rank_group_players.c.rank_group_id)
+    )
+    attended_unranked = (
+        select(attendance.player_id, attendance.tournament_id)
+        .where(~select(models.RankGroup.id).where(models.RankGroup.tournament_id == attendance.tournament_id).exists())
+    )
+    played = union(ranked, attended_unranked).subquery()  # UNION: a tournament counts once per player
+    month = month_of(models.Tournament.date)
+    query = select(
+        played.c.player_id,
+        *([month.label("month")] if by_month else []),
+        func.count().label("days_played")
+    )
+    if by_month:
+        query = query.join(models.Tournament, models.Tournament.id == played.c.tournament_id)
+    return _group(query, played.c.player_id, month, by_month, player_ids, "days_played_totals")
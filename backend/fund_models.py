@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -64,13 +64,28 @@ class TournamentAttendance(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     tournament_id = Column(String, ForeignKey("tournaments.id"), nullable=False)
-    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False, index=True)
     is_club_member = Column(Boolean, default=False, nullable=False)
 
     tournament = relationship("Tournament", back_populates="attendance")
     player = relationship("Player")
 
 
+class PlayerAttendanceSummary(Base):
+    """Per-player attendance counts, kept in sync with tournament_attendance by its writers"""
+    __tablename__ = "player_attendance_summary"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    total_tournaments = Column(Integer, default=0, nullable=False)
+    as_club_member = Column(Integer, default=0, nullable=False)
+    as_regular_member = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_player_attendance_summary_total", "total_tournaments"),
+    )
+
+
 class PaymentTransaction(Base):
     __tablename__ = "payment_transactions"
 
@@ -82,3 +97,58 @@ class PaymentTransaction(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     player = relationship("Player")
+
+
+class FundMonthlyRollup(Base):
+    """Per-player fund activity per month, kept up to date by the posting engine"""
+    __tablename__ = "fund_monthly_rollup"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    paid = Column(Float, default=0.0, nullable=False)
+    tournament_cost = Column(Float, default=0.0, nullable=False)
+    misc_cost = Column(Float, default=0.0, nullable=False)
+    days_played = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_fund_monthly_rollup_month", "month"),
+    )
+
+
+class FundLedgerEntry(Base):
+    __tablename__ = "fund_ledger"
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    entry_type = Column(String(20), nullable=False)  # See fund.constants.LEDGER_ENTRY_TYPES
+    delta_balance = Column(Float, default=0.0, nullable=False)
+    delta_cost = Column(Float, default=0.0, nullable=False)
+    delta_paid = Column(Float, default=0.0, nullable=False)
+    delta_days = Column(Integer, default=0, nullable=False)
+    reference = Column(String(255), nullable=True)  # e.g. "tournament:<id>", "payment:<id>"
+    posted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    player = relationship("Player")
+
+    __table_args__ = (
+        Index("ix_fund_ledger_player_posted_at", "player_id", "posted_at"),
+    )
+
+
+class FundBalanceSnapshot(Base):
+    __tablename__ = "fund_balance_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id"), nullable=False)
+    last_entry_id = Column(Integer, nullable=False)  # Ledger entries up to this id are included
+    as_of = Column(DateTime, nullable=False)  # posted_at of the last included entry
+    current_balance = Column(Float, nullable=False)
+    total_cost = Column(Float, nullable=False)
+    total_paid = Column(Float, nullable=False)
+    days_played = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_fund_balance_snapshots_player_as_of", "player_id", "as_of"),
+    )
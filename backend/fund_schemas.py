@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import date, datetime
 
@@ -110,6 +110,36 @@ class TournamentCostCalculationResponse(BaseModel):
     total_cost: float
     player_breakdowns: List[PlayerCostBreakdown]
 
+class CostScenario(BaseModel):
+    name: Optional[str] = None
+    venue_fee_per_person: Optional[float] = None  # None: default venue fee
+    ball_fee_per_ball: Optional[float] = None  # None: default ball fee
+    num_balls_purchased: int
+    common_misc_cost: float = 0.0
+
+class BatchCostCalculationRequest(BaseModel):
+    tournament_date: date
+    tournament_players: List[str]
+    club_members: List[str] = []
+    player_specific_costs: List[PlayerSpecificCostCreate] = []
+    scenarios: List[CostScenario]
+
+class CostScenarioResult(BaseModel):
+    name: Optional[str] = None
+    venue_fee_per_person: float
+    ball_fee_per_ball: float
+    num_balls_purchased: int
+    total_venue_cost: float
+    total_ball_cost: float
+    total_misc_cost: float
+    total_cost: float
+    player_breakdowns: List[PlayerCostBreakdown]
+
+class BatchCostCalculationResponse(BaseModel):
+    tournament_id: str
+    tournament_date: date
+    scenarios: List[CostScenarioResult]
+
 class TournamentCostInputResponse(BaseModel):
     tournament_date: date
     use_default_venue_fee: bool
@@ -160,6 +190,20 @@ class RecordPaymentRequest(BaseModel):
     payment_date: Optional[date] = None
     notes: Optional[str] = None
 
+class PaymentImportRow(RecordPaymentRequest):
+    amount: float = Field(gt=0, allow_inf_nan=False)  # Rejects 'nan', 'inf', zero and negative amounts
+
+class PaymentImportError(BaseModel):
+    row: int  # 1-based, the CSV header does not count
+    player_name: Optional[str] = None
+    error: str
+
+class PaymentImportResponse(BaseModel):
+    message: str
+    imported: int
+    total_amount: float
+    errors: List[PaymentImportError]
+
 class UpdatePaymentRequest(BaseModel):
     player_name: str
     amount: float
@@ -192,10 +236,11 @@ class PaymentTransactionResponse(BaseModel):
 
 class PaginatedPaymentHistoryResponse(BaseModel):
     items: List[PaymentTransactionResponse]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
 
 
 # ============ Player Expenses ============
@@ -212,10 +257,11 @@ class PlayerTournamentCostResponse(BaseModel):
 
 class PaginatedPlayerTournamentCostResponse(BaseModel):
     items: List[PlayerTournamentCostResponse]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
 
 class PlayerMiscCostResponse(BaseModel):
     id: int
@@ -228,8 +274,54 @@ class PlayerMiscCostResponse(BaseModel):
 
 class PaginatedPlayerMiscCostResponse(BaseModel):
     items: List[PlayerMiscCostResponse]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
+
+
+
+# ============ Fund Ledger ============
+class LedgerBalanceResponse(BaseModel):
+    player_id: int
+    player_name: str
+    current_balance: float
+    days_played: int
+    total_paid: float
+    total_cost: float
+    last_entry_id: int
+    as_of: Optional[datetime] = None  # Time of the last ledger entry included
+
+class BalanceSnapshotResponse(BaseModel):
+    message: str
+    snapshot_count: int
+
+
+# ============ Fund Time Series ============
+class FundPeriodTotals(BaseModel):
+    period: date  # First day of the month or year
+    paid: float
+    tournament_cost: float
+    misc_cost: float
+    days_played: int
+    active_players: int  # Players with any activity in the period
+
+
+# ============ Fund Reconciliation ============
+class FundFigures(BaseModel):
+    current_balance: float
+    total_cost: float
+    total_paid: float
+    days_played: int
+
+class FundMismatch(BaseModel):
+    player_id: int
+    player_name: str
+    stored: FundFigures  # player_funds as it is
+    expected: FundFigures  # Recomputed from payments, costs and attendance
 
+class FundReconciliationResponse(BaseModel):
+    checked_players: int
+    mismatches: List[FundMismatch]
+    corrected: int  # Players whose funds were moved to the expected figures (0 unless applied)
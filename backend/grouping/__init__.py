@@ -0,0 +1,4 @@
+# Grouping module
+from grouping import api, services, knockout
+
+__all__ = ["api", "services", "knockout"]
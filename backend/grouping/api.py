@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Query
+import schemas
+from grouping import services, knockout
+
+router = APIRouter(
+    prefix="/grouping",
+    tags=["grouping"]
+)
+
+
+@router.post("/groups", response_model=schemas.GroupingResult)
+async def generate_groups(grouping_request: schemas.GroupingRequest):
+    """
+    Split the sorted standings into balanced groups.
+    Starts from the snake pattern and swaps players between groups while that narrows
+    the spread of the group ratings.
+    """
+    return services.generate_balanced_groups(grouping_request)
+
+
+@router.get("/knockout", response_model=schemas.KnockoutFixtures, response_model_exclude_none=True)
+async def get_knockout_fixtures(
+    player_count: int = Query(..., ge=2, le=256),
+    num_groups: int = Query(2, ge=1, le=26)
+):
+    """Generate the Cup and Plate knockout brackets for a player count and number of groups"""
+    if num_groups > player_count:
+        raise HTTPException(status_code=400, detail="Not enough players for the requested number of groups.")
+    return knockout.generate_knockout_fixtures(player_count, num_groups)
@@ -0,0 +1,16 @@
+"""
+Constants for the grouping module.
+"""
+
+# Objectives the group balancer can minimize the spread of
+GROUP_OBJECTIVES = ("sum", "average")
+
+# Rating used for unranked players when balancing: the worst possible official rating
+# (Plate Quarter-Finals) instead of the 1000 sentinel, which would swamp every group total
+UNRANKED_GROUPING_RATING = 8
+
+# Upper bound on improving swaps; the search normally converges after a handful
+MAX_SWAPS = 500
+
+# Minimum score improvement that counts as progress
+SCORE_TOLERANCE = 1e-9
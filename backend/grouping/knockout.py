@@ -0,0 +1,153 @@
+"""
+Knockout fixture generation for any player count and number of groups.
+
+Each group sends the top half of its players (rounded up) to the Cup and the
+rest to the Plate. Within a bracket, players are seeded position-major and
+group-minor (A1, B1, A2, B2, ...) into the smallest power-of-two draw that
+fits them, using the standard bracket order so the top seeds can only meet
+late. Missing seeds become byes, which always go to the top seeds.
+
+For 2 groups and 10, 12, 14 or 16 players this reproduces the hand-written
+tables of src/logic/knockout.js.
+"""
+
+from functools import lru_cache
+from typing import List, Tuple
+import schemas
+from grouping.services import get_group_names, snake_assignment
+
+# (group index, position in group), e.g. (1, 3) is "B3"
+Seed = Tuple[int, int]
+
+
+def get_group_sizes(player_count: int, num_groups: int) -> List[int]:
+    """Group sizes produced by the snake pattern of the grouping screen"""
+    sizes = [0] * num_groups
+    for group_index in snake_assignment(player_count, num_groups):
+        sizes[group_index] += 1
+    return sizes
+
+
+def split_cup_and_plate(group_sizes: List[int]) -> Tuple[List[Seed], List[Seed]]:
+    """Seeded Cup and Plate entrants: the top half (rounded up) of every group plays the Cup"""
+    cup, plate = [], []
+    for position in range(1, max(group_sizes, default=0) + 1):
+        for group_index, group_size in enumerate(group_sizes):
+            if position > group_size:
+                continue
+            cup_places = (group_size + 1) // 2
+            (cup if position <= cup_places else plate).append((group_index, position))
+    return cup, plate
+
+
+def bracket_order(draw_size: int) -> List[int]:
+    """Standard seeding order of a power-of-two draw (1-based), e.g. 8 -> [1, 8, 4, 5, 3, 6, 2, 7]"""
+    order = [1]
+    while len(order) < draw_size:
+        size = len(order) * 2
+        order = [seed for top_seed in order for seed in (top_seed, size + 1 - top_seed)]
+    return order
+
+
+def get_round_name(draw_size: int) -> str:
+    if draw_size == 2:
+        return "Final"
+    if draw_size == 4:
+        return "Semi Finals"
+    if draw_size == 8:
+        return "Quarter Finals"
+    return f"Round of {draw_size}"
+
+
+def get_match_id(prefix: str, draw_size: int, number: int) -> str:
+    if draw_size == 2:
+        return f"{prefix}F"
+    if draw_size == 4:
+        return f"{prefix}S{number}"
+    if draw_size == 8:
+        return f"{prefix}Q{number}"
+    return f"{prefix}R{draw_size}_{number}"
+
+
+def build_bracket(seeds: List[Seed], prefix: str, group_names: List[str]) -> List[schemas.KnockoutRound]:
+    """Build the rounds of a single-elimination bracket for the seeded players"""
+    if len(seeds) < 2:
+        return []
+
+    def label(seed: Seed) -> str:
+        return f"{group_names[seed[0]][-1]}{seed[1]}"
+
+    draw_size = 1
+    while draw_size < len(seeds):
+        draw_size *= 2
+
+    # The slots of a round in bracket order hold either a seed that has not played yet
+    # (first round entrant or bye), the previous round's match whose winner advances, or
+    # None for an empty first round slot
+    slots = [
+        seeds[seed_number - 1] if seed_number <= len(seeds) else None
+        for seed_number in bracket_order(draw_size)
+    ]
+
+    rounds = []
+    previous_matches = {}
+    previous_numbers = {}
+    while len(slots) > 1:
+        round_size = len(slots)
+        pairings = []
+        next_slots = []
+        for first, second in zip(slots[0::2], slots[1::2]):
+            if first is None or second is None:
+                next_slots.append(first if second is None else second)
+            else:
+                pairings.append((first, second))
+                next_slots.append(len(pairings) - 1)
+
+        if round_size == draw_size:
+            # First round: numbered by the position (then group) of the earlier group's player
+            numbering = sorted(range(len(pairings)), key=lambda index: tuple(reversed(min(pairings[index]))))
+        else:
+            numbering = list(range(len(pairings)))
+
+        matches = {}
+        numbers = {}
+        for number, pairing_index in enumerate(numbering, start=1):
+            first, second = pairings[pairing_index]
+            match = schemas.KnockoutMatch(id=get_match_id(prefix, round_size, number), p1="", p2="")
+            if isinstance(first, tuple) and isinstance(second, tuple):
+                match.p1, match.p2 = (label(seed) for seed in sorted((first, second)))
+            elif isinstance(first, tuple) or isinstance(second, tuple):
+                # A player who had a bye is listed before the winner they are waiting for
+                direct, feeder = (first, second) if isinstance(first, tuple) else (second, first)
+                match.p1, match.p2 = label(direct), f"Winner {previous_matches[feeder].id}"
+                previous_matches[feeder].next = f"Winner plays {label(direct)}"
+            else:
+                # Two winners: the lower numbered match comes first
+                feeders = sorted((first, second), key=previous_numbers.get)
+                match.p1, match.p2 = (f"Winner {previous_matches[feeder].id}" for feeder in feeders)
+            matches[pairing_index] = match
+            numbers[pairing_index] = number
+
+        rounds.append(schemas.KnockoutRound(
+            round=get_round_name(round_size),
+            matches=[matches[pairing_index] for pairing_index in numbering]
+        ))
+        previous_matches = matches
+        previous_numbers = numbers
+        slots = next_slots
+
+    return rounds
+
+
+@lru_cache(maxsize=256)
+def generate_knockout_fixtures(player_count: int, num_groups: int = 2) -> schemas.KnockoutFixtures:
+    """
+    Generate the Cup and Plate brackets for a session.
+    The result depends only on the arguments and is cached; callers must not mutate it.
+    """
+    group_names = get_group_names(num_groups)
+    cup_seeds, plate_seeds = split_cup_and_plate(get_group_sizes(player_count, num_groups))
+    return schemas.KnockoutFixtures(
+        cup=build_bracket(cup_seeds, "C", group_names),
+        plate=build_bracket(plate_seeds, "P", group_names)
+    )
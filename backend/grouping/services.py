@@ -0,0 +1,172 @@
+"""
+Balanced group generation.
+
+The snake pattern of the grouping screen is used as the seed. A local search
+then repeatedly applies the single swap of two players from different groups
+that most improves the balance, first by the sum of squared deviations of the
+group ratings from their mean and then by their spread (max - min), until no
+swap improves the solution. Swaps keep the snake's group sizes.
+"""
+
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+import schemas
+from ranking.constants import UNRANKED_RATING
+from grouping.constants import GROUP_OBJECTIVES, UNRANKED_GROUPING_RATING, MAX_SWAPS, SCORE_TOLERANCE
+
+
+def get_group_names(num_groups: int) -> List[str]:
+    """Group keys used by the frontend: groupA, groupB, ..."""
+    return [f"group{chr(65 + index)}" for index in range(num_groups)]
+
+
+def snake_assignment(player_count: int, num_groups: int) -> List[int]:
+    """Group index of each player (best first) under the snake pattern"""
+    assignment = []
+    for position in range(player_count):
+        lap, offset = divmod(position, num_groups)
+        assignment.append(offset if lap % 2 == 0 else num_groups - 1 - offset)
+    return assignment
+
+
+def _group_values(totals: List[float], sizes: List[int], objective: str) -> List[float]:
+    if objective == "sum":
+        return list(totals)
+    return [total / size if size else 0.0 for total, size in zip(totals, sizes)]
+
+
+def _improves(score: Tuple[float, float], best_score: Tuple[float, float]) -> bool:
+    """Lexicographic comparison of (primary, secondary) scores, lower is better"""
+    # The tolerance keeps floating point noise in the running totals from passing for progress
+    if score[0] < best_score[0] - SCORE_TOLERANCE:
+        return True
+    return abs(score[0] - best_score[0]) <= SCORE_TOLERANCE and score[1] < best_score[1] - SCORE_TOLERANCE
+
+
+def _find_best_swap(
+    ratings: List[float],
+    assignment: List[int],
+    totals: List[float],
+    sizes: List[int],
+    objective: str,
+    spread_first: bool
+) -> Optional[Tuple[int, int]]:
+    """Find the swap of two players from different groups that most improves the score, if any"""
+    num_groups = len(totals)
+    values = _group_values(totals, sizes, objective)
+    value_sum = sum(values)
+    square_sum = sum(value * value for value in values)
+    spread = max(values) - min(values)
+    squared_deviation = square_sum - value_sum * value_sum / num_groups
+    best_score = (spread, squared_deviation) if spread_first else (squared_deviation, spread)
+
+    # Players with the same rating in the same group are interchangeable, so only distinct
+    # ratings are tried (mapped to the first such player)
+    group_ratings = [{} for _ in range(num_groups)]
+    for player_index, group_index in enumerate(assignment):
+        group_ratings[group_index].setdefault(ratings[player_index], player_index)
+
+    best_swap = None
+    for first_group in range(num_groups):
+        for second_group in range(first_group + 1, num_groups):
+            other_values = [value for group_index, value in enumerate(values) if group_index not in (first_group, second_group)]
+            other_max = max(other_values, default=float("-inf"))
+            other_min = min(other_values, default=float("inf"))
+            first_value, second_value = values[first_group], values[second_group]
+            base_sum = value_sum - first_value - second_value
+            base_square_sum = square_sum - first_value * first_value - second_value * second_value
+            first_scale = 1.0 if objective == "sum" else 1.0 / sizes[first_group]
+            second_scale = 1.0 if objective == "sum" else 1.0 / sizes[second_group]
+
+            for first_rating, first_player in group_ratings[first_group].items():
+                for second_rating, second_player in group_ratings[second_group].items():
+                    delta = second_rating - first_rating
+                    if delta == 0:
+                        continue
+                    new_first = first_value + delta * first_scale
+                    new_second = second_value - delta * second_scale
+                    spread = max(other_max, new_first, new_second) - min(other_min, new_first, new_second)
+                    new_sum = base_sum + new_first + new_second
+                    squared_deviation = (
+                        base_square_sum + new_first * new_first + new_second * new_second
+                        - new_sum * new_sum / num_groups
+                    )
+                    score = (spread, squared_deviation) if spread_first else (squared_deviation, spread)
+                    if _improves(score, best_score):
+                        best_score, best_swap = score, (first_player, second_player)
+
+    return best_swap
+
+
+def balance_groups(ratings: List[float], num_groups: int, objective: str = "average") -> Tuple[List[int], int]:
+    """Optimize a snake seeded assignment by best-improvement pairwise swaps, returning (assignment, swaps)"""
+    assignment = snake_assignment(len(ratings), num_groups)
+    totals = [0.0] * num_groups
+    sizes = [0] * num_groups
+    for player_index, group_index in enumerate(assignment):
+        totals[group_index] += ratings[player_index]
+        sizes[group_index] += 1
+
+    # The squared deviation is a smooth objective that moves every group towards the mean;
+    # the spread has plateaus wherever several groups tie for the max or min, so it is only
+    # minimized afterwards, starting from the variance optimum
+    swaps = 0
+    for spread_first in (False, True):
+        while swaps < MAX_SWAPS:
+            best_swap = _find_best_swap(ratings, assignment, totals, sizes, objective, spread_first)
+            if best_swap is None:
+                break
+
+            first, second = best_swap
+            delta = ratings[second] - ratings[first]
+            totals[assignment[first]] += delta
+            totals[assignment[second]] -= delta
+            assignment[first], assignment[second] = assignment[second], assignment[first]
+            swaps += 1
+
+    return assignment, swaps
+
+
+def generate_balanced_groups(grouping_request: schemas.GroupingRequest) -> schemas.GroupingResult:
+    """Split the players into balanced groups and report how balanced they are"""
+    if grouping_request.objective not in GROUP_OBJECTIVES:
+        raise HTTPException(status_code=400, detail=f"Objective must be one of: {', '.join(GROUP_OBJECTIVES)}")
+    if grouping_request.num_groups < 2:
+        raise HTTPException(status_code=400, detail="At least 2 groups are required.")
+    if len(grouping_request.players) < grouping_request.num_groups:
+        raise HTTPException(status_code=400, detail="Not enough players for the requested number of groups.")
+
+    num_groups = grouping_request.num_groups
+    objective = grouping_request.objective
+    ratings = [
+        UNRANKED_GROUPING_RATING if player.rating >= UNRANKED_RATING else player.rating
+        for player in grouping_request.players
+    ]
+
+    seed = snake_assignment(len(ratings), num_groups)
+    assignment, swaps = balance_groups(ratings, num_groups, objective)
+
+    def group_values(group_assignment: List[int]) -> List[float]:
+        totals = [0.0] * num_groups
+        sizes = [0] * num_groups
+        for player_index, group_index in enumerate(group_assignment):
+            totals[group_index] += ratings[player_index]
+            sizes[group_index] += 1
+        return _group_values(totals, sizes, objective)
+
+    group_names = get_group_names(num_groups)
+    groups = {group_name: [] for group_name in group_names}
+    # Players stay in standings order within each group
+    for player, group_index in zip(grouping_request.players, assignment):
+        groups[group_names[group_index]].append(player.name)
+
+    values = group_values(assignment)
+    seed_values = group_values(seed)
+    return schemas.GroupingResult(
+        groups=groups,
+        group_ratings={group_name: round(value, 4) for group_name, value in zip(group_names, values)},
+        objective=objective,
+        spread=round(max(values) - min(values), 4),
+        seed_spread=round(max(seed_values) - min(seed_values), 4),
+        swaps=swaps
+    )
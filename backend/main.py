@@ -1,11 +1,14 @@
-from fastapi import FastAPI
-from database import engine, Base
+from fastapi import FastAPI, Request, Response
+from database import engine, AsyncSessionLocal, Base
 from fastapi.middleware.cors import CORSMiddleware
 from tournament.api import router as tournament_router
 from player.api import router as player_router
 from fund.api import router as fund_router
 from ranking.api import router as ranking_router
 from club_tournament.api import router as club_tournament_router
+from export.api import router as export_router
+from grouping.api import router as grouping_router
+from data_versions import data_versions, domains_for_path, etag_matches, CACHE_CONTROL
 from datetime import datetime
 from sqlalchemy import text
 import time
@@ -20,6 +23,29 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+
+# Conditional GET (registered before CORS so that CORS headers are added to 304 responses too)
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """Answer unchanged public reads with 304 Not Modified based on the data versions"""
+    domains = domains_for_path(request.url.path) if request.method in ("GET", "HEAD") else None
+    if not domains:
+        return await call_next(request)
+
+    # The ETag is taken before the handler runs, so a write racing with this read
+    # can only cause one extra full response, never a stale 304.
+    await data_versions.refresh_stored(AsyncSessionLocal)
+    etag = data_versions.etag(domains, f"{request.url.path}?{request.url.query}")
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +53,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count"],
 )
 
 
@@ -90,6 +117,8 @@ app.include_router(player_router)
 app.include_router(fund_router)
 app.include_router(ranking_router)
 app.include_router(club_tournament_router)
+app.include_router(export_router)
+app.include_router(grouping_router)
 
 # Import club_tournament models to ensure they're registered with Base.metadata
 import club_tournament  # noqa: F401
@@ -0,0 +1,60 @@
+"""
+Migration: Add a trigram index on players.name for the case-insensitive balance search.
+"""
+
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+if not DATABASE_URL:
+    print("ERROR: DATABASE_URL not found in environment variables")
+    exit(1)
+
+# Fix connection string for asyncpg
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
+elif DATABASE_URL.startswith("postgresql://") and "asyncpg" not in DATABASE_URL:
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+async def run_migration():
+    """Create the pg_trgm extension and the trigram index on players.name."""
+
+    print("=" * 60)
+    print("MIGRATION: Trigram index on players.name")
+    print("=" * 60)
+    print("Connecting to database...")
+
+    engine = create_async_engine(DATABASE_URL, echo=False)
+
+    try:
+        async with engine.begin() as conn:
+            print("Enabling pg_trgm...")
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+            print("✓ pg_trgm enabled")
+
+            # Serves name ILIKE '%term%' (GET /fund/balances?search=...)
+            print("Creating ix_players_name_trgm index...")
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_players_name_trgm
+                ON players USING gin (name gin_trgm_ops);
+            """))
+            print("✓ ix_players_name_trgm index created")
+
+            print("\n✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
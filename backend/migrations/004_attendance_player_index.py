@@ -0,0 +1,57 @@
+"""
+Migration: Index tournament_attendance.player_id for the per-player attendance summary refresh.
+"""
+
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+if not DATABASE_URL:
+    print("ERROR: DATABASE_URL not found in environment variables")
+    exit(1)
+
+# Fix connection string for asyncpg
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
+elif DATABASE_URL.startswith("postgresql://") and "asyncpg" not in DATABASE_URL:
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+async def run_migration():
+    """Create the player_id index on tournament_attendance."""
+
+    print("=" * 60)
+    print("MIGRATION: Index on tournament_attendance.player_id")
+    print("=" * 60)
+    print("Connecting to database...")
+
+    engine = create_async_engine(DATABASE_URL, echo=False)
+
+    try:
+        async with engine.begin() as conn:
+            # Serves the GROUP BY of fund.attendance.compute_attendance_summaries for a few players
+            print("Creating ix_tournament_attendance_player_id index...")
+            await conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_tournament_attendance_player_id
+                ON tournament_attendance (player_id);
+            """))
+            print("✓ ix_tournament_attendance_player_id index created")
+
+            print("\n✅ Migration completed successfully!")
+            print("Run rebuild_attendance_summary.py to fill player_attendance_summary.")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        exit(1)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table, Text, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Table, Text, Boolean, JSON
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from database import Base
 
 # Association Table
@@ -44,5 +45,32 @@ class Player(Base):
     rank_groups = relationship("RankGroup", secondary=rank_group_players, back_populates="players")
     fund = relationship("PlayerFund", back_populates="player", uselist=False, cascade="all, delete-orphan")
 
+class PlayerRatingWindow(Base):
+    """Denormalized per-player summary of official results, kept in sync by the tournament services"""
+    __tablename__ = "player_rating_window"
+
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    recent_ratings = Column(JSON, nullable=False, default=list)  # Most recent first
+    best_rating = Column(Integer, nullable=True)  # Best official rating ever, None if never played
+    played_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class TournamentChange(Base):
+    """Append-only log of tournament writes, used as a cursor for delta syncs of /history"""
+    __tablename__ = "tournament_changes"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    tournament_id = Column(String, nullable=False, index=True)
+    operation = Column(String(10), nullable=False)  # 'upsert' or 'delete'
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class StoredDataVersion(Base):
+    """Data versions bumped by writers outside the API process (maintenance scripts), see data_versions"""
+    __tablename__ = "data_versions"
+
+    domain = Column(String(20), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # Import fund models to ensure they're registered with Base.metadata
-from fund_models import PlayerFund, TournamentCost, FundSettings, PlayerSpecificCost, TournamentAttendance
+from fund_models import PlayerFund, TournamentCost, FundSettings, PlayerSpecificCost, TournamentAttendance, PlayerAttendanceSummary, FundMonthlyRollup, FundLedgerEntry, FundBalanceSnapshot
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import func, case
 import models
+from data_versions import data_versions, PLAYERS, FUND
 
 
 async def create_player(player_name: str, database_session: AsyncSession):
@@ -26,6 +27,7 @@ async def create_player(player_name: str, database_session: AsyncSession):
     new_player = models.Player(name=player_name)
     database_session.add(new_player)
     await database_session.commit()
+    data_versions.bump(PLAYERS, FUND)
     await database_session.refresh(new_player)
     
     return {"id": new_player.id, "name": new_player.name, "is_guest": new_player.is_guest}
@@ -50,6 +52,7 @@ async def update_player_guest_status(player_id: int, is_guest: bool, database_se
     
     player.is_guest = is_guest
     await database_session.commit()
+    data_versions.bump(PLAYERS, FUND)
     await database_session.refresh(player)
     
     return {"id": player.id, "name": player.name, "is_guest": player.is_guest}
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, List
+import schemas
+from database import get_db
+from ranking import services
 
 router = APIRouter(
     prefix="/ranking",
@@ -239,3 +243,28 @@ async def proxy_ranking(url: str, force_refresh: bool = False):
                     cache_data = json.load(f)
                     return {"html": cache_data['html'], "cached": True, "error": str(e)}
             raise HTTPException(status_code=500, detail=f"Failed to fetch from BTTF: {str(e)}")
+
+
+@router.post("/standings", response_model=List[schemas.PlayerStanding])
+async def get_standings(
+    standings_request: schemas.StandingsRequest,
+    database_session: AsyncSession = Depends(get_db)
+):
+    """
+    Calculate the sorted standings for the active players of a session.
+    Reads the precomputed rating windows of the requested players instead of the full history.
+    """
+    return await services.calculate_standings(standings_request, database_session)
+
+
+@router.post("/standings/simulate", response_model=schemas.StandingsSimulationResult)
+async def simulate_standings(
+    simulation_request: schemas.StandingsSimulationRequest,
+    database_session: AsyncSession = Depends(get_db)
+):
+    """
+    Evaluate many what-if standings at once, e.g. different sets of players showing up or
+    results that have not happened yet. The rating windows of every player involved are
+    loaded once and shared by all scenarios.
+    """
+    return await services.simulate_standings(simulation_request, database_session)
@@ -0,0 +1,19 @@
+"""
+Constants for the ranking module.
+"""
+
+# Number of most recent official ratings that make up a player's form
+RATING_WINDOW_SIZE = 5
+
+# Recency weights for the weighted average, most recent first
+RECENCY_WEIGHTS = [1.0, 0.8, 0.6, 0.4, 0.2]
+
+# Range of the rating of a rank group (1 is the best), see src/logic/ranking.js
+BEST_RATING = 1
+WORST_RATING = 8
+
+# Sentinel rating for players who have never played an official tournament
+UNRANKED_RATING = 1000
+
+# Upper bound on the scenarios evaluated by a single simulation request
+MAX_SIMULATION_SCENARIOS = 1000
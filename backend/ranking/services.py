@@ -0,0 +1,173 @@
+import time
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+import models, schemas
+from ranking.constants import RATING_WINDOW_SIZE, RECENCY_WEIGHTS, UNRANKED_RATING, MAX_SIMULATION_SCENARIOS
+
+
+async def get_player_windows(player_names: List[str], database_session: AsyncSession) -> Dict[str, dict]:
+    """Fetch the precomputed rating windows of the given players with a single indexed lookup"""
+    if not player_names:
+        return {}
+
+    query_result = await database_session.execute(
+        select(
+            models.Player.name,
+            models.PlayerRatingWindow.recent_ratings,
+            models.PlayerRatingWindow.played_count
+        )
+        .join(models.PlayerRatingWindow, models.PlayerRatingWindow.player_id == models.Player.id)
+        .where(models.Player.name.in_(player_names))
+    )
+
+    return {
+        row.name: {"recent_ratings": list(row.recent_ratings or []), "played_count": row.played_count}
+        for row in query_result.all()
+    }
+
+
+def build_standing(
+    name: str,
+    recent_ratings: List[int],
+    played_count: int,
+    initial_rank: Optional[float] = None
+) -> schemas.PlayerStanding:
+    """Compute a single player's standing from their recent ratings (newest first)"""
+    if initial_rank is not None:
+        # Temporary players are seeded with their initial rank regardless of history
+        return schemas.PlayerStanding(
+            name=name,
+            average=initial_rank,
+            weighted_average=initial_rank,
+            best_rating=initial_rank,
+            played_count=0,
+            is_temporary=True,
+            recent_ratings=recent_ratings
+        )
+
+    recent_ratings = recent_ratings[:RATING_WINDOW_SIZE]
+    if not recent_ratings:
+        return schemas.PlayerStanding(
+            name=name,
+            average=UNRANKED_RATING,
+            weighted_average=UNRANKED_RATING,
+            best_rating=UNRANKED_RATING,
+            played_count=played_count,
+            is_temporary=False,
+            recent_ratings=[]
+        )
+
+    weights = RECENCY_WEIGHTS[:len(recent_ratings)]
+    weighted_sum = sum(rating * weight for rating, weight in zip(recent_ratings, weights))
+
+    return schemas.PlayerStanding(
+        name=name,
+        average=sum(recent_ratings) / len(recent_ratings),
+        weighted_average=weighted_sum / sum(weights),
+        best_rating=min(recent_ratings),
+        played_count=played_count,
+        is_temporary=False,
+        recent_ratings=recent_ratings
+    )
+
+
+def standing_sort_key(standing: schemas.PlayerStanding):
+    """Sort key mirroring the tiebreakers of the grouping screen"""
+    # 1. Average, 2. Weighted average, 3. Best recent rating (lower is better),
+    # 4. Attendance (higher is better), 5. Alphabetical
+    return (
+        standing.average,
+        standing.weighted_average,
+        standing.best_rating,
+        -standing.played_count,
+        standing.name.casefold(),
+        standing.name
+    )
+
+
+def rank_players(
+    active_players: List[str],
+    temporary_players: List[schemas.TemporaryPlayer],
+    windows: Dict[str, dict]
+) -> List[schemas.PlayerStanding]:
+    """Build and sort the standings for the active players from precomputed windows"""
+    initial_ranks = {player.name: player.initial_rank for player in temporary_players}
+
+    standings = []
+    for player_name in dict.fromkeys(active_players):
+        window = windows.get(player_name, {})
+        standings.append(build_standing(
+            player_name,
+            window.get("recent_ratings", []),
+            window.get("played_count", 0),
+            initial_ranks.get(player_name)
+        ))
+
+    standings.sort(key=standing_sort_key)
+    return standings
+
+
+async def calculate_standings(
+    standings_request: schemas.StandingsRequest,
+    database_session: AsyncSession
+) -> List[schemas.PlayerStanding]:
+    """Calculate the sorted standings for this week's active players"""
+    windows = await get_player_windows(standings_request.active_players, database_session)
+    return rank_players(standings_request.active_players, standings_request.temporary_players, windows)
+
+
+def apply_hypothetical_ratings(windows: Dict[str, dict], hypothetical_ratings: Dict[str, List[int]]) -> Dict[str, dict]:
+    """Overlay results that have not happened yet on the stored windows (without mutating them)"""
+    if not hypothetical_ratings:
+        return windows
+
+    scenario_windows = dict(windows)
+    for player_name, extra_ratings in hypothetical_ratings.items():
+        window = windows.get(player_name, {})
+        scenario_windows[player_name] = {
+            "recent_ratings": (list(extra_ratings) + window.get("recent_ratings", []))[:RATING_WINDOW_SIZE],
+            "played_count": window.get("played_count", 0) + len(extra_ratings)
+        }
+    return scenario_windows
+
+
+async def simulate_standings(
+    simulation_request: schemas.StandingsSimulationRequest,
+    database_session: AsyncSession
+) -> schemas.StandingsSimulationResult:
+    """Evaluate many what-if scenarios against a single lookup of the rating windows"""
+    if len(simulation_request.scenarios) > MAX_SIMULATION_SCENARIOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_SIMULATION_SCENARIOS} scenarios can be simulated per request."
+        )
+
+    all_players = {
+        player_name
+        for scenario in simulation_request.scenarios
+        for player_name in scenario.active_players
+    }
+    windows = await get_player_windows(sorted(all_players), database_session)
+
+    started = time.perf_counter()
+    scenario_results = [
+        schemas.ScenarioStandings(
+            name=scenario.name,
+            standings=rank_players(
+                scenario.active_players,
+                scenario.temporary_players,
+                apply_hypothetical_ratings(windows, scenario.hypothetical_ratings)
+            )
+        )
+        for scenario in simulation_request.scenarios
+    ]
+    elapsed = time.perf_counter() - started
+
+    return schemas.StandingsSimulationResult(
+        scenarios=scenario_results,
+        scenario_count=len(scenario_results),
+        elapsed_ms=round(elapsed * 1000, 3),
+        scenarios_per_second=round(len(scenario_results) / elapsed, 1) if elapsed > 0 else 0.0
+    )
@@ -0,0 +1,138 @@
+"""
+Maintenance of the denormalized player_rating_window table.
+
+Each row holds a player's most recent official ratings, their best official
+rating and how many official tournaments they played, so that standings and
+player stat reads never have to walk tournaments -> rank_groups -> players.
+The tournament services refresh the rows of the players a write touches,
+inside the same transaction as the write itself.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, delete
+from sqlalchemy.dialects.postgresql import insert
+import models
+from ranking.constants import RATING_WINDOW_SIZE
+
+# Keeps a single upsert well below the bind parameter limit of asyncpg
+UPSERT_CHUNK_SIZE = 1000
+
+
+def _empty_window() -> dict:
+    return {"recent_ratings": [], "best_rating": None, "played_count": 0}
+
+
+async def compute_player_windows(
+    database_session: AsyncSession,
+    player_ids: Optional[Iterable[int]] = None
+) -> Dict[int, dict]:
+    """Recompute rating windows from the tournament tables (all players when player_ids is None)"""
+    player_column = models.rank_group_players.c.player_id
+    player_results = (
+        select(
+            player_column.label("player_id"),
+            models.RankGroup.rating.label("rating"),
+            func.row_number().over(
+                partition_by=player_column,
+                order_by=(models.Tournament.date.desc(), models.Tournament.id.desc())
+            ).label("recency"),
+            func.count().over(partition_by=player_column).label("played_count"),
+            func.min(models.RankGroup.rating).over(partition_by=player_column).label("best_rating")
+        )
+        .join(models.RankGroup, models.RankGroup.id == models.rank_group_players.c.rank_group_id)
+        .join(models.Tournament, models.Tournament.id == models.RankGroup.tournament_id)
+        .where(models.Tournament.is_official.is_(True))
+    )
+
+    if player_ids is not None:
+        player_ids = list(set(player_ids))
+        if not player_ids:
+            return {}
+        player_results = player_results.where(player_column.in_(player_ids))
+
+    player_results = player_results.subquery()
+    query_result = await database_session.execute(
+        select(player_results)
+        .where(player_results.c.recency <= RATING_WINDOW_SIZE)
+        .order_by(player_results.c.player_id, player_results.c.recency)
+    )
+
+    windows = {player_id: _empty_window() for player_id in (player_ids or [])}
+    for row in query_result.all():
+        window = windows.setdefault(row.player_id, _empty_window())
+        window["recent_ratings"].append(row.rating)
+        window["best_rating"] = row.best_rating
+        window["played_count"] = row.played_count
+
+    return windows
+
+
+async def _upsert_windows(windows: Dict[int, dict], database_session: AsyncSession):
+    """Write the given windows with INSERT ... ON CONFLICT statements (one per chunk of rows)"""
+    now = datetime.utcnow()
+    rows = [
+        {"player_id": player_id, "updated_at": now, **window}
+        for player_id, window in windows.items()
+    ]
+
+    for chunk_start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        insert_statement = insert(models.PlayerRatingWindow).values(rows[chunk_start:chunk_start + UPSERT_CHUNK_SIZE])
+        await database_session.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=[models.PlayerRatingWindow.player_id],
+                set_={
+                    "recent_ratings": insert_statement.excluded.recent_ratings,
+                    "best_rating": insert_statement.excluded.best_rating,
+                    "played_count": insert_statement.excluded.played_count,
+                    "updated_at": insert_statement.excluded.updated_at
+                }
+            )
+        )
+
+
+async def refresh_player_windows(player_ids: Iterable[int], database_session: AsyncSession):
+    """Recompute and store the windows of the given players (does not commit)"""
+    await database_session.flush()
+    windows = await compute_player_windows(database_session, player_ids)
+    await _upsert_windows(windows, database_session)
+
+
+async def rebuild_all_windows(database_session: AsyncSession) -> int:
+    """Backfill: rebuild the window of every player from scratch and commit"""
+    player_ids_result = await database_session.execute(select(models.Player.id))
+    player_ids = player_ids_result.scalars().all()
+
+    await database_session.execute(delete(models.PlayerRatingWindow))
+    windows = await compute_player_windows(database_session, player_ids)
+    await _upsert_windows(windows, database_session)
+    await database_session.commit()
+    return len(windows)
+
+
+async def find_window_mismatches(database_session: AsyncSession) -> List[dict]:
+    """Compare the stored windows against a from-scratch recompute"""
+    player_ids_result = await database_session.execute(select(models.Player.id))
+    expected_windows = await compute_player_windows(database_session, player_ids_result.scalars().all())
+
+    stored_result = await database_session.execute(select(models.PlayerRatingWindow))
+    stored_windows = {
+        window.player_id: {
+            "recent_ratings": list(window.recent_ratings or []),
+            "best_rating": window.best_rating,
+            "played_count": window.played_count
+        }
+        for window in stored_result.scalars().all()
+    }
+
+    mismatches = []
+    for player_id in sorted(set(expected_windows) | set(stored_windows)):
+        expected = expected_windows.get(player_id, _empty_window())
+        # A missing row is equivalent to a player without official results
+        stored = stored_windows.get(player_id, _empty_window())
+        if stored != expected:
+            mismatches.append({"player_id": player_id, "stored": stored, "expected": expected})
+
+    return mismatches
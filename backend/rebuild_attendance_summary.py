@@ -0,0 +1,39 @@
+"""
+Rebuild or verify the player_attendance_summary table.
+
+Usage:
+    python rebuild_attendance_summary.py          # Backfill every player's summary from tournament_attendance
+    python rebuild_attendance_summary.py --check  # Compare stored summaries against a full recompute
+"""
+
+import sys
+import asyncio
+from database import engine, AsyncSessionLocal, Base
+from data_versions import bump_stored, FUND
+from fund.attendance import rebuild_attendance_summaries, find_attendance_summary_mismatches
+import models  # noqa: F401
+
+
+async def main(check_only: bool):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        if check_only:
+            mismatches = await find_attendance_summary_mismatches(db)
+            for mismatch in mismatches:
+                print(f"Player {mismatch['player_id']}: stored={mismatch['stored']} expected={mismatch['expected']}")
+            print(f"{len(mismatches)} mismatching attendance summary row(s)")
+            return 1 if mismatches else 0
+
+        rebuilt = await rebuild_attendance_summaries(db)
+        # The rebuild has committed; tell the API its cached reads are stale
+        await bump_stored(db, FUND)
+        await db.commit()
+        print(f"Rebuilt attendance summaries for {rebuilt} player(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main("--check" in sys.argv[1:]))
+    sys.exit(exit_code)
@@ -0,0 +1,39 @@
+"""
+Rebuild or verify the fund_monthly_rollup table.
+
+Usage:
+    python rebuild_fund_rollup.py          # Backfill every month from payments, costs and attendance
+    python rebuild_fund_rollup.py --check  # Compare stored rows against a full recompute
+"""
+
+import sys
+import asyncio
+from database import engine, AsyncSessionLocal, Base
+from data_versions import bump_stored, FUND
+from fund.rollup import rebuild_monthly_rollup, find_rollup_mismatches
+import models  # noqa: F401
+
+
+async def main(check_only: bool):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        if check_only:
+            mismatches = await find_rollup_mismatches(db)
+            for mismatch in mismatches:
+                print(f"Player {mismatch['player_id']}, {mismatch['month']:%Y-%m}: stored={mismatch['stored']} expected={mismatch['expected']}")
+            print(f"{len(mismatches)} mismatching rollup row(s)")
+            return 1 if mismatches else 0
+
+        rebuilt = await rebuild_monthly_rollup(db)
+        # The rebuild has committed; tell the API its cached reads are stale
+        await bump_stored(db, FUND)
+        await db.commit()
+        print(f"Rebuilt {rebuilt} monthly rollup row(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main("--check" in sys.argv[1:]))
+    sys.exit(exit_code)
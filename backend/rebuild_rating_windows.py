@@ -0,0 +1,39 @@
+"""
+Rebuild or verify the player_rating_window table.
+
+Usage:
+    python rebuild_rating_windows.py          # Backfill every player's window from scratch
+    python rebuild_rating_windows.py --check  # Compare stored windows against a full recompute
+"""
+
+import sys
+import asyncio
+from database import engine, AsyncSessionLocal, Base
+from data_versions import bump_stored, PLAYERS
+from ranking.windows import rebuild_all_windows, find_window_mismatches
+import models  # noqa: F401
+
+
+async def main(check_only: bool):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        if check_only:
+            mismatches = await find_window_mismatches(db)
+            for mismatch in mismatches:
+                print(f"Player {mismatch['player_id']}: stored={mismatch['stored']} expected={mismatch['expected']}")
+            print(f"{len(mismatches)} mismatching rating window(s)")
+            return 1 if mismatches else 0
+
+        rebuilt = await rebuild_all_windows(db)
+        # The rebuild has committed; tell the API its cached reads are stale
+        await bump_stored(db, PLAYERS)
+        await db.commit()
+        print(f"Rebuilt rating windows for {rebuilt} player(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main("--check" in sys.argv[1:]))
+    sys.exit(exit_code)
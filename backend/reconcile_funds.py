@@ -0,0 +1,51 @@
+"""
+Reconcile player_funds against payments, tournament costs, misc costs and attendance.
+
+Usage:
+    python reconcile_funds.py          # Report players whose stored figures differ from a recompute
+    python reconcile_funds.py --apply  # Also correct them (one bulk posting, recorded in the ledger)
+"""
+
+import sys
+import time
+import asyncio
+from database import engine, AsyncSessionLocal, Base
+from data_versions import bump_stored, FUND
+from fund.reconciliation import compute_fund_figures, find_fund_mismatches, apply_fund_corrections, FUND_FIELDS
+import models  # noqa: F401
+
+
+async def main(apply: bool):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        figures = await compute_fund_figures(db)
+        mismatches = await find_fund_mismatches(db, figures)
+        print(f"Checked {len(figures)} player(s) in {time.perf_counter() - started:.2f}s")
+
+        for mismatch in mismatches:
+            differences = ", ".join(
+                f"{field}: stored={mismatch['stored'][field]} expected={mismatch['expected'][field]}"
+                for field in FUND_FIELDS
+                if mismatch["stored"][field] != mismatch["expected"][field]
+            )
+            print(f"{mismatch['player_name']} (player {mismatch['player_id']}): {differences}")
+        print(f"{len(mismatches)} mismatching fund record(s)")
+
+        if not mismatches:
+            return 0
+        if not apply:
+            return 1
+
+        corrected = await apply_fund_corrections(mismatches, db)
+        await bump_stored(db, FUND)
+        await db.commit()
+        print(f"Corrected {corrected} fund record(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main("--apply" in sys.argv[1:]))
+    sys.exit(exit_code)
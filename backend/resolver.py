@@ -0,0 +1,122 @@
+"""
+Request-scoped, batched lookups of players, player funds and tournaments.
+
+A request's session owns one Resolver (see get_resolver). Services ask it
+for players by name, fund records by player id and tournaments by date.
+Every key requested (or primed) before the next load is fetched with a
+single IN query, and the results, including misses, are memoized for the
+rest of the request. That replaces the per-name SELECT loops of the fund and
+tournament services.
+
+Memoized objects are ordinary ORM instances of the session, so in-place
+changes are visible to later lookups. Fund records are the exception: the
+posting engine (fund.posting) changes balances in SQL and hands the updated
+rows back via remember_funds. The session factory does not expire objects
+on commit.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+import models
+import fund_models
+
+SESSION_INFO_KEY = "resolver"
+
+
+class Resolver:
+    def __init__(self, db: AsyncSession):
+        self._db = db
+        self._players: Dict[str, Optional[models.Player]] = {}
+        self._funds: Dict[int, Optional[fund_models.PlayerFund]] = {}
+        self._tournaments_by_date: Dict[date, Optional[models.Tournament]] = {}
+        self._pending_player_names = set()
+        self._pending_fund_player_ids = set()
+
+    # ============ Players ============
+    def prime_players(self, player_names: Iterable[str]):
+        """Queue names to be loaded together with the next player lookup"""
+        self._pending_player_names.update(
+            player_name for player_name in player_names if player_name not in self._players
+        )
+
+    async def get_players(self, player_names: Iterable[str]) -> Dict[str, Optional[models.Player]]:
+        """Get players by name (None for unknown names)"""
+        player_names = list(dict.fromkeys(player_names))
+        self.prime_players(player_names)
+
+        if self._pending_player_names:
+            pending_names = list(self._pending_player_names)
+            self._pending_player_names.clear()
+            result = await self._db.execute(
+                select(models.Player).where(models.Player.name.in_(pending_names))
+            )
+            self._players.update(dict.fromkeys(pending_names))
+            self._players.update({player.name: player for player in result.scalars().all()})
+
+        return {player_name: self._players[player_name] for player_name in player_names}
+
+    async def get_player(self, player_name: str) -> Optional[models.Player]:
+        return (await self.get_players([player_name]))[player_name]
+
+    def forget_players(self, player_names: Iterable[str]):
+        """Drop memoized lookups, e.g. after the players were created"""
+        for player_name in player_names:
+            self._players.pop(player_name, None)
+
+    # ============ Player funds ============
+    def prime_funds(self, player_ids: Iterable[int]):
+        """Queue player ids whose fund records should be loaded with the next fund lookup"""
+        self._pending_fund_player_ids.update(
+            player_id for player_id in player_ids if player_id not in self._funds
+        )
+
+    async def get_funds(self, player_ids: Iterable[int]) -> Dict[int, Optional[fund_models.PlayerFund]]:
+        """Get fund records by player id (None for players without one)
+
+        Balances are never changed through these objects: fund.posting updates
+        them with SQL-side arithmetic and refreshes the memoized records.
+        """
+        player_ids = list(dict.fromkeys(player_ids))
+        self.prime_funds(player_ids)
+
+        if self._pending_fund_player_ids:
+            pending_ids = list(self._pending_fund_player_ids)
+            self._pending_fund_player_ids.clear()
+            result = await self._db.execute(
+                select(fund_models.PlayerFund).where(fund_models.PlayerFund.player_id.in_(pending_ids))
+            )
+            self._funds.update(dict.fromkeys(pending_ids))
+            self._funds.update({fund.player_id: fund for fund in result.scalars().all()})
+
+        return {player_id: self._funds[player_id] for player_id in player_ids}
+
+    async def get_fund(self, player_id: int) -> Optional[fund_models.PlayerFund]:
+        return (await self.get_funds([player_id]))[player_id]
+
+    def remember_funds(self, funds: Iterable[fund_models.PlayerFund]):
+        """Memoize fund records loaded or created elsewhere (e.g. returned by an upsert)"""
+        for fund in funds:
+            self._funds[fund.player_id] = fund
+            self._pending_fund_player_ids.discard(fund.player_id)
+
+    # ============ Tournaments ============
+    async def get_tournament_by_date(self, tournament_date: date) -> Optional[models.Tournament]:
+        if tournament_date not in self._tournaments_by_date:
+            result = await self._db.execute(
+                select(models.Tournament).where(models.Tournament.date == tournament_date)
+            )
+            self._tournaments_by_date[tournament_date] = result.scalar()
+        return self._tournaments_by_date[tournament_date]
+
+    def forget_tournament(self, tournament_date: date):
+        self._tournaments_by_date.pop(tournament_date, None)
+
+
+def get_resolver(db: AsyncSession) -> Resolver:
+    """Get the resolver of a session, creating it on first use"""
+    resolver = db.info.get(SESSION_INFO_KEY)
+    if resolver is None:
+        resolver = db.info[SESSION_INFO_KEY] = Resolver(db)
+    return resolver
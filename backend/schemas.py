@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, conint
+from typing import Dict, List, Optional
 from datetime import date
+from ranking.constants import BEST_RATING, WORST_RATING
 
 class PlayerBase(BaseModel):
     name: str
@@ -47,7 +48,100 @@ class Tournament(TournamentBase):
         orm_mode = True
 
 
+class TournamentHistoryDelta(BaseModel):
+    """Changes to the tournament history since a change-log cursor"""
+    cursor: int
+    full: bool  # True when upserted holds the whole history and the client should replace its copy
+    upserted: List[Tournament]
+    deleted: List[str]
+
+
 class CreateUnofficialTournamentRequest(BaseModel):
     """Request schema for creating unofficial tournament"""
     date: date
     tournament_players: List[str]
+
+
+class TemporaryPlayer(BaseModel):
+    """A player without history who is seeded with a fixed initial rank"""
+    name: str
+    initial_rank: float
+
+
+class StandingsRequest(BaseModel):
+    """Request schema for computing the weekly standings"""
+    active_players: List[str]
+    temporary_players: List[TemporaryPlayer] = []
+
+
+class PlayerStanding(BaseModel):
+    name: str
+    average: float
+    weighted_average: float
+    best_rating: float
+    played_count: int
+    is_temporary: bool
+    recent_ratings: List[int] = []
+
+
+class StandingsScenario(BaseModel):
+    """A what-if question: who shows up, and optionally results that have not happened yet"""
+    name: Optional[str] = None
+    active_players: List[str]
+    temporary_players: List[TemporaryPlayer] = []
+    # Player name -> extra ratings, most recent first
+    hypothetical_ratings: Dict[str, List[conint(ge=BEST_RATING, le=WORST_RATING)]] = {}
+
+
+class StandingsSimulationRequest(BaseModel):
+    scenarios: List[StandingsScenario]
+
+
+class ScenarioStandings(BaseModel):
+    name: Optional[str] = None
+    standings: List[PlayerStanding]
+
+
+class StandingsSimulationResult(BaseModel):
+    scenarios: List[ScenarioStandings]
+    scenario_count: int
+    elapsed_ms: float  # Evaluation time, excluding the single window lookup
+    scenarios_per_second: float
+
+
+class GroupingPlayer(BaseModel):
+    name: str
+    rating: float  # Standing average, lower is better
+
+
+class GroupingRequest(BaseModel):
+    """Request schema for balanced group generation"""
+    players: List[GroupingPlayer]  # Sorted best to worst, as returned by /ranking/standings
+    num_groups: int = 2
+    objective: str = "average"
+
+
+class GroupingResult(BaseModel):
+    groups: Dict[str, List[str]]
+    group_ratings: Dict[str, float]
+    objective: str
+    spread: float  # Max minus min group rating, 0 is perfectly balanced
+    seed_spread: float  # Spread of the snake seed the search started from
+    swaps: int
+
+
+class KnockoutMatch(BaseModel):
+    id: str
+    p1: str
+    p2: str
+    next: Optional[str] = None  # Set on matches whose winner meets a player who had a bye
+
+
+class KnockoutRound(BaseModel):
+    round: str
+    matches: List[KnockoutMatch]
+
+
+class KnockoutFixtures(BaseModel):
+    cup: List[KnockoutRound]
+    plate: List[KnockoutRound]
@@ -1,17 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 import schemas
 from database import get_db, ADMIN_PASSWORD
 from tournament import services
 
 router = APIRouter(prefix="/history", tags=["tournaments"])
 
+HISTORY_FORMATS = ("full", "compact")
 
-@router.get("", response_model=List[schemas.Tournament])
-async def get_history(database_session: AsyncSession = Depends(get_db)):
-    """Get all tournaments with their rank groups and players"""
-    return await services.get_all_tournaments(database_session)
+
+@router.get("", response_model=Union[List[schemas.Tournament], schemas.TournamentHistoryDelta])
+async def get_history(
+    since: Optional[int] = Query(None, ge=0),
+    format: str = "full",
+    database_session: AsyncSession = Depends(get_db)
+):
+    """
+    Get all tournaments with their rank groups and players.
+    With `since`, only the tournaments changed after that change-log cursor are returned
+    (use since=0 for the first sync to obtain a cursor).
+    With format=compact, the tournaments are dictionary-encoded (see services.encode_compact_history).
+    """
+    if format not in HISTORY_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Use one of: {', '.join(HISTORY_FORMATS)}")
+
+    if since is not None:
+        history = await services.get_tournament_changes_since(since, database_session)
+        if format == "compact":
+            history["upserted"] = services.encode_compact_history(history["upserted"])
+            return JSONResponse(content=history)
+        return history
+
+    history = await services.get_all_tournaments(database_session)
+    if format == "compact":
+        return JSONResponse(content=services.encode_compact_history(history))
+    return history
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -2,7 +2,52 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy import func, delete, update, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, Iterable, List
 import models, schemas
+import fund_models
+from ranking.windows import refresh_player_windows
+from data_versions import data_versions, TOURNAMENTS, PLAYERS, FUND
+from resolver import get_resolver
+from fund.posting import FundPosting, apply_postings
+from fund.attendance import refresh_attendance_summaries
+from fund.rollup import refresh_monthly_rollup
+from fund.constants import LEDGER_ATTENDANCE
+from fund.cache import fund_cache, invalidate_cost_details
+
+
+async def _get_tournament_player_ids(tournament_id: str, database_session: AsyncSession):
+    """Get the ids of every player ranked in a tournament"""
+    query_result = await database_session.execute(
+        select(models.rank_group_players.c.player_id)
+        .join(models.RankGroup, models.RankGroup.id == models.rank_group_players.c.rank_group_id)
+        .where(models.RankGroup.tournament_id == tournament_id)
+    )
+    return set(query_result.scalars().all())
+
+
+def _serialize_tournament(tournament: models.Tournament) -> dict:
+    """Transform a tournament with loaded rank groups into the /history response shape"""
+    # Pydantic's orm_mode might struggle with the M2M relationship directly mapping to List[str],
+    # so RankGroup.players is flattened to a list of names manually.
+    rank_groups_list = []
+    for rank_group in tournament.rank_groups:
+        rank_groups_list.append({
+            "id": rank_group.id,
+            "tournament_id": rank_group.tournament_id,
+            "rank": rank_group.rank,
+            "rating": rank_group.rating,
+            "players": [player.name for player in rank_group.players]
+        })
+    return {
+        "id": tournament.id,
+        "date": tournament.date,
+        "playlist_url": tournament.playlist_url,
+        "embed_url": tournament.embed_url,
+        "is_official": tournament.is_official,
+        "ranks": rank_groups_list
+    }
 
 
 async def get_all_tournaments(database_session: AsyncSession):
@@ -16,33 +61,154 @@ async def get_all_tournaments(database_session: AsyncSession):
         .order_by(models.Tournament.date.desc())
     )
     tournaments = query_result.scalars().all()
-    
-    # Transform to match schema (RankGroup.players needs to be list of strings)
-    # Pydantic's orm_mode might struggle with the M2M relationship directly mapping to List[str]
-    # We might need a custom response model or manual transformation.
-    # Let's do manual transformation for simplicity and robustness.
-    
-    response = []
+
+    return [_serialize_tournament(tournament) for tournament in tournaments]
+
+
+def encode_compact_history(tournaments: List[dict]) -> dict:
+    """
+    Encode serialized tournaments in the compact wire format.
+    Player names are sent once in a dictionary and referenced by index, and tournament and
+    rank group fields are sent as parallel columns. The groups of tournament i are the slice
+    rank_offsets[i]:rank_offsets[i + 1] of the rank_groups columns.
+    """
+    player_indices = {}
+    tournament_columns = {"id": [], "date": [], "playlist_url": [], "embed_url": [], "is_official": [], "rank_offsets": [0]}
+    rank_group_columns = {"id": [], "rank": [], "rating": [], "players": []}
+
     for tournament in tournaments:
-        rank_groups_list = []
-        for rank_group in tournament.rank_groups:
-            rank_groups_list.append({
-                "id": rank_group.id,
-                "tournament_id": rank_group.tournament_id,
-                "rank": rank_group.rank,
-                "rating": rank_group.rating,
-                "players": [player.name for player in rank_group.players]
-            })
-        response.append({
-            "id": tournament.id,
-            "date": tournament.date,
-            "playlist_url": tournament.playlist_url,
-            "embed_url": tournament.embed_url,
-            "is_official": tournament.is_official,
-            "ranks": rank_groups_list
-        })
-        
-    return response
+        tournament_columns["id"].append(tournament["id"])
+        tournament_columns["date"].append(tournament["date"].isoformat())
+        tournament_columns["playlist_url"].append(tournament["playlist_url"])
+        tournament_columns["embed_url"].append(tournament["embed_url"])
+        tournament_columns["is_official"].append(tournament["is_official"])
+
+        for rank_group in tournament["ranks"]:
+            rank_group_columns["id"].append(rank_group["id"])
+            rank_group_columns["rank"].append(rank_group["rank"])
+            rank_group_columns["rating"].append(rank_group["rating"])
+            rank_group_columns["players"].append([
+                player_indices.setdefault(player_name, len(player_indices))
+                for player_name in rank_group["players"]
+            ])
+        tournament_columns["rank_offsets"].append(len(rank_group_columns["id"]))
+
+    return {
+        "format": "compact",
+        "players": list(player_indices),
+        "tournaments": tournament_columns,
+        "rank_groups": rank_group_columns
+    }
+
+
+# Advisory lock that serializes change-log writers from the seq allocation to their commit
+CHANGE_LOG_LOCK_KEY = 3_000_001
+
+
+async def _record_change(tournament_id: str, operation: str, database_session: AsyncSession):
+    """
+    Append a tournament write to the change log (committed with the write itself).
+    Writers take a transaction-scoped advisory lock first, so seqs commit in order and a
+    cursor handed out as max(seq) never skips a seq that commits later.
+    """
+    await database_session.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK_KEY)))
+    database_session.add(models.TournamentChange(tournament_id=tournament_id, operation=operation))
+
+
+async def get_tournament_changes_since(since: int, database_session: AsyncSession):
+    """Fetch the tournaments upserted and deleted after the given change-log cursor"""
+    cursor_result = await database_session.execute(select(func.max(models.TournamentChange.seq)))
+    cursor = cursor_result.scalar() or 0
+
+    # A zero cursor is a first sync; a cursor ahead of the log cannot be trusted
+    if since <= 0 or since > cursor:
+        return {
+            "cursor": cursor,
+            "full": True,
+            "upserted": await get_all_tournaments(database_session),
+            "deleted": []
+        }
+
+    changed_ids_result = await database_session.execute(
+        select(models.TournamentChange.tournament_id)
+        .where(
+            models.TournamentChange.seq > since,
+            models.TournamentChange.seq <= cursor
+        )
+        .distinct()
+    )
+    changed_ids = set(changed_ids_result.scalars().all())
+
+    upserted = []
+    if changed_ids:
+        # Whatever still exists is sent in full; the rest was deleted
+        tournaments_result = await database_session.execute(
+            select(models.Tournament)
+            .where(models.Tournament.id.in_(changed_ids))
+            .options(
+                selectinload(models.Tournament.rank_groups)
+                .selectinload(models.RankGroup.players)
+            )
+            .order_by(models.Tournament.date.desc())
+        )
+        upserted = [_serialize_tournament(tournament) for tournament in tournaments_result.scalars().all()]
+
+    existing_ids = {tournament["id"] for tournament in upserted}
+    return {
+        "cursor": cursor,
+        "full": False,
+        "upserted": upserted,
+        "deleted": sorted(changed_ids - existing_ids)
+    }
+
+
+async def _resolve_player_ids(player_names: Iterable[str], database_session: AsyncSession) -> Dict[str, int]:
+    """Map player names to ids, creating the missing players, in a constant number of queries"""
+    resolver = get_resolver(database_session)
+    players = await resolver.get_players(player_names)
+
+    missing_names = [player_name for player_name, player in players.items() if player is None]
+    if missing_names:
+        # Names inserted concurrently by another writer are skipped by ON CONFLICT DO NOTHING
+        # and picked up by the reload below all the same
+        await database_session.execute(
+            insert(models.Player)
+            .values([{"name": player_name, "is_guest": False} for player_name in missing_names])
+            .on_conflict_do_nothing(index_elements=[models.Player.name])
+        )
+        resolver.forget_players(missing_names)
+        players.update(await resolver.get_players(missing_names))
+
+    return {player_name: player.id for player_name, player in players.items()}
+
+
+async def _insert_rank_groups(
+    tournament_id: str,
+    rank_groups: List[schemas.RankGroupCreate],
+    player_ids: Dict[str, int],
+    database_session: AsyncSession
+):
+    """Bulk insert the rank groups of a tournament and their player memberships"""
+    if not rank_groups:
+        return
+
+    # A parameter list (rather than multi-row values()) lets RETURNING follow the input order
+    inserted_result = await database_session.execute(
+        insert(models.RankGroup).returning(models.RankGroup.id, sort_by_parameter_order=True),
+        [
+            {"tournament_id": tournament_id, "rank": rank_group.rank, "rating": rank_group.rating}
+            for rank_group in rank_groups
+        ]
+    )
+    rank_group_ids = inserted_result.scalars().all()
+
+    memberships = [
+        {"rank_group_id": rank_group_id, "player_id": player_ids[player_name]}
+        for rank_group_id, rank_group in zip(rank_group_ids, rank_groups)
+        for player_name in rank_group.players
+    ]
+    if memberships:
+        await database_session.execute(insert(models.rank_group_players).values(memberships))
 
 
 def validate_tournament_rules(tournament: schemas.TournamentCreate):
@@ -110,79 +276,65 @@ async def create_tournament(tournament: schemas.TournamentCreate, database_sessi
         is_official=tournament.is_official if tournament.is_official is not None else True
     )
     database_session.add(database_tournament)
-    
-    # Track all players for days_played update
-    all_players = []
-    
-    for rank_group in tournament.ranks:
-        database_rank_group = models.RankGroup(
-            rank=rank_group.rank, 
-            rating=rank_group.rating, 
-            tournament_id=tournament.id
-        )
-        
-        # Handle Players
-        for player_name in rank_group.players:
-            # Check if player exists
-            player_query_result = await database_session.execute(
-                select(models.Player).where(models.Player.name == player_name)
-            )
-            existing_player = player_query_result.scalar()
-            
-            if not existing_player:
-                existing_player = models.Player(name=player_name)
-                database_session.add(existing_player)
-                await database_session.flush() # Get ID
-            
-            database_rank_group.players.append(existing_player)
-            all_players.append(player_name)
-            
-        database_session.add(database_rank_group)
+    await database_session.flush()
 
-    await database_session.commit()
-    
-    # Update days_played for all tournament players
-    try:
-        from fund_models import PlayerFund
-        
-        for player_name in all_players:
-            # Get player by name
-            player_result = await database_session.execute(
-                select(models.Player).where(models.Player.name == player_name)
+    all_players = [player_name for rank_group in tournament.ranks for player_name in rank_group.players]
+    player_ids_by_name = await _resolve_player_ids(all_players, database_session)
+    await _insert_rank_groups(tournament.id, tournament.ranks, player_ids_by_name, database_session)
+    player_ids = set(player_ids_by_name.values())
+
+    # Fund bookkeeping is part of the same transaction as the result itself
+    await apply_postings(
+        (
+            FundPosting(
+                player_id,
+                delta_days=1,
+                entry_type=LEDGER_ATTENDANCE,
+                reference=f"tournament:{tournament.id}",
+                entry_date=tournament.date
             )
-            player = player_result.scalar()
-            
-            if player:
-                # Get or create player fund
-                fund_result = await database_session.execute(
-                    select(PlayerFund).where(PlayerFund.player_id == player.id)
-                )
-                player_fund = fund_result.scalar()
-                
-                if player_fund:
-                    # Increment days_played
-                    player_fund.days_played += 1
-                else:
-                    # Create new fund record if doesn't exist
-                    player_fund = PlayerFund(
-                        player_id=player.id,
-                        current_balance=0.0,
-                        days_played=1,
-                        total_paid=0.0,
-                        total_cost=0.0
-                    )
-                    database_session.add(player_fund)
-        
-        await database_session.commit()
-    except Exception as e:
-        # Don't fail tournament creation if fund update fails
-        print(f"Warning: Failed to update player fund days_played: {e}")
-    
+            for player_id in player_ids
+        ),
+        database_session
+    )
+    await refresh_player_windows(player_ids, database_session)
+    await _record_change(tournament.id, "upsert", database_session)
+    await database_session.commit()
+    data_versions.bump(TOURNAMENTS, PLAYERS, FUND)
+
     return {"message": "Tournament added successfully"}
 
 
+async def _get_stored_rank_groups(tournament_id: str, database_session: AsyncSession) -> List[dict]:
+    """Load a tournament's rank groups with their members as {"id", "rank", "rating", "players": {name: id}}"""
+    rank_groups_result = await database_session.execute(
+        select(models.RankGroup.id, models.RankGroup.rank, models.RankGroup.rating)
+        .where(models.RankGroup.tournament_id == tournament_id)
+        .order_by(models.RankGroup.id)
+    )
+    stored_groups = {
+        row.id: {"id": row.id, "rank": row.rank, "rating": row.rating, "players": {}}
+        for row in rank_groups_result.all()
+    }
+
+    if stored_groups:
+        memberships_result = await database_session.execute(
+            select(models.rank_group_players.c.rank_group_id, models.Player.id, models.Player.name)
+            .join(models.Player, models.Player.id == models.rank_group_players.c.player_id)
+            .where(models.rank_group_players.c.rank_group_id.in_(list(stored_groups)))
+        )
+        for row in memberships_result.all():
+            stored_groups[row.rank_group_id]["players"][row.name] = row.id
+
+    return list(stored_groups.values())
+
+
 async def update_tournament(tournament_id: str, tournament: schemas.TournamentCreate, database_session: AsyncSession):
-    """Update an existing tournament"""
+    """
+    Update an existing tournament by applying only the difference to the stored result.
+    Rank groups are matched by rating (unique within a tournament); matched groups get their
+    rank and memberships patched, unmatched groups are inserted or deleted.
+    """
     # Check if exists
     tournament_query_result = await database_session.execute(
         select(models.Tournament).where(models.Tournament.id == tournament_id)
@@ -192,51 +344,129 @@ async def update_tournament(tournament_id: str, tournament: schemas.TournamentCr
     if not database_tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
 
+    changes = {
+        "fields": [],
+        "added_groups": [],
+        "removed_groups": [],
+        "rank_changes": [],
+        "added_players": [],
+        "removed_players": []
+    }
+
     # Update Date and URLs
-    database_tournament.date = tournament.date
-    database_tournament.playlist_url = tournament.playlist_url
-    database_tournament.embed_url = tournament.embed_url
-    database_tournament.is_official = tournament.is_official if tournament.is_official is not None else True
-    
-    # Delete existing rank groups (cascade should handle associations if configured, but let's be explicit)
-    # Actually, we need to delete RankGroups associated with this tournament.
-    # The association table rank_group_players will be cleaned up if we delete RankGroup.
-    
-    # Fetch existing rank groups to delete them
-    existing_rank_groups_query = await database_session.execute(
-        select(models.RankGroup).where(models.RankGroup.tournament_id == tournament_id)
+    new_fields = {
+        "date": tournament.date,
+        "playlist_url": tournament.playlist_url,
+        "embed_url": tournament.embed_url,
+        "is_official": tournament.is_official if tournament.is_official is not None else True
+    }
+    for field_name, new_value in new_fields.items():
+        if getattr(database_tournament, field_name) != new_value:
+            setattr(database_tournament, field_name, new_value)
+            changes["fields"].append(field_name)
+
+    stored_groups = await _get_stored_rank_groups(tournament_id, database_session)
+    stored_groups_by_rating = {}
+    for stored_group in stored_groups:
+        stored_groups_by_rating.setdefault(stored_group["rating"], []).append(stored_group)
+
+    player_ids_by_name = await _resolve_player_ids(
+        (player_name for rank_group in tournament.ranks for player_name in rank_group.players),
+        database_session
     )
-    existing_rank_groups = existing_rank_groups_query.scalars().all()
-    
-    for existing_rank_group in existing_rank_groups:
-        await database_session.delete(existing_rank_group)
-        
-    # Re-create Ranks
+
+    new_rank_groups = []
+    rank_updates = []
+    memberships_to_add = []
+    memberships_to_remove = []
+    affected_player_ids = set()
+
     for rank_group in tournament.ranks:
-        database_rank_group = models.RankGroup(
-            rank=rank_group.rank, 
-            rating=rank_group.rating, 
-            tournament_id=tournament_id
+        matching_groups = stored_groups_by_rating.get(rank_group.rating)
+        if not matching_groups:
+            new_rank_groups.append(rank_group)
+            changes["added_groups"].append(rank_group.rating)
+            affected_player_ids.update(player_ids_by_name[player_name] for player_name in rank_group.players)
+            continue
+
+        stored_group = matching_groups.pop(0)
+        if stored_group["rank"] != rank_group.rank:
+            rank_updates.append({"id": stored_group["id"], "rank": rank_group.rank})
+            changes["rank_changes"].append({
+                "rating": rank_group.rating,
+                "old_rank": stored_group["rank"],
+                "new_rank": rank_group.rank
+            })
+
+        incoming_players = dict.fromkeys(rank_group.players)
+        for player_name in incoming_players:
+            if player_name not in stored_group["players"]:
+                memberships_to_add.append({"rank_group_id": stored_group["id"], "player_id": player_ids_by_name[player_name]})
+                changes["added_players"].append({"rating": rank_group.rating, "player": player_name})
+                affected_player_ids.add(player_ids_by_name[player_name])
+        for player_name, player_id in stored_group["players"].items():
+            if player_name not in incoming_players:
+                memberships_to_remove.append((stored_group["id"], player_id))
+                changes["removed_players"].append({"rating": rank_group.rating, "player": player_name})
+                affected_player_ids.add(player_id)
+
+    # Whatever was not matched by an incoming group is gone
+    removed_group_ids = []
+    for matching_groups in stored_groups_by_rating.values():
+        for stored_group in matching_groups:
+            removed_group_ids.append(stored_group["id"])
+            changes["removed_groups"].append(stored_group["rating"])
+            affected_player_ids.update(stored_group["players"].values())
+
+    if removed_group_ids:
+        await database_session.execute(
+            delete(models.rank_group_players).where(models.rank_group_players.c.rank_group_id.in_(removed_group_ids))
         )
-        
-        for player_name in rank_group.players:
-            # Find or Create Player
-            player_query_result = await database_session.execute(
-                select(models.Player).where(models.Player.name == player_name)
+        await database_session.execute(
+            delete(models.RankGroup).where(models.RankGroup.id.in_(removed_group_ids))
+        )
+    if memberships_to_remove:
+        await database_session.execute(
+            delete(models.rank_group_players).where(
+                tuple_(models.rank_group_players.c.rank_group_id, models.rank_group_players.c.player_id)
+                .in_(memberships_to_remove)
             )
-            existing_player = player_query_result.scalar()
-            
-            if not existing_player:
-                existing_player = models.Player(name=player_name)
-                database_session.add(existing_player)
-                await database_session.flush()
-            
-            database_rank_group.players.append(existing_player)
-            
-        database_session.add(database_rank_group)
+        )
+    if memberships_to_add:
+        await database_session.execute(insert(models.rank_group_players).values(memberships_to_add))
+    if rank_updates:
+        # ORM bulk UPDATE by primary key
+        await database_session.execute(update(models.RankGroup), rank_updates)
+    await _insert_rank_groups(tournament_id, new_rank_groups, player_ids_by_name, database_session)
+
+    if not any(changes.values()):
+        return {"message": "Tournament updated successfully", "changes": changes}
 
+    # Moving the date or toggling is_official reorders or (un)counts every player's result
+    if "date" in changes["fields"] or "is_official" in changes["fields"]:
+        affected_player_ids.update(player_ids_by_name.values())
+        for stored_group in stored_groups:
+            affected_player_ids.update(stored_group["players"].values())
+
+    await refresh_player_windows(affected_player_ids, database_session)
+    memberships_changed = any(
+        changes[key] for key in ("added_groups", "removed_groups", "added_players", "removed_players")
+    )
+    if "date" in changes["fields"] or memberships_changed:
+        # A new date moves the tournament's costs and played days to another month;
+        # memberships decide who played it (its attendees if it has no rank groups)
+        attendee_result = await database_session.execute(
+            select(fund_models.TournamentAttendance.player_id)
+            .where(fund_models.TournamentAttendance.tournament_id == tournament_id)
+        )
+        await refresh_monthly_rollup(affected_player_ids | set(attendee_result.scalars().all()), database_session)
+    await _record_change(tournament_id, "upsert", database_session)
     await database_session.commit()
-    return {"message": "Tournament updated successfully"}
+    if "date" in changes["fields"]:
+        # A cost breakdown is cached under the date of its tournament
+        fund_cache.clear()
+    data_versions.bump(TOURNAMENTS, PLAYERS, FUND)
+    return {"message": "Tournament updated successfully", "changes": changes}
 
 
 async def delete_tournament(tournament_id: str, database_session: AsyncSession):
@@ -250,6 +480,13 @@ async def delete_tournament(tournament_id: str, database_session: AsyncSession):
     if not database_tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
 
+    affected_player_ids = await _get_tournament_player_ids(tournament_id, database_session)
+    attendee_result = await database_session.execute(
+        select(fund_models.TournamentAttendance.player_id)
+        .where(fund_models.TournamentAttendance.tournament_id == tournament_id)
+    )
+    attendee_ids = set(attendee_result.scalars().all())
+
     # Delete RankGroups associated with this tournament
     # (Explicitly deleting them, though cascade might handle it depending on DB setup)
     rank_groups_query_result = await database_session.execute(
@@ -262,8 +499,15 @@ async def delete_tournament(tournament_id: str, database_session: AsyncSession):
 
     # Delete the tournament itself
     await database_session.delete(database_tournament)
-    
+
+    await refresh_player_windows(affected_player_ids, database_session)
+    # The attendance rows and costs go with the tournament (cascade)
+    await refresh_attendance_summaries(attendee_ids, database_session)
+    await refresh_monthly_rollup(affected_player_ids | attendee_ids, database_session)
+    await _record_change(tournament_id, "delete", database_session)
     await database_session.commit()
+    invalidate_cost_details(database_tournament.date)
+    data_versions.bump(TOURNAMENTS, PLAYERS, FUND)
     return {"message": "Tournament deleted successfully"}
 
 
@@ -299,10 +543,7 @@ async def create_unofficial_tournament(
     """Create an unofficial tournament entry for cost tracking without rankings"""
     
     # Check if tournament already exists for this date
-    existing_tournament_query = await database_session.execute(
-        select(models.Tournament).where(models.Tournament.date == request_data.date)
-    )
-    existing_tournament = existing_tournament_query.scalar()
+    existing_tournament = await get_resolver(database_session).get_tournament_by_date(request_data.date)
     
     if existing_tournament:
         raise HTTPException(
@@ -323,65 +564,38 @@ async def create_unofficial_tournament(
     )
     database_session.add(database_tournament)
     await database_session.flush()
+    get_resolver(database_session).forget_tournament(request_data.date)
     
-    # Create attendance records for all players
-    for player_name in request_data.tournament_players:
-        # Get or create player
-        player_query_result = await database_session.execute(
-            select(models.Player).where(models.Player.name == player_name)
-        )
-        player = player_query_result.scalar()
-        
-        if not player:
-            player = models.Player(name=player_name)
-            database_session.add(player)
-            await database_session.flush()
-        
-        # Create attendance record (default to non-club member)
-        from fund_models import TournamentAttendance
-        attendance = TournamentAttendance(
-            tournament_id=tournament_id,
-            player_id=player.id,
-            is_club_member=False
+    # Create attendance records for all players (default to non-club member)
+    player_ids_by_name = await _resolve_player_ids(request_data.tournament_players, database_session)
+    player_ids = set(player_ids_by_name.values())
+    if player_ids:
+        await database_session.execute(
+            insert(fund_models.TournamentAttendance).values([
+                {"tournament_id": tournament_id, "player_id": player_id, "is_club_member": False}
+                for player_id in sorted(player_ids)
+            ])
         )
-        database_session.add(attendance)
-    
-    # Update days_played for all tournament players
-    try:
-        from fund_models import PlayerFund
-        
-        for player_name in request_data.tournament_players:
-            # Get player by name
-            player_result = await database_session.execute(
-                select(models.Player).where(models.Player.name == player_name)
+        await refresh_attendance_summaries(player_ids, database_session)
+
+    await apply_postings(
+        (
+            FundPosting(
+                player_id,
+                delta_days=1,
+                entry_type=LEDGER_ATTENDANCE,
+                reference=f"tournament:{tournament_id}",
+                entry_date=request_data.date
             )
-            player = player_result.scalar()
-            
-            if player:
-                # Get or create player fund
-                fund_result = await database_session.execute(
-                    select(PlayerFund).where(PlayerFund.player_id == player.id)
-                )
-                player_fund = fund_result.scalar()
-                
-                if player_fund:
-                    # Increment days_played
-                    player_fund.days_played += 1
-                else:
-                    # Create new fund record if doesn't exist
-                    player_fund = PlayerFund(
-                        player_id=player.id,
-                        current_balance=0.0,
-                        days_played=1,
-                        total_paid=0.0,
-                        total_cost=0.0
-                    )
-                    database_session.add(player_fund)
-    except Exception as e:
-        # Don't fail tournament creation if fund update fails
-        print(f"Warning: Failed to update player fund days_played: {e}")
-    
+            for player_id in player_ids
+        ),
+        database_session
+    )
+    # Unofficial results carry no ratings, but every attendee gets a window row
+    await refresh_player_windows(player_ids, database_session)
+    await _record_change(tournament_id, "upsert", database_session)
     await database_session.commit()
+    data_versions.bump(TOURNAMENTS, PLAYERS, FUND)
     
     return {
         "message": "Unofficial tournament created successfully",
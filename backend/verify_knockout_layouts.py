@@ -0,0 +1,67 @@
+"""
+Check that the backend knockout generator reproduces the hand-written
+brackets of src/logic/knockout.js (2 groups, 10/12/14/16 players).
+
+The JS tables are evaluated with node so the check always runs against the
+current frontend source. Some JS entries annotate a feeder with its players,
+e.g. "Winner CQ2 (A3/B2)"; the annotation is cosmetic and is stripped
+before comparing.
+
+Usage (from the backend directory):
+    python verify_knockout_layouts.py
+"""
+
+import os
+import re
+import sys
+import json
+import subprocess
+
+from grouping.knockout import generate_knockout_fixtures
+
+KNOCKOUT_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "logic", "knockout.js")
+JS_PLAYER_COUNTS = (10, 12, 14, 16)
+FEEDER_ANNOTATION = re.compile(r" \([A-Z]\d+/[A-Z]\d+\)$")
+
+
+def load_js_layouts() -> dict:
+    script = (
+        f"import {{ generateKnockoutFixtures }} from {json.dumps('file://' + KNOCKOUT_JS)};"
+        f"const counts = {json.dumps(list(JS_PLAYER_COUNTS))};"
+        "console.log(JSON.stringify(Object.fromEntries(counts.map(n => [n, generateKnockoutFixtures(n)]))));"
+    )
+    output = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def normalize(fixtures: dict) -> dict:
+    for bracket in fixtures.values():
+        for knockout_round in bracket:
+            for match in knockout_round["matches"]:
+                for side in ("p1", "p2"):
+                    match[side] = FEEDER_ANNOTATION.sub("", match[side])
+    return fixtures
+
+
+def main():
+    js_layouts = load_js_layouts()
+    failures = 0
+    for player_count in JS_PLAYER_COUNTS:
+        expected = normalize(js_layouts[str(player_count)])
+        generated = generate_knockout_fixtures(player_count, 2).model_dump(exclude_none=True)
+        if generated == expected:
+            print(f"{player_count} players: OK")
+        else:
+            failures += 1
+            print(f"{player_count} players: MISMATCH")
+            print(f"  expected:  {json.dumps(expected)}")
+            print(f"  generated: {json.dumps(generated)}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
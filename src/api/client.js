@@ -20,6 +20,43 @@ export const fetchHistory = async () => {
     }
 };
 
+/**
+ * Decodes the compact /history wire format back into the regular tournament list.
+ */
+export const decodeCompactHistory = (compact) => {
+    const { players, tournaments, rank_groups: groups } = compact;
+    return tournaments.id.map((id, t) => {
+        const ranks = [];
+        for (let g = tournaments.rank_offsets[t]; g < tournaments.rank_offsets[t + 1]; g++) {
+            ranks.push({
+                id: groups.id[g],
+                tournament_id: id,
+                rank: groups.rank[g],
+                rating: groups.rating[g],
+                players: groups.players[g].map(index => players[index])
+            });
+        }
+        return {
+            id,
+            date: tournaments.date[t],
+            playlist_url: tournaments.playlist_url[t],
+            embed_url: tournaments.embed_url[t],
+            is_official: tournaments.is_official[t],
+            ranks
+        };
+    });
+};
+
+export const fetchCompactHistory = async () => {
+    const response = await client.get('/history', { params: { format: 'compact' } });
+    return decodeCompactHistory(response.data);
+};
+
+export const fetchHistoryChanges = async (since = 0) => {
+    const response = await client.get('/history', { params: { since } });
+    return response.data;
+};
+
 export const addTournament = async (tournamentData, password) => {
     const response = await client.post('/history', tournamentData, {
         params: { password } // Sending password as query param for simplicity as per main.py
@@ -103,6 +140,15 @@ export const fetchFundBalances = async (search = null, filter = null) => {
     return response.data;
 };
 
+export const fetchFundBalancesPage = async (page = 1, pageSize = 50, search = null, filter = null) => {
+    const params = { page, page_size: pageSize };
+    if (search) params.search = search;
+    if (filter) params.filter = filter;
+
+    const response = await client.get('/fund/balances', { params });
+    return { items: response.data, total: Number(response.headers['x-total-count']) };
+};
+
 export const calculateTournamentCosts = async (data, password) => {
     const response = await client.post('/fund/tournament-costs/calculate', data, {
         params: { password }
@@ -110,6 +156,13 @@ export const calculateTournamentCosts = async (data, password) => {
     return response.data;
 };
 
+export const calculateTournamentCostScenarios = async (data, password) => {
+    const response = await client.post('/fund/tournament-costs/calculate-batch', data, {
+        params: { password }
+    });
+    return response.data;
+};
+
 export const saveTournamentCosts = async (data, password) => {
     const response = await client.post('/fund/tournament-costs/save', data, {
         params: { password }
@@ -136,9 +189,19 @@ export const recordPayment = async (data, password) => {
     return response.data;
 };
 
-export const fetchPaymentHistory = async (page = 1, pageSize = 20, playerName = null) => {
+// body: CSV text (contentType 'text/csv') or an array of payments (contentType 'application/json')
+export const importPayments = async (body, contentType, password, skipInvalid = false) => {
+    const response = await client.post('/fund/payments/import', body, {
+        params: { password, skip_invalid: skipInvalid },
+        headers: { 'Content-Type': contentType }
+    });
+    return response.data;
+};
+
+export const fetchPaymentHistory = async (page = 1, pageSize = 20, playerName = null, cursor = null) => {
     const params = { page, page_size: pageSize };
     if (playerName) params.player_name = playerName;
+    if (cursor) params.cursor = cursor;
 
     const response = await client.get('/fund/payments/history', { params });
     return response.data;
@@ -165,6 +228,16 @@ export const fetchDaysPlayedComparison = async () => {
     return response.data;
 };
 
+export const fetchFundTimeseries = async (period = 'month', playerName = null, start = null, end = null) => {
+    const params = { period };
+    if (playerName) params.player_name = playerName;
+    if (start) params.start = start;
+    if (end) params.end = end;
+
+    const response = await client.get('/fund/timeseries', { params });
+    return response.data;
+};
+
 export const fetchTournamentCostDates = async () => {
     const response = await client.get('/fund/tournament-costs/dates');
     return response.data;
@@ -194,17 +267,19 @@ export const createUnofficialTournament = async (data, password) => {
     return response.data;
 };
 
-export const fetchPlayerTournamentCosts = async (playerId, page = 1, pageSize = 10) => {
-    const response = await client.get(`/fund/players/${playerId}/tournament-costs`, {
-        params: { page, page_size: pageSize }
-    });
+export const fetchPlayerTournamentCosts = async (playerId, page = 1, pageSize = 10, cursor = null) => {
+    const params = { page, page_size: pageSize };
+    if (cursor) params.cursor = cursor;
+
+    const response = await client.get(`/fund/players/${playerId}/tournament-costs`, { params });
     return response.data;
 };
 
-export const fetchPlayerMiscCosts = async (playerId, page = 1, pageSize = 10) => {
-    const response = await client.get(`/fund/players/${playerId}/misc-costs`, {
-        params: { page, page_size: pageSize }
-    });
+export const fetchPlayerMiscCosts = async (playerId, page = 1, pageSize = 10, cursor = null) => {
+    const params = { page, page_size: pageSize };
+    if (cursor) params.cursor = cursor;
+
+    const response = await client.get(`/fund/players/${playerId}/misc-costs`, { params });
     return response.data;
 };
 
@@ -222,6 +297,35 @@ export const fetchRankingProxy = async (url, forceRefresh = false) => {
     return response.data;
 };
 
+export const fetchStandings = async (activePlayers, temporaryPlayers = []) => {
+    const response = await client.post('/ranking/standings', {
+        active_players: activePlayers,
+        temporary_players: temporaryPlayers.map(tp => ({ name: tp.name, initial_rank: tp.initialRank }))
+    });
+    return response.data;
+};
+
+export const simulateStandings = async (scenarios) => {
+    const response = await client.post('/ranking/standings/simulate', { scenarios });
+    return response.data;
+};
+
+export const generateBalancedGroups = async (standings, numGroups = 2, objective = 'average') => {
+    const response = await client.post('/grouping/groups', {
+        players: standings.map(player => ({ name: player.name, rating: player.average })),
+        num_groups: numGroups,
+        objective
+    });
+    return response.data;
+};
+
+export const fetchKnockoutFixtures = async (playerCount, numGroups = 2) => {
+    const response = await client.get('/grouping/knockout', {
+        params: { player_count: playerCount, num_groups: numGroups }
+    });
+    return response.data;
+};
+
 export const fetchYouTubeSearch = async (query) => {
     const response = await client.get('/ranking/youtube-search', {
         params: { q: query }